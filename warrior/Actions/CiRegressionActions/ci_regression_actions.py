@@ -22,7 +22,7 @@ class CIregressionActions(object):
         """
             constructor
         """
-        self.resultfile = Utils.config_Utils.resultfile
+        self.resultfile = Utils.config_Utils.get_resultfile()
         self.datafile = Utils.config_Utils.datafile
         self.logsdir = Utils.config_Utils.logsdir
         self.filename = Utils.config_Utils.filename
@@ -18,10 +18,10 @@ from Framework.Utils import cli_Utils
 from Framework.Utils.print_Utils import print_warning
 from Framework.Utils.testcase_Utils import pNote
 from Framework.Utils.data_Utils import getSystemData,\
-get_session_id, get_credentials, get_object_from_datarepository
-from Framework.Utils.encryption_utils import decrypt
+get_session_id, get_object_from_datarepository
 from WarriorCore.Classes.war_cli_class import WarriorCliClass
 from Framework.ClassUtils.warrior_connect_class import WarriorConnect
+from Framework.ClassUtils.expect_engine_class import ExpectEngine
 
 
 class CliActions(object):
@@ -29,14 +29,21 @@ class CliActions(object):
     related to actions performed on any command line interface """
 
     def __init__(self):
-        self.resultfile = Utils.config_Utils.resultfile
+        self.resultfile = Utils.config_Utils.get_resultfile()
         self.datafile = Utils.config_Utils.datafile
         self.logsdir = Utils.config_Utils.logsdir
         self.filename = Utils.config_Utils.filename
         self.logfile = Utils.config_Utils.logfile
-
-    def connect(self, system_name, session_name=None, prompt=".*(%|#|\$)",
-                ip_type="ip", via_host=None):
+        # (system_name, session_name): connection opened in parallel
+        # by connect_systems, reported by connect
+        self.prepared_connections = {}
+        # session_id: time taken to close the session in parallel
+        # by disconnect_all, reported by disconnect
+        self.disconnect_times = {}
+
+    def connect(self, system_name, session_name=None,
+                prompt=Utils.cli_Utils.CONNECT_PROMPT,
+                ip_type=Utils.cli_Utils.CONNECT_IP_TYPE, via_host=None):
         """
         This is a generic connect that can connect to ssh/telnet based
         on the conn_type provided by the user in the input datafile.
@@ -200,8 +207,18 @@ class CliActions(object):
                      self.datafile, call_system_name, "", war_conn_object,
                      "disconnect", connect_testdata)
 
-                war_conn_object.disconnect()
-                result = False if war_conn_object.isalive() else True
+                pool = Utils.cli_Utils.get_session_pool() if war_conn_object.pool_key else None
+                if pool is not None and \
+                   pool.release(war_conn_object.pool_key, war_conn_object):
+                    pNote("Session returned to the session pool")
+                    result = True
+                else:
+                    war_conn_object.disconnect()
+                    result = False if war_conn_object.isalive() else True
+                    if session_id in self.disconnect_times:
+                        pNote("Disconnection time for system={0}, session={1}: "
+                              "{2:.2f} sec".format(call_system_name, session_name,
+                                                   self.disconnect_times.pop(session_id)))
             else:
                 pNote("session does not exist", "warning")
                 result = False
@@ -212,8 +229,10 @@ class CliActions(object):
             status = status and result
         return status
 
-    def connect_ssh(self, system_name, session_name=None, prompt=".*(%|#|\$)",
-                    ip_type="ip", int_timeout=60, via_host=None):
+    def connect_ssh(self, system_name, session_name=None,
+                    prompt=Utils.cli_Utils.CONNECT_PROMPT,
+                    ip_type=Utils.cli_Utils.CONNECT_IP_TYPE,
+                    int_timeout=Utils.cli_Utils.CONNECT_TIMEOUT, via_host=None):
         """Connects to the ssh port of the the given system or subsystems
 
         :Datafile usage:
@@ -290,49 +309,19 @@ class CliActions(object):
             subsystem_name = subsystem_list[i] if subsystem_list != None else None
             call_system_name = system_name if subsystem_name is None \
             else "{0}[{1}]".format(system_name, subsystem_name)
-            credentials = get_credentials(self.datafile, call_system_name,
-                                          [ip_type, 'ssh_port', 'username',
-                                           'password', 'prompt', 'timeout',
-                                           'conn_options', 'custom_keystroke'])
             # parse more things here
             pNote("system={0}, session={1}".format(call_system_name, session_name))
             session_id = get_session_id(call_system_name, session_name)
+            prepared = self.prepared_connections.pop((call_system_name, session_name), None)
+            credentials = prepared[0] if prepared is not None else \
+                Utils.cli_Utils.get_ssh_credentials(self.datafile, call_system_name,
+                                                    session_name, prompt, ip_type,
+                                                    int_timeout, via_host)
             if credentials is not None and credentials is not False:
-                if not credentials["custom_keystroke"]:
-                    credentials["custom_keystroke"] = "wctrl:M"
-                credentials = Utils.cli_Utils.get_connection_port("ssh", credentials)
-                credentials["logfile"] = Utils.file_Utils.getCustomLogFile(self.filename,
-                                                                           self.logsdir,
-                                                                           'ssh_%s_' % session_id)
-                credentials["prompt"] = prompt if not credentials["prompt"]\
-                else credentials["prompt"]
-                credentials["timeout"] = int_timeout if not credentials["timeout"]\
-                else credentials["timeout"]
-                credentials["password"] = decrypt(credentials["password"])
-
-                if ip_type != "ip":
-                    credentials['ip'] = credentials[ip_type]
-                # To get the details of the intermediate system
-                if via_host is not None:
-                    via_crendentials = get_credentials(self.datafile, via_host,
-                                                       [ip_type, 'ssh_port',
-                                                        'username', 'password',
-                                                        'timeout'])
-                    credentials['conn_type'] = "SSH_NESTED"
-                    credentials['via_ip'] = via_crendentials[ip_type]
-                    credentials['via_port'] = via_crendentials['ssh_port']
-                    credentials['via_username'] = via_crendentials['username']
-                    credentials['via_password'] = via_crendentials['password']
-                    credentials["via_timeout"] = int_timeout if not \
-                        via_crendentials["timeout"] else \
-                        int(via_crendentials["timeout"])
-                else:
-                    credentials['conn_type'] = "SSH"
-
                 # Create an object for WarriorConnect class and use it to
                 # establish ssh sessions
-                war_conn_object = WarriorConnect()
-                war_conn_object.connect(credentials)
+                war_conn_object = Utils.cli_Utils.connect_session(call_system_name, session_name,
+                                                                   credentials, prepared)
                 conn_string = war_conn_object.conn_string
 
                 if war_conn_object.conn_type in ["SSH", "SSH_NESTED"] and \
@@ -372,7 +361,9 @@ class CliActions(object):
             status = status and result
         return status, output_dict
 
-    def connect_telnet(self, system_name, session_name=None, ip_type="ip", int_timeout=60):
+    def connect_telnet(self, system_name, session_name=None,
+                       ip_type=Utils.cli_Utils.CONNECT_IP_TYPE,
+                       int_timeout=Utils.cli_Utils.CONNECT_TIMEOUT):
         """Connects to the telnet port of the the given system and/or subsystem and creates a
         pexpect session object for the system
 
@@ -452,32 +443,19 @@ class CliActions(object):
             subsystem_name = subsystem_list[i] if subsystem_list != None else None
             call_system_name = system_name if subsystem_name is None \
             else "{0}[{1}]".format(system_name, subsystem_name)
-            credentials = get_credentials(self.datafile, call_system_name,
-                                          [ip_type, 'telnet_port','username',
-                                           'prompt','password','timeout', 'conn_options', 'custom_keystroke'])
             pNote("system={0}, session={1}".format(call_system_name, session_name))
             Utils.testcase_Utils.pNote(Utils.file_Utils.getDateTime())
             session_id = get_session_id(call_system_name, session_name)
+            prepared = self.prepared_connections.pop((call_system_name, session_name), None)
+            credentials = prepared[0] if prepared is not None else \
+                Utils.cli_Utils.get_telnet_credentials(self.datafile, call_system_name,
+                                                       session_name, ip_type,
+                                                       int_timeout)
             if credentials is not None and credentials is not False:
-                if not credentials["custom_keystroke"]:
-                    credentials["custom_keystroke"] = "wctrl:M"
-                credentials = Utils.cli_Utils.get_connection_port("telnet", credentials)
-                credentials['logfile'] = Utils.file_Utils.getCustomLogFile(self.filename,
-                                                                           self.logsdir,
-                                                                           'telnet_{0}_'\
-                                                                           .format(session_id))
-                credentials["timeout"] = int_timeout if not credentials["timeout"]\
-                else credentials["timeout"]
-                credentials["password"] = decrypt(credentials["password"])
-
-                if ip_type != "ip":
-                    credentials['ip'] = credentials[ip_type]
-                credentials['conn_type'] = "TELNET"
-
                 # Create an object for WarriorConnect class and use it to
                 # establish telnet sessions
-                war_conn_object = WarriorConnect()
-                war_conn_object.connect(credentials)
+                war_conn_object = Utils.cli_Utils.connect_session(call_system_name, session_name,
+                                                                   credentials, prepared)
                 conn_string = war_conn_object.conn_string
 
                 if war_conn_object.conn_type == "TELNET" \
@@ -553,6 +531,61 @@ class CliActions(object):
         Utils.testcase_Utils.report_substep_status(command_status)
         return  command_status
 
+    def send_command_to_systems(self, command, list_systems, session_name=None,
+                                start_prompt='.*', end_prompt='.*', int_timeout=60):
+        """Sends a command to a list of systems or subsystems at the same time
+        and waits for the end prompts of all of them, the sessions are driven
+        by a single poll loop instead of one after another
+
+        :Arguments:
+            1. command(string)      = the command to be sent to the systems
+            2. list_systems(list) = names of the systems or subsystems,\
+                every name accepts the formats of the system_name argument\
+                of connect. eg: ['system1', 'system2[subsystem1]', 'system3[all]']
+            3. session_name(string) = name of the session to the systems
+            4. start_prompt(string) = starting prompt for the command
+            5. end_prompt(string) = ending prompt for the command
+            6. int_timeout (integer) = timeout for the command
+
+        :Returns:
+            1. command_status(bool) = True when the command passed on all\
+                the systems
+            2. response dictionary(dict): the (status, response) of the command\
+                for every system, stored in the data_repository with the key\
+                "session_id + _command_result"
+        """
+
+        wdesc = "Send cli command to the provided systems at the same time"
+        Utils.testcase_Utils.pSubStep(wdesc)
+        Utils.testcase_Utils.pNote(self.datafile)
+        sessions = []
+        session_ids = []
+        command_status = True
+        for call_system_name in Utils.cli_Utils.get_call_system_names(self.datafile,
+                                                                      list_systems):
+            session_id = get_session_id(call_system_name, session_name)
+            if session_id in session_ids:
+                continue
+            session_object = get_object_from_datarepository(session_id)
+            if isinstance(session_object, WarriorConnect):
+                sessions.append(("system={0}, session={1}".format(call_system_name, session_name),
+                                 session_object))
+                session_ids.append(session_id)
+            else:
+                print_warning("%s-%s is not available for use" % (call_system_name,
+                                                                  session_name))
+                command_status = False
+
+        output_dict = {}
+        results = ExpectEngine().send_command(sessions, start_prompt, end_prompt,
+                                              command, int_timeout)
+        for session_id, (status, response) in zip(session_ids, results):
+            output_dict["{0}_command_result".format(session_id)] = (status, response)
+            command_status = command_status and status is True
+
+        Utils.testcase_Utils.report_substep_status(command_status)
+        return command_status, output_dict
+
     def send_all_testdata_commands(self, system_name, session_name=None, var_sub=None,
                                    description=None, td_tag=None, vc_tag=None):
         """
@@ -884,9 +917,10 @@ class CliActions(object):
                                        " is not alive".format(system_name, session_name))
         return status
 
-    def connect_all(self):
+    def connect_all(self, int_max_workers=10):
         """This is a connect all operation that can connect to  all ssh/telnet based
         on the conn_type provided by the user in the input datafile.
+        The connections are opened in parallel, at most int_max_workers at a time.
 
         :Datafile usage:
 
@@ -917,7 +951,9 @@ class CliActions(object):
 
 
         :Arguments:
-            None. Keyword will read the input datafile and get the data from tag <system> and <subsystem>.
+            1. int_max_workers(int) = maximum number of connections opened\
+                at a time, default is 10.
+            Keyword will read the input datafile and get the data from tag <system> and <subsystem>.
 
         :Returns:
             1. status(bool)= True / False.
@@ -931,38 +967,66 @@ class CliActions(object):
         """
         wdesc = "Connect to all systems and subsystems in the datafile."
         pNote(wdesc)
+        return self.connect_systems(Utils.cli_Utils.get_datafile_system_list(self.datafile),
+                                    int_max_workers=int_max_workers)
 
+    def connect_systems(self, list_systems, session_name=None, int_max_workers=10):
+        """Connects to the ssh/telnet port of a list of systems or subsystems
+        based on the conn_type provided by the user in the input datafile.
+        The connections are opened in parallel, at most int_max_workers at a time,
+        the results are reported and stored in the data repository in the order
+        of the list.
+
+        :Datafile usage:
+
+            Same as the connect keyword.
+
+        :Arguments:
+            1. list_systems(list) = names of the systems or subsystems, every\
+                name accepts the formats of the system_name argument of connect.\
+                eg: ['system1', 'system2[subsystem1]', 'system3[all]']
+            2. session_name(string) = name of the session to the systems.
+            3. int_max_workers(int) = maximum number of connections opened\
+                at a time, default is 10.
+
+        :Returns:
+            1. status(bool)= True / False.
+            2. session_id (dict element)= an id is generated for each connection\
+                and each connection is stored in the framework's data_repository.\
+                session_id=system_name+subsystem_name+session_name.
+            3. response dictionary(dict): an empty dictionary to store the responses of all\
+                commands sent to the particular system or subsystem.\
+                This dictionary is available in warrior frameworks global data_repository\
+                and can be retrieved using the key= "session_id + _td_response".
+        """
+        wdesc = "Connect to a list of systems and subsystems in parallel."
+        pNote(wdesc)
         output_dict = {}
         status = True
-        
-        root = Utils.xml_Utils.getRoot(self.datafile)
-        systems = root.findall('system')
-        system_list = []
-        for system in systems:
-            #check if the system has subsystem or not.
-            subsystems = system.findall('subsystem')
-            if subsystems != []:
-                for subsystem in subsystems:
-                    subsystem_name = subsystem.get('name')
-                    system_name = system.get('name') + '[' + subsystem_name + ']'
-                    system_list.append(system_name)
-            #if there is no subsystem use the system.
-            else:
-                system_name = system.get('name')
-                system_list.append(system_name)
-
-        for system_name in system_list:
-            sys_status, sys_dict = self.connect(system_name)
-            status = status and sys_status
-            output_dict.update(sys_dict)        
+        if not WarriorCliClass.cmdprint:
+            self.prepared_connections = Utils.cli_Utils.open_connections(
+                self.datafile, list_systems, session_name, int_max_workers)
+        try:
+            for system_name in list_systems:
+                sys_status, sys_dict = self.connect(system_name, session_name)
+                status = status and sys_status
+                output_dict.update(sys_dict)
+        finally:
+            # connections which were not reported by connect
+            for _, war_conn_object, _, _ in self.prepared_connections.values():
+                war_conn_object.disconnect()
+            self.prepared_connections = {}
         return status, output_dict
 
-    def disconnect_all(self):
+    def disconnect_all(self, int_max_workers=10):
         """This is a disconnect all operation that can disconnect all ssh/telnet sessions
         based on the details provided by the user in the input datafile.
+        The sessions are closed in parallel, at most int_max_workers at a time.
 
         :Arguments:
-            None. Keyword will read the input datafile and get the data from tag <system> and <subsystem>.
+            1. int_max_workers(int) = maximum number of sessions closed\
+                at a time, default is 10.
+            Keyword will read the input datafile and get the data from tag <system> and <subsystem>.
 
         :Returns:
             1. status(bool)= True / False.
@@ -970,22 +1034,9 @@ class CliActions(object):
         wdesc = "Disconnect all systems and subsystems in the datafile."
         pNote(wdesc)
         status = True
-        root = Utils.xml_Utils.getRoot(self.datafile)
-        systems = root.findall('system')
-        system_list = []
-        for system in systems:
-            #check if the system has subsystem or not.
-            subsystems = system.findall('subsystem')
-            if subsystems != []:
-                for subsystem in subsystems:
-                    subsystem_name = subsystem.get('name')
-                    system_name = system.get('name') + '[' + subsystem_name + ']'
-                    system_list.append(system_name)
-            #if there is no subsystem use the system.
-            else:
-                system_name = system.get('name')
-                system_list.append(system_name)
-
+        system_list = Utils.cli_Utils.get_datafile_system_list(self.datafile)
+        self.disconnect_times.update(Utils.cli_Utils.close_sessions(
+            self.datafile, system_list, None, int_max_workers))
         for system_name in system_list:
             sys_status = self.disconnect(system_name)
             status = status and sys_status
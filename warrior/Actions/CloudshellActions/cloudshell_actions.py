@@ -38,7 +38,7 @@ class CloudShellActions(object):
         '''
         Constructor for Cloudshell Actions
         '''
-        self.resultfile = config_Utils.resultfile
+        self.resultfile = config_Utils.get_resultfile()
         self.datafile = config_Utils.datafile
         self.logsdir = config_Utils.logsdir
         self.filename = config_Utils.filename
@@ -27,7 +27,7 @@ class CommonActions(object):
     """class CommonActions having methods (keywords) that are common for all the products"""
 
     def __init__(self):
-        self.resultfile = Utils.config_Utils.resultfile
+        self.resultfile = Utils.config_Utils.get_resultfile()
         self.datafile = Utils.config_Utils.datafile
         self.logsdir = Utils.config_Utils.logsdir
         self.filename = Utils.config_Utils.filename
@@ -30,7 +30,7 @@ class DemoActions(object):
     related to actions used in demo KW """
 
     def __init__(self):
-        self.resultfile = Utils.config_Utils.resultfile
+        self.resultfile = Utils.config_Utils.get_resultfile()
         self.datafile = Utils.config_Utils.datafile
         self.logsdir = Utils.config_Utils.logsdir
         self.filename = Utils.config_Utils.filename
@@ -55,7 +55,7 @@ class CliActions(object):
 
     """" Default __init__ field must be used when using classes for keywords """
     def __init__(self):
-        self.resultfile = Utils.config_Utils.resultfile
+        self.resultfile = Utils.config_Utils.get_resultfile()
         self.datafile = Utils.config_Utils.datafile
         self.logsdir = Utils.config_Utils.logsdir
         self.filename = Utils.config_Utils.filename
@@ -27,7 +27,7 @@ class NetconfActions(object):
     related to actions performed on basic netconf interface """
 
     def __init__(self):
-        self.resultfile = Utils.config_Utils.resultfile
+        self.resultfile = Utils.config_Utils.get_resultfile()
         self.datafile = Utils.config_Utils.datafile
         self.logsdir = Utils.config_Utils.logsdir
         self.filename = Utils.config_Utils.filename
@@ -29,7 +29,7 @@ class RestActions(object):
 
     def __init__(self):
         """ constructor """
-        self.resultfile = Utils.config_Utils.resultfile
+        self.resultfile = Utils.config_Utils.get_resultfile()
         self.datafile = Utils.config_Utils.datafile
         self.logsdir = Utils.config_Utils.logsdir
         self.filename = Utils.config_Utils.filename
@@ -2963,7 +2963,8 @@ class RestActions(object):
     
     def verify_response(self, system_name, expected_api_response,
                         expected_response_type, comparison_mode, 
-                        request_id = None, generate_output_diff_file="Yes"):
+                        request_id = None, generate_output_diff_file="Yes",
+                        list_key=None):
         """
             Verifies the api response with the expected response
             and returns True or False
@@ -3029,6 +3030,10 @@ class RestActions(object):
                     then saves the difference between
                     the responses in a file by default and if this sets to
                     'no', doesn't save any difference.
+                7. list_key: For json responses, the key matching the objects
+                    of lists whatever their order, eg: id
+                    If it is not given, the items of lists are compared
+                    whatever their order.
 
             returns:
                     If api response matches with expected_api_response
@@ -3076,5 +3081,6 @@ class RestActions(object):
                      credentials['expected_api_response'],
                      credentials['expected_response_type'],
                      output_file,
-                     credentials['generate_output_diff_file'])
+                     credentials['generate_output_diff_file'],
+                     credentials.get('list_key') or None)
         return status
\ No newline at end of file
@@ -35,7 +35,7 @@ class browser_actions(object):
 
     def __init__(self, *args, **kwargs):
         """This is a constructor for the browser_actions class"""
-        self.resultfile = Utils.config_Utils.resultfile
+        self.resultfile = Utils.config_Utils.get_resultfile()
         self.datafile = Utils.config_Utils.datafile
         self.logsdir = Utils.config_Utils.logsdir
         self.filename = Utils.config_Utils.filename
@@ -41,7 +41,7 @@ class verify_actions(object):
 
     def __init__(self):
         """This is a constructor for the verify_actions class"""
-        self.resultfile = Utils.config_Utils.resultfile
+        self.resultfile = Utils.config_Utils.get_resultfile()
         self.datafile = Utils.config_Utils.datafile
         self.logsdir = Utils.config_Utils.logsdir
         self.filename = Utils.config_Utils.filename
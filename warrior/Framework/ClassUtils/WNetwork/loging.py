@@ -14,12 +14,19 @@ limitations under the License.
 """
 Module to collect the response on a connected session
 as a separate thread
+
+LogCollector collects the responses of all the monitored sessions of a
+testcase with a single thread, ThreadedLog collects the response of one
+session with its own thread.
 """
 
 import threading
 import time
 import sys
 import os
+import errno
+import select
+from collections import deque
 
 from Framework.ClassUtils.WNetwork.base_class import Base
 from Framework.Utils.print_Utils import print_exception, print_error, \
@@ -123,4 +130,339 @@ class ThreadedLog(Base):
                 continue
             except Exception as exception:
                 print_exception(exception)
-                break
\ No newline at end of file
+                break
+
+
+class RingBuffer(object):
+    """
+    Bounded buffer of the bytes read from a session, addressed by absolute
+    offsets (number of bytes read before a byte). When the buffer is full
+    the oldest bytes are appended to the spill file, which holds the bytes
+    from offset 0 to the start of the buffer, they are lost when there is
+    no spill file.
+    """
+
+    def __init__(self, capacity=1024*1024, spill_file=None):
+        """
+        Constructor
+        capacity: maximum number of bytes kept in memory
+        spill_file: path of the file receiving the oldest bytes, they are
+        appended to the existing content of the file
+        """
+        self.capacity = capacity
+        self.spill_file = spill_file
+        self.spill = None
+        # position of offset 0 in the spill file
+        self.spill_base = 0
+        self.chunks = deque()
+        self.size = 0
+        # absolute offsets of the first byte in memory and of the next byte
+        self.start = 0
+        self.end = 0
+
+    def write(self, data):
+        """
+        Appends data to the buffer, returns the offset of its end
+        """
+        if data:
+            self.chunks.append(data)
+            self.size += len(data)
+            self.end += len(data)
+            while self.size > self.capacity:
+                chunk = self.chunks.popleft()
+                excess = self.size - self.capacity
+                if len(chunk) > excess:
+                    self.chunks.appendleft(chunk[excess:])
+                    chunk = chunk[:excess]
+                self._spill(chunk)
+                self.size -= len(chunk)
+                self.start += len(chunk)
+        return self.end
+
+    def read(self, start, end=None):
+        """
+        Returns the bytes between two offsets, the bytes which were
+        neither kept in memory nor spilled are skipped
+        """
+        end = self.end if end is None else min(end, self.end)
+        start = max(start, 0)
+        if start >= end:
+            return ""
+        parts = []
+        if start < self.start and self.spill is not None:
+            self.spill.flush()
+            with open(self.spill_file, "rb") as spill:
+                spill.seek(self.spill_base + start)
+                parts.append(spill.read(min(end, self.start) - start))
+        offset = self.start
+        for chunk in self.chunks:
+            if offset >= end:
+                break
+            if offset + len(chunk) > start:
+                parts.append(chunk[max(0, start - offset):end - offset])
+            offset += len(chunk)
+        return "".join(parts)
+
+    def _spill(self, chunk):
+        """
+        Appends bytes leaving the buffer to the spill file
+        """
+        if self.spill_file is None:
+            return
+        try:
+            if self.spill is None:
+                self.spill = open(self.spill_file, "ab")
+                self.spill.seek(0, os.SEEK_END)
+                self.spill_base = self.spill.tell()
+            self.spill.write(chunk)
+        except IOError as exception:
+            print_exception(exception)
+            self.spill_file = None
+
+    def close(self):
+        """
+        Closes the spill file
+        """
+        if self.spill is not None:
+            self.spill.close()
+            self.spill = None
+
+
+class CollectedSession(object):
+    """
+    A session monitored by the LogCollector and the bytes read from it
+    """
+
+    def __init__(self, session, buffer_size, spill_file):
+        """
+        Constructor
+        session: pexpect spawn object or paramiko channel of the session
+        """
+        self.session = session
+        self.is_pexpect = hasattr(session, "child_fd")
+        self.fileno = session.child_fd if self.is_pexpect else session.fileno()
+        self.buffer = RingBuffer(buffer_size, spill_file)
+        # number of watch calls not followed by unwatch
+        self.watchers = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_session(session):
+        """
+        Returns the pexpect spawn object or the paramiko channel of a
+        WarriorConnect object
+        """
+        if hasattr(session, "session_object"):
+            return session.session_object.channel or \
+                session.session_object.target_host
+        return session
+
+    def read(self):
+        """
+        Reads the bytes available on the session, returns False at
+        the end of the session
+        """
+        with self.lock:
+            try:
+                if self.is_pexpect:
+                    data = self.session.read_nonblocking(self.session.maxread, 0)
+                elif self.session.recv_ready():
+                    data = self.session.recv(32768)
+                    if not data:
+                        return False
+                else:
+                    return not self.session.closed
+            except pexpect.TIMEOUT:
+                return True
+            except pexpect.EOF:
+                return False
+            except Exception as exception:
+                print_exception(exception)
+                return False
+            self.buffer.write(data)
+            return True
+
+    def drain(self):
+        """
+        Reads the bytes already available on the session
+        """
+        while self._readable() and self.read():
+            pass
+
+    def _readable(self):
+        """
+        Returns True when bytes are available on the session
+        """
+        try:
+            return bool(select.select([self.fileno], [], [], 0)[0])
+        except (select.error, ValueError):
+            return False
+
+
+class LogCollector(object):
+    """
+    Collects the response of the monitored sessions of a testcase with
+    a single thread polling their file descriptors. The bytes of every
+    session go into a bounded ring buffer spilling to a log file, the
+    response of a session during a command is the slice of its buffer
+    between the marks taken before and after the command.
+    """
+
+    _collector = None
+    _collector_lock = threading.Lock()
+
+    def __init__(self, buffer_size=1024*1024, spill_dir=None):
+        """
+        Constructor
+        buffer_size: maximum number of bytes kept in memory per session
+        spill_dir: directory of the spill files of the sessions
+        """
+        self.buffer_size = buffer_size
+        self.spill_dir = spill_dir
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stopped = False
+        self.wake_read, self.wake_write = os.pipe()
+
+    @classmethod
+    def get_collector(cls, spill_dir=None):
+        """
+        Returns the log collector of the testcase, created if needed
+        """
+        with cls._collector_lock:
+            if cls._collector is None:
+                cls._collector = cls(spill_dir=spill_dir)
+            return cls._collector
+
+    @classmethod
+    def stop_collector(cls):
+        """
+        Stops the log collector of the testcase
+        """
+        with cls._collector_lock:
+            collector, cls._collector = cls._collector, None
+        if collector is not None:
+            collector.stop()
+
+    def watch(self, session_id, session):
+        """
+        Starts collecting the response of a session, returns the mark of
+        the current end of its buffer
+        """
+        session = CollectedSession.get_session(session)
+        with self.lock:
+            collected = self.sessions.get(session_id)
+            if collected is not None and collected.session is not session:
+                # the session was connected again
+                collected.buffer.close()
+                collected = None
+            if collected is None:
+                spill_file = None if self.spill_dir is None else os.path.join(
+                    self.spill_dir, "{0}_collected.log".format(session_id))
+                collected = CollectedSession(session, self.buffer_size, spill_file)
+                self.sessions[session_id] = collected
+            collected.watchers += 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._collect)
+                self.thread.daemon = True
+                self.thread.start()
+        self._wake()
+        return self.mark(session_id)
+
+    def unwatch(self, session_id):
+        """
+        Stops collecting the response of a session, returns the mark of
+        the end of its buffer
+        """
+        end = self.mark(session_id)
+        with self.lock:
+            collected = self.sessions.get(session_id)
+            if collected is not None and collected.watchers > 0:
+                collected.watchers -= 1
+        self._wake()
+        return end
+
+    def mark(self, session_id):
+        """
+        Returns the offset of the end of the buffer of a session after
+        reading the bytes already available
+        """
+        collected = self.sessions.get(session_id)
+        if collected is None:
+            return 0
+        if collected.watchers > 0:
+            collected.drain()
+        return collected.buffer.end
+
+    def slice(self, session_id, start, end=None):
+        """
+        Returns the response of a session between two marks
+        """
+        collected = self.sessions.get(session_id)
+        if collected is None:
+            return ""
+        with collected.lock:
+            return collected.buffer.read(start, end)
+
+    def stop(self):
+        """
+        Stops the collector thread and closes the spill files
+        """
+        self.stopped = True
+        self._wake()
+        if self.thread is not None:
+            self.thread.join()
+        with self.lock:
+            for collected in self.sessions.values():
+                collected.buffer.close()
+            self.sessions.clear()
+        os.close(self.wake_read)
+        os.close(self.wake_write)
+
+    def _wake(self):
+        """
+        Interrupts the poll of the collector thread
+        """
+        try:
+            os.write(self.wake_write, "x")
+        except OSError:
+            pass
+
+    def _collect(self):
+        """
+        Collector thread, reads the watched sessions when bytes are
+        available till the collector is stopped
+        """
+        while not self.stopped:
+            with self.lock:
+                watched = dict((collected.fileno, collected) for collected
+                               in self.sessions.values() if collected.watchers > 0)
+            try:
+                ready = select.select([self.wake_read] + watched.keys(), [], [])[0]
+            except (select.error, ValueError) as err:
+                if getattr(err, "args", [None])[0] == errno.EINTR:
+                    continue
+                # a session was closed while it was watched
+                ready = [fileno for fileno in watched
+                         if not self._is_open(fileno)]
+                for fileno in ready:
+                    watched[fileno].watchers = 0
+                continue
+            for fileno in ready:
+                if fileno == self.wake_read:
+                    os.read(self.wake_read, 4096)
+                elif not watched[fileno].read():
+                    # end of the session
+                    watched[fileno].watchers = 0
+
+    @staticmethod
+    def _is_open(fileno):
+        """
+        Returns True when the file descriptor is open
+        """
+        try:
+            os.fstat(fileno)
+        except OSError:
+            return False
+        return True
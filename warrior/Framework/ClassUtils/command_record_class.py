@@ -0,0 +1,150 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Compact record of a testdata command
+
+The details dict of a testdata block keeps one list per command parameter
+(command_list, startprompt_list, ...), a CommandRecord holds the values of a
+single command in slots named after the lists without the _list suffix.
+The defaults of the parameters (start prompt, response required/reference,
+sleep time, retry options...) are normalized once when the record is built,
+the cli send loop uses the values as they are.
+
+To keep the records small, the parameters which most commands do not give
+(EXTRA_FIELDS) are stored in the extra dict only when they have a value,
+and the verification lists without any value share one tuple of None.
+
+This module must not import Framework.Utils, testdata_class uses it."""
+
+
+class CommandRecord(object):
+    """Values of a single command of a testdata block """
+
+    # (attribute, key of the details dict)
+    FIELDS = (("command", "command_list"),
+              ("sys", "sys_list"),
+              ("session", "session_list"),
+              ("startprompt", "startprompt_list"),
+              ("endprompt", "endprompt_list"),
+              ("verify", "verify_list"),
+              ("verify_text", "verify_text_list"),
+              ("verify_context", "verify_context_list"),
+              ("timeout", "timeout_list"),
+              ("sleeptime", "sleeptime_list"),
+              ("retry", "retry_list"),
+              ("retry_timer", "retry_timer_list"),
+              ("retry_count", "retry_count_list"),
+              ("retry_onmatch", "retry_onmatch_list"),
+              ("resp_ref", "resp_ref_list"),
+              ("resp_req", "resp_req_list"),
+              ("resp_pat_req", "resp_pat_req_list"),
+              ("log", "log_list"),
+              ("verify_on", "verify_on_list"),
+              ("inorder_search", "inorder_search_list"),
+              ("verify_map", "verify_map_list"),
+              ("operator", "operator_list"),
+              ("cond_value", "cond_value_list"),
+              ("cond_type", "cond_type_list"),
+              ("stream_verify", "stream_verify_list"),
+              ("repeat", "repeat_list"),
+              ("vc_file", "vc_file_list"))
+
+    # attributes not given by most commands, None when they are not given
+    EXTRA_FIELDS = frozenset(["sys", "session", "log", "repeat", "vc_file",
+                              "resp_pat_req"])
+
+    # lists of values per verification, shared when all the values are None
+    VERIFY_FIELDS = ("verify_on", "verify_map", "operator", "cond_value",
+                     "cond_type")
+
+    __slots__ = tuple(sorted(set(attribute for attribute, _ in FIELDS) -
+                             set(EXTRA_FIELDS))) + ('index', 'extra')
+
+    # tuples of None by length, see VERIFY_FIELDS
+    _none_values = {}
+
+    def __init__(self, index=0, **values):
+        """Constructor, index is the position of the command in the
+        expanded testdata block, values are the raw values of the command
+        by attribute name, missing values are None """
+        self.index = index
+        self.extra = None
+        for attribute, _ in self.FIELDS:
+            self._set(attribute, values.get(attribute))
+        self.normalize()
+
+    def __getattr__(self, name):
+        """Returns the value of an extra attribute, None when the command
+        does not give it """
+        if name not in CommandRecord.EXTRA_FIELDS:
+            raise AttributeError(name)
+        return self.extra.get(name) if self.extra else None
+
+    def _set(self, attribute, value):
+        """Sets the value of an attribute, the extra attributes are
+        stored only when they are given """
+        if attribute in self.EXTRA_FIELDS:
+            if value is not None:
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[attribute] = value
+            return
+        if attribute in self.VERIFY_FIELDS and value and \
+           all(item is None for item in value):
+            value = self._none_values.setdefault(len(value), (None,) * len(value))
+        setattr(self, attribute, value)
+
+    @classmethod
+    def from_details(cls, details_dict, position, index):
+        """Builds the record of the command at position in the details dict,
+        index is the position of the command in the expanded testdata block """
+        values = {}
+        for attribute, key in cls.FIELDS:
+            value_list = details_dict.get(key)
+            if value_list is not None:
+                values[attribute] = value_list[position]
+        return cls(index, **values)
+
+    @staticmethod
+    def _to_int(value):
+        """Returns the value as an int, invalid values are returned as they
+        are and fail when the command uses them """
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return value
+
+    def normalize(self):
+        """Replaces the values that are not provided by the defaults used by
+        the cli send loop """
+        self.startprompt = {None: ".*", "": ".*"}.get(self.startprompt,
+                                                      str(self.startprompt))
+        self.resp_req = {None: 'y', '': 'y',
+                         'no': 'n', 'n': 'n'}.get(str(self.resp_req).lower(), 'y')
+        self.resp_ref = {None: self.index+1, '': self.index+1}.get(self.resp_ref,
+                                                                 str(self.resp_ref))
+        self.sleeptime = self._to_int({None: 0, "": 0, "none": 0, False: 0,
+                                       "false": 0}.get(str(self.sleeptime).lower(),
+                                                       str(self.sleeptime)))
+        self.inorder_search = self.inorder_search is not None and \
+            self.inorder_search.lower().startswith("y")
+        self.retry = {None: 'n', '': 'n', 'none': 'n'}.get(str(self.retry).lower(),
+                                                           self.retry)
+        self.retry_timer = self._to_int({None: 60, "": 60, "none": 60}.get(
+            str(self.retry_timer).lower(), self.retry_timer))
+        self.retry_count = self._to_int({None: 5, "": 5, "none": 5}.get(
+            str(self.retry_count).lower(), self.retry_count))
+        self.retry_onmatch = {None: False, "": False}.get(self.retry_onmatch,
+                                                          str(self.retry_onmatch))
+        self.stream_verify = {'y': 'yes', 'yes': 'yes', 'end': 'end'}.get(
+            str(self.stream_verify).lower().strip(), 'no')
@@ -0,0 +1,132 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Name index of the systems and subsystems of an input datafile
+
+The index is built on the root element of a parsed datafile, every lookup
+table is built on its first use with a single pass over the elements, the
+following lookups are dict accesses. The elements returned are the elements
+of the indexed tree and must not be modified.
+
+This module must not import Framework.Utils, data_Utils uses it."""
+
+import threading
+
+
+class DatafileIndex(object):
+    """Index of the elements of a datafile by tag and attribute value """
+
+    def __init__(self, root):
+        """Constructor """
+        self.root = root
+        # (tag, attr): {value: first descendant of root with tag and value}
+        self.descendants = {}
+        # (id(parent), tag, attr): {value: first descendant of parent}
+        self.parent_descendants = {}
+        # id(element): {tag: first direct child with tag}
+        self.children = {}
+        # (tag, attr): {value: [direct children of root with tag and value]}
+        self.direct_children = {}
+        # (tag, system tag): {text: [systems having a direct child tag with the text]}
+        self.groups = {}
+        # results computed from the index by data_Utils
+        self.memo = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _first_by_attr(parent, tag, attr):
+        """Returns {attribute value: first descendant of parent with the tag},
+        same element as parent.find(".//tag[@attr='value']") """
+        table = {}
+        for element in parent.iter(tag):
+            if element is parent:
+                continue
+            value = element.get(attr)
+            if value is not None and value not in table:
+                table[value] = element
+        return table
+
+    def get_element(self, tag, attr, value):
+        """Returns the first descendant of the root with the tag and
+        attribute value, None if there is no such element """
+        key = (tag, attr)
+        table = self.descendants.get(key)
+        if table is None:
+            with self.lock:
+                table = self._first_by_attr(self.root, tag, attr)
+                self.descendants[key] = table
+        return table.get(value)
+
+    def get_child_element(self, parent, tag, attr, value):
+        """Returns the first descendant of parent (an element of the
+        indexed tree) with the tag and attribute value """
+        key = (id(parent), tag, attr)
+        table = self.parent_descendants.get(key)
+        if table is None:
+            with self.lock:
+                table = self._first_by_attr(parent, tag, attr)
+                self.parent_descendants[key] = table
+        return table.get(value)
+
+    def get_system(self, system_name, subsystem_name=None, tag="system", attr="name"):
+        """Returns (system element, subsystem element), None for the elements
+        that are not found, the subsystem is None when subsystem_name is None """
+        system = self.get_element(tag, attr, system_name)
+        subsystem = None
+        if system is not None and subsystem_name is not None:
+            subsystem = self.get_child_element(system, 'subsystem', attr, subsystem_name)
+        return system, subsystem
+
+    def find_child(self, element, tag):
+        """Returns the first direct child of the element with the tag,
+        same element as element.find(tag) """
+        if not tag or any(char in tag for char in "/[@.*{"):
+            # paths are not indexed
+            return element.find(tag)
+        table = self.children.get(id(element))
+        if table is None:
+            table = {}
+            for child in element:
+                if child.tag not in table:
+                    table[child.tag] = child
+            with self.lock:
+                self.children[id(element)] = table
+        return table.get(tag)
+
+    def get_direct_children(self, tag, attr=None, value=None):
+        """Returns the direct children of the root with the tag,
+        only the children whose attribute has the value when attr is given """
+        key = (tag, attr)
+        table = self.direct_children.get(key)
+        if table is None:
+            table = {}
+            for child in self.root.findall(tag):
+                table.setdefault(child.get(attr) if attr is not None else None,
+                                 []).append(child)
+            with self.lock:
+                self.direct_children[key] = table
+        return table.get(value if attr is not None else None, [])
+
+    def group_by_tag_value(self, tag, system_tag="system"):
+        """Returns {text: [systems]} grouping the direct system children of
+        the root by the text of their direct children with the tag, the
+        systems in a group are the systems matched by "./system/[tag='text']" """
+        table = self.groups.get((tag, system_tag))
+        if table is None:
+            table = {}
+            for system in self.get_direct_children(system_tag):
+                for text in set("".join(child.itertext()) for child in system.findall(tag)):
+                    table.setdefault(text, []).append(system)
+            with self.lock:
+                self.groups[(tag, system_tag)] = table
+        return table
@@ -0,0 +1,389 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Expect engine driving many pexpect sessions from a single poll loop
+
+PexpectConnect.send_command blocks in expect() until the end prompt of its
+session arrives, a thread per session is needed to drive several sessions
+at the same time. ExpectEngine registers the file descriptors of all the
+sessions in one poll loop and calls expect_list with a timeout of 0 on a
+session when its output arrives, pexpect reads the output and matches the
+prompts exactly as expect() does and the sessions are left in the same
+state (before, after, buffer). The timeouts of the commands are kept by
+the poll loop.
+
+Every session goes through the steps of PexpectConnect.send_command: start
+prompt, command, end prompt, 60 more seconds when the command timed out.
+The commands whose start prompt matches at the same time are sent together
+after a single delaybeforesend. The notes of a session are kept and
+written one session after another when all the commands are complete.
+
+An observer of a command gets the output of the command as it is read,
+the command ends without waiting for its end prompt when the observer
+returns True. The command is then interrupted and the session waits for
+the end prompt again, the next command finds the session at its prompt."""
+
+import time
+import errno
+import select
+
+from Framework import Utils
+from Framework.Utils.print_Utils import print_exception
+from Framework.Utils.testcase_Utils import pNote
+from WarriorCore.Classes.war_cli_class import WarriorCliClass
+
+try:
+    import pexpect
+except ImportError:
+    pexpect = None
+
+# seconds to wait for the end prompt after a command timed out
+GRACE_TIME = 60
+
+
+class SessionCommand(object):
+    """A command sent to a pexpect session, its state in the poll loop and
+    its result """
+
+    START, END, GRACE, DRAIN, DONE = "start", "end", "grace", "drain", "done"
+
+    def __init__(self, name, target_host, start_prompt, end_prompt, command,
+                 timeout=60, observer=None):
+        """Constructor
+        name: name of the session, written before its notes when provided
+        target_host: pexpect spawn object of the session
+        observer: function called with the output of the command, the
+        command ends when it returns True """
+        self.name = name
+        self.target_host = target_host
+        self.start_prompt = start_prompt
+        self.end_prompt = end_prompt
+        self.command = command
+        self.timeout = int({None: 60, "": 60, "none": 60}.get(timeout,
+                                                              str(timeout).lower()))
+        self.status = False
+        self.response = ""
+        self.notes = []
+        self.state = None
+        self.patterns = None
+        # characters of the output of the current step already observed
+        self.observed = 0
+        self.deadline = None
+        self.start_time = None
+        self.end_time = None
+        self.cmd_timedout = False
+        self.msg = ""
+        self.observer = observer
+        # response of a command ended by its observer
+        self.early_response = None
+
+    @property
+    def fileno(self):
+        """File descriptor of the session """
+        return self.target_host.child_fd
+
+    def note(self, txt, print_type="info"):
+        """Keeps a note of the command """
+        self.notes.append((txt, print_type))
+
+    def expect(self, prompt, state, timeout):
+        """Starts waiting for a prompt, the data already read by the session
+        is searched first, returns True when the start prompt is found """
+        self.state = state
+        self.deadline = time.time() + timeout
+        self.patterns = self.target_host.compile_pattern_list([prompt, pexpect.EOF,
+                                                               pexpect.TIMEOUT])
+        self.observed = 0
+        return self.poll()
+
+    def begin(self):
+        """Waits for the start prompt, returns True when it is found """
+        self.target_host.timeout = self.timeout
+        self.note("Command timeout: {0}".format(self.timeout))
+        return self.expect(self.start_prompt, self.START, self.timeout)
+
+    def send(self):
+        """Sends the command and waits for the end prompt, the session
+        delaybeforesend has been waited for by the engine """
+        self.start_time = Utils.datetime_utils.get_current_timestamp()
+        self.note("[{0}] Sending Command: {1}".format(self.start_time, self.command))
+        delaybeforesend = self.target_host.delaybeforesend
+        self.target_host.delaybeforesend = None
+        try:
+            Utils.cli_Utils._send_cmd_by_type(self.target_host, self.command)
+        finally:
+            self.target_host.delaybeforesend = delaybeforesend
+        if not self.end_prompt:
+            self.end_time = Utils.datetime_utils.get_current_timestamp()
+            self.note("[{0}] end prompt not provided".format(self.end_time), "error")
+            self.status = "ERROR"
+            self.finish()
+            return
+        # the output already read after the start prompt is part of the
+        # response
+        self.expect(self.end_prompt, self.END, self.timeout)
+
+    def poll(self):
+        """Searches the output available on the session without waiting
+        for more, the step times out when its deadline passed, returns True
+        when the start prompt is found """
+        result = self.target_host.expect_list(self.patterns, timeout=0)
+        if result == 2 and time.time() < self.deadline:
+            # nothing found yet
+            result = None
+        if self.state == self.START:
+            if result is not None and result != 0:
+                self.start_failed()
+            return result == 0
+        if self.state == self.DRAIN:
+            self.on_drained(result)
+            return False
+        complete = self.observe(result == 0)
+        self.on_result(result)
+        if complete and self.state == self.END:
+            self.end_early()
+        return False
+
+    def observe(self, matched):
+        """Passes the output of the command read since the last call to the
+        observer, returns True when the command can end """
+        output = self.target_host.before
+        if matched:
+            output += self.target_host.after
+        data = output[self.observed:]
+        self.observed = len(output)
+        return self.observer is not None and self.observer(data)
+
+    def end_early(self):
+        """Ends the command before its end prompt, the output read so far
+        is the response. The command is interrupted and the rest of its
+        output is read till the end prompt """
+        self.end_time = Utils.datetime_utils.get_current_timestamp()
+        self.msg = "[{0}] Command ended before its end prompt as requested " \
+            "by its observer".format(self.end_time)
+        self.status = True
+        self.early_response = self.target_host.before
+        self.target_host.sendintr()
+        self.expect(self.end_prompt, self.DRAIN, self.timeout)
+
+    def on_drained(self, result):
+        """Index of the end prompt, EOF or TIMEOUT found after the command
+        was interrupted, None when nothing was found yet """
+        if result is None:
+            return
+        if result != 0:
+            self.note("[{0}] Did not find end prompt '{1}' after interrupting "
+                      "the command, the session is out of sync".format(
+                          Utils.datetime_utils.get_current_timestamp(),
+                          self.end_prompt), "error")
+            self.status = "ERROR"
+        self.target_host.before = self.early_response
+        self.target_host.after = ""
+        self.finish()
+
+    def start_failed(self):
+        """The start prompt was not found """
+        self.note("Could not find the start_prompt '{0}'!! exiting!!".
+                  format(str(self.start_prompt)), "error")
+        self.state = self.DONE
+
+    def on_result(self, result):
+        """Index of the end prompt, EOF or TIMEOUT found after the command,
+        None when nothing was found yet """
+        if result is None:
+            return
+        self.end_time = Utils.datetime_utils.get_current_timestamp()
+        if result == 0:
+            curr_time = Utils.datetime_utils.get_current_timestamp()
+            msg1 = "[{0}] Command completed successfully".format(self.end_time)
+            msg2 = "[{0}] Found end prompt '{1}' after command" \
+                "had timed out".format(curr_time, self.end_prompt)
+            self.status = {True: "ERROR", False: True}.get(self.cmd_timedout)
+            self.msg = {True: msg2, False: msg1}.get(self.cmd_timedout)
+            self.finish()
+        elif result == 1:
+            self.msg = "[{0}] EOF encountered".format(self.end_time)
+            self.status = "ERROR"
+            self.finish()
+        elif not self.cmd_timedout:
+            self.target_host.timeout = 1
+            self.note("[{0}] Command timed out, command will be marked as "
+                      "error".format(self.end_time), "debug")
+            self.note("Will wait {0} more seconds to get end prompt "
+                      "'{1}'".format(GRACE_TIME, self.end_prompt), "debug")
+            self.note("Irrespective of whether end prompt is received or not "
+                      "command will be marked as error because command had "
+                      "timed out once.", "debug")
+            self.cmd_timedout = True
+            self.status = "ERROR"
+            self.state = self.GRACE
+            self.deadline = time.time() + GRACE_TIME
+        else:
+            self.msg = "[{0}] Did not find end prompt '{1}' even after {2} " \
+                "seconds post command time out".format(
+                    Utils.datetime_utils.get_current_timestamp(),
+                    self.end_prompt, GRACE_TIME)
+            self.finish()
+
+    def finish(self):
+        """Builds the response of the command """
+        self.state = self.DONE
+        self.response = str(self.target_host.before) + str(self.target_host.after)
+        self.note("Response:\n{0}\n".format(self.response))
+        self.note(self.msg, "debug")
+        if self.status is True:
+            duration = Utils.datetime_utils.get_time_delta(self.start_time,
+                                                           self.end_time)
+            self.note("Command Duration: {0} sec".format(duration))
+
+    def fail(self, exception):
+        """An unexpected error stopped the command, the response is
+        empty as in PexpectConnect.send_command """
+        print_exception(exception)
+        self.response = ""
+        self.state = self.DONE
+
+
+class ExpectEngine(object):
+    """Sends commands to many pexpect sessions and waits for their end
+    prompts in a single poll loop """
+
+    def send_command(self, sessions, start_prompt, end_prompt, command,
+                     timeout=60, observers=None):
+        """Sends the same command to a list of sessions and waits for all
+        their end prompts
+
+        :Arguments:
+            1. sessions = list of (name, WarriorConnect object), the name
+               is written before the notes of the session, None for no name
+            2. start_prompt, end_prompt, command, timeout = as
+               WarriorConnect.send_command
+            3. observers = list of the observers of the commands of the
+               sessions, the output of the sessions which are not pexpect
+               sessions is not observed
+
+        :Returns:
+            1. results = list of (status, response) of the sessions,
+               as returned by WarriorConnect.send_command
+        """
+        session_commands = []
+        observers = observers or [None] * len(sessions)
+        for (name, war_conn_object), observer in zip(sessions, observers):
+            if WarriorCliClass.cmdprint or war_conn_object.conn_type not in ["SSH", "TELNET"] \
+               or war_conn_object.session_object is None \
+               or war_conn_object.session_object.target_host is None:
+                # not a pexpect session, sent on its own
+                session_commands.append(None)
+            else:
+                session_commands.append(SessionCommand(
+                    name, war_conn_object.session_object.target_host,
+                    start_prompt, end_prompt, command, timeout, observer))
+        self.run([session_command for session_command in session_commands
+                  if session_command is not None])
+        results = []
+        for (name, war_conn_object), session_command in zip(sessions, session_commands):
+            if session_command is None:
+                if name is not None:
+                    pNote(name)
+                results.append(war_conn_object.send_command(start_prompt, end_prompt,
+                                                            command, timeout))
+            else:
+                self.report([session_command])
+                results.append((session_command.status, session_command.response))
+        return results
+
+    def run(self, session_commands):
+        """Runs the commands till they are all complete """
+        pending = []
+        for session_command in session_commands:
+            try:
+                if session_command.begin():
+                    pending.append(session_command)
+            except Exception as exception:
+                session_command.fail(exception)
+        self._send(pending)
+        active = dict((session_command.fileno, session_command)
+                      for session_command in session_commands
+                      if session_command.state != SessionCommand.DONE)
+        poller = select.poll() if hasattr(select, "poll") else None
+        if poller is not None:
+            for fileno in active:
+                poller.register(fileno, select.POLLIN | select.POLLPRI)
+        while active:
+            now = time.time()
+            wait = max(0, min(session_command.deadline for session_command
+                              in active.values()) - now)
+            ready = self._wait(poller, active.keys(), wait)
+            started = []
+            for fileno in ready:
+                self._poll(active[fileno], started)
+            now = time.time()
+            for session_command in active.values():
+                if session_command.state != SessionCommand.DONE and \
+                   session_command not in started and session_command.deadline <= now:
+                    self._poll(session_command, started)
+            self._send(started)
+            for fileno, session_command in active.items():
+                if session_command.state == SessionCommand.DONE:
+                    del active[fileno]
+                    if poller is not None:
+                        poller.unregister(fileno)
+
+    @staticmethod
+    def _wait(poller, filenos, timeout):
+        """Returns the file descriptors ready to be read within timeout
+        seconds """
+        try:
+            if poller is not None:
+                return [fileno for fileno, _ in poller.poll(timeout * 1000)]
+            return select.select(filenos, [], [], timeout)[0]
+        except select.error as err:
+            # interrupted by a signal, poll again
+            if err.args[0] == errno.EINTR:
+                return []
+            raise
+
+    @staticmethod
+    def _poll(session_command, started):
+        """Searches the output available on a session, the command is added
+        to started when its start prompt is found """
+        try:
+            if session_command.poll():
+                started.append(session_command)
+        except Exception as exception:
+            session_command.fail(exception)
+
+    @staticmethod
+    def _send(session_commands):
+        """Sends the commands whose start prompt was found, after a single
+        delaybeforesend """
+        if not session_commands:
+            return
+        delays = [session_command.target_host.delaybeforesend or 0
+                  for session_command in session_commands]
+        if max(delays) > 0:
+            time.sleep(max(delays))
+        for session_command in session_commands:
+            try:
+                session_command.send()
+            except Exception as exception:
+                session_command.fail(exception)
+
+    @staticmethod
+    def report(session_commands):
+        """Writes the notes of the commands, one session after another """
+        for session_command in session_commands:
+            if session_command.name is not None:
+                pNote(session_command.name)
+            for txt, print_type in session_command.notes:
+                pNote(txt, print_type)
@@ -0,0 +1,335 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Structural diff of json objects
+
+JsonDiff walks two json objects (dicts, lists and values as returned by
+json.load) together and produces their differences one at a time as
+(operation, path, value1, value2) tuples, path is the JSONPath of the node:
+
+    ('-', path, value1, None): node present only in the first object
+    ('+', path, None, value2): node present only in the second object
+    ('!', path, value1, value2): different values
+
+Equal subtrees are skipped with a single == comparison and only the nodes
+which differ are walked, callers which need a boolean stop at the first
+difference.
+
+Lists are compared item by item by default, with ordered_lists=False their
+items are compared as multisets, when the extra keys are ignored an item
+of the second list matches an item of the first list it is a subset of,
+the candidate items are looked up by the values of the keys of the item.
+With a list_key, lists whose items are all objects with a unique value of
+that key are matched by that value whatever their order, the matched items
+are then compared recursively."""
+
+import re
+import json
+from collections import Counter
+
+IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class JsonDiff(object):
+    """Structural comparison of two json objects """
+
+    def __init__(self, ordered_lists=True, list_key=None, ignore_case=False,
+                 ignore_extra_keys=False):
+        """Constructor
+        ordered_lists: compare the items of lists by position, as multisets
+        when False
+        list_key: key of the objects matching the items of lists
+        ignore_case: compare the keys and the strings case insensitively
+        ignore_extra_keys: ignore the keys present only in the first object,
+        to check that the second object is a subset of the first one """
+        self.ordered_lists = ordered_lists
+        self.list_key = list_key
+        self.ignore_case = ignore_case
+        self.ignore_extra_keys = ignore_extra_keys
+
+    def equal(self, json_object1, json_object2):
+        """Returns True when the objects do not differ, stops at the first
+        difference """
+        for _ in self.iter_diff(json_object1, json_object2):
+            return False
+        return True
+
+    def iter_diff(self, json_object1, json_object2, path="$"):
+        """Generator of the differences between two json objects """
+        if not self.ignore_case and json_object1 == json_object2:
+            return
+        if isinstance(json_object1, dict) and isinstance(json_object2, dict):
+            differences = self._iter_dict_diff(path, json_object1, json_object2)
+        elif isinstance(json_object1, list) and isinstance(json_object2, list):
+            differences = self._iter_list_diff(path, json_object1, json_object2)
+        elif self._fold(json_object1) == self._fold(json_object2):
+            return
+        else:
+            differences = [("!", path, json_object1, json_object2)]
+        for difference in differences:
+            yield difference
+
+    def _iter_dict_diff(self, path, dict1, dict2):
+        """Generator of the differences between two dicts, by key """
+        if self.ignore_case:
+            dict1 = dict((self._fold(key), value) for key, value in dict1.items())
+            dict2 = dict((self._fold(key), value) for key, value in dict2.items())
+        for key in sorted(set(dict1).union(dict2)):
+            if key not in dict2:
+                if not self.ignore_extra_keys:
+                    yield "-", self.get_path(path, key), dict1[key], None
+            elif key not in dict1:
+                yield "+", self.get_path(path, key), None, dict2[key]
+            elif self.ignore_case or dict1[key] != dict2[key]:
+                for difference in self.iter_diff(dict1[key], dict2[key],
+                                                 self.get_path(path, key)):
+                    yield difference
+
+    def _iter_list_diff(self, path, list1, list2):
+        """Generator of the differences between two lists """
+        if self.list_key is not None:
+            index1 = self._get_key_index(list1)
+            index2 = self._get_key_index(list2)
+            if index1 is not None and index2 is not None:
+                return self._iter_keyed_list_diff(path, list1, list2, index1, index2)
+        if self.ordered_lists:
+            return self._iter_ordered_list_diff(path, list1, list2)
+        return self._iter_unordered_list_diff(path, list1, list2)
+
+    def _iter_ordered_list_diff(self, path, list1, list2):
+        """Generator of the differences between two lists, by position """
+        for index in range(max(len(list1), len(list2))):
+            if index >= len(list2):
+                yield "-", u"{0}[{1}]".format(path, index), list1[index], None
+            elif index >= len(list1):
+                yield "+", u"{0}[{1}]".format(path, index), None, list2[index]
+            elif self.ignore_case or list1[index] != list2[index]:
+                for difference in self.iter_diff(list1[index], list2[index],
+                                                 u"{0}[{1}]".format(path, index)):
+                    yield difference
+
+    def _iter_unordered_list_diff(self, path, list1, list2):
+        """Generator of the items of two lists which are not matched by
+        an equal item of the other list """
+        # equal items at the same position match each other, only the
+        # remaining items are canonicalized and matched by value
+        unmatched1 = []
+        unmatched2 = []
+        for index in range(max(len(list1), len(list2))):
+            if index >= len(list2):
+                unmatched1.append(index)
+            elif index >= len(list1):
+                unmatched2.append(index)
+            elif self.ignore_case or list1[index] != list2[index]:
+                unmatched1.append(index)
+                unmatched2.append(index)
+        canonical1 = [self._canonicalize(list1[index]) for index in unmatched1]
+        canonical2 = [self._canonicalize(list2[index]) for index in unmatched2]
+        if self.ignore_extra_keys:
+            matched1, matched2 = self._match_subset_items(
+                [list1[index] for index in unmatched1], canonical1,
+                [list2[index] for index in unmatched2], canonical2)
+            for position, index in enumerate(unmatched1):
+                if position not in matched1:
+                    yield "-", u"{0}[{1}]".format(path, index), list1[index], None
+            for position, index in enumerate(unmatched2):
+                if position not in matched2:
+                    yield "+", u"{0}[{1}]".format(path, index), None, list2[index]
+            return
+        remaining = Counter(canonical2)
+        for index, canonical in zip(unmatched1, canonical1):
+            if remaining[canonical]:
+                remaining[canonical] -= 1
+            else:
+                yield "-", u"{0}[{1}]".format(path, index), list1[index], None
+        remaining = Counter(canonical1)
+        for index, canonical in zip(unmatched2, canonical2):
+            if remaining[canonical]:
+                remaining[canonical] -= 1
+            else:
+                yield "+", u"{0}[{1}]".format(path, index), None, list2[index]
+
+    def _match_subset_items(self, items1, canonical1, items2, canonical2):
+        """Matches the items of two lists when the extra keys are ignored,
+        an item of the second list matches an item of the first list when
+        it is a subset of it. The items are matched one to one (maximum
+        bipartite matching), returns the positions of the matched items of
+        each list as ({position1: position2}, {position2: position1}) """
+        indexes = {}
+        candidates = []
+        for item2, key2 in zip(items2, canonical2):
+            candidates.append([position1 for position1 in self._get_subset_candidates(
+                items1, canonical1, item2, key2, indexes)
+                               if canonical1[position1] == key2 or
+                               self.equal(items1[position1], item2)])
+        matched1 = {}
+        matched2 = {}
+        for position2 in range(len(items2)):
+            # depth first search of a path of items matched earlier which
+            # can move to their other candidates, ends on a free item
+            visited = set()
+            stack = [(position2, iter(candidates[position2]))]
+            path = []
+            while stack:
+                current2, positions = stack[-1]
+                position1 = next((position1 for position1 in positions
+                                  if position1 not in visited), None)
+                if position1 is None:
+                    stack.pop()
+                    if path:
+                        path.pop()
+                    continue
+                visited.add(position1)
+                path.append((current2, position1))
+                if position1 not in matched1:
+                    for path2, path1 in path:
+                        matched1[path1] = path2
+                        matched2[path2] = path1
+                    break
+                stack.append((matched1[position1], iter(candidates[matched1[position1]])))
+        return matched1, matched2
+
+    def _get_subset_candidates(self, items1, canonical1, item2, key2, indexes):
+        """Returns the positions of the items of the first list which can
+        have item2 as a subset: the objects with the same values for the
+        keys of item2 whose values are not objects or lists, the equal
+        values for the other values. indexes caches the lookup tables """
+        if isinstance(item2, dict):
+            item2 = self._fold_keys(item2)
+            keys = tuple(sorted(key for key, value in item2.items()
+                                if not isinstance(value, (dict, list))))
+            index = indexes.get(keys)
+            if index is None:
+                index = indexes[keys] = {}
+                for position1, item1 in enumerate(items1):
+                    values = self._get_scalar_values(item1, keys)
+                    if values is not None:
+                        index.setdefault(values, []).append(position1)
+            return index.get(self._get_scalar_values(item2, keys), [])
+        if isinstance(item2, list):
+            return [position1 for position1, item1 in enumerate(items1)
+                    if isinstance(item1, list)]
+        index = indexes.get(None)
+        if index is None:
+            index = indexes[None] = {}
+            for position1, key1 in enumerate(canonical1):
+                index.setdefault(key1, []).append(position1)
+        return index.get(key2, [])
+
+    def _get_scalar_values(self, json_object, keys):
+        """Returns the values of the keys of an object, None when it is
+        not an object, misses a key or has an object or a list for it """
+        if not isinstance(json_object, dict):
+            return None
+        json_object = self._fold_keys(json_object)
+        values = []
+        for key in keys:
+            if key not in json_object or isinstance(json_object[key], (dict, list)):
+                return None
+            values.append(self._fold(json_object[key]))
+        return tuple(values)
+
+    def _fold_keys(self, json_object):
+        """Returns an object with its keys lowercased when the case is
+        ignored """
+        if self.ignore_case:
+            return dict((self._fold(key), value) for key, value in json_object.items())
+        return json_object
+
+    def _iter_keyed_list_diff(self, path, list1, list2, index1, index2):
+        """Generator of the differences between two lists of objects
+        matched by the value of list_key """
+        for item in list1:
+            value = item[self.list_key]
+            other = index2.get(self._canonicalize(value))
+            if other is None:
+                yield "-", self.get_filter_path(path, self.list_key, value), item, None
+            elif self.ignore_case or item != other:
+                item_path = self.get_filter_path(path, self.list_key, value)
+                for difference in self.iter_diff(item, other, item_path):
+                    yield difference
+        for item in list2:
+            value = item[self.list_key]
+            if self._canonicalize(value) not in index1:
+                yield "+", self.get_filter_path(path, self.list_key, value), None, item
+
+    def _get_key_index(self, json_list):
+        """Returns {canonical value of list_key: item} of a list of objects,
+        None when an item has no list_key or when a value is repeated """
+        index = {}
+        for item in json_list:
+            if not isinstance(item, dict) or self.list_key not in item:
+                return None
+            value = self._canonicalize(item[self.list_key])
+            if value in index:
+                return None
+            index[value] = item
+        return index
+
+    def _fold(self, value):
+        """Returns the value lowercased when the case is ignored """
+        if self.ignore_case and isinstance(value, basestring):
+            return value.lower()
+        return value
+
+    def _canonicalize(self, json_object):
+        """Returns a hashable form of a json object, equal to the hashable
+        form of the objects which do not differ from it """
+        if isinstance(json_object, dict):
+            return frozenset((self._fold(key), self._canonicalize(value))
+                             for key, value in json_object.items())
+        if isinstance(json_object, list):
+            items = [self._canonicalize(item) for item in json_object]
+            if self.ordered_lists and (self.list_key is None or
+                                       self._get_key_index(json_object) is None):
+                return tuple(items)
+            return frozenset(Counter(items).items())
+        return self._fold(json_object)
+
+    @staticmethod
+    def get_path(path, key):
+        """Returns the JSONPath of the member key of the object at path """
+        if IDENTIFIER.match(key):
+            return u"{0}.{1}".format(path, key)
+        return u"{0}['{1}']".format(path, key.replace("\\", "\\\\").replace("'", "\\'"))
+
+    @staticmethod
+    def get_filter_path(path, key, value):
+        """Returns the JSONPath of the item of the list at path whose key
+        has the value """
+        return u"{0}[?(@{1}=={2})]".format(path, JsonDiff.get_path(u"", key),
+                                           json.dumps(value, ensure_ascii=False))
+
+    @staticmethod
+    def describe(value):
+        """Short description of a json value for the difference lines """
+        if isinstance(value, dict):
+            return u"<object>"
+        if isinstance(value, list):
+            return u"<{0} items>".format(len(value))
+        return json.dumps(value, ensure_ascii=False)
+
+    @classmethod
+    def format_difference(cls, difference):
+        """Returns a difference as a unicode line:
+            - path: value present only in the first object
+            + path: value present only in the second object
+            ! path: value1 != value2
+        """
+        operation, path, value1, value2 = difference
+        if operation == "-":
+            return u"- {0}: {1}".format(path, cls.describe(value1))
+        if operation == "+":
+            return u"+ {0}: {1}".format(path, cls.describe(value2))
+        return u"! {0}: {1} != {2}".format(path, cls.describe(value1),
+                                           cls.describe(value2))
@@ -13,9 +13,10 @@ limitations under the License.
 
 """API for json related operations """
 import json
+from itertools import chain
 from Framework.Utils.print_Utils import print_info, print_exception, print_error
 from Framework.Utils.testcase_Utils import pNote,pSubStep
-import difflib
+from Framework.ClassUtils.json_diff_class import JsonDiff
 
 class JsonUtils(object):
     """class for json utils"""
@@ -62,6 +63,26 @@ class JsonUtils(object):
             json_object = dict({str(k).upper(): str(v).upper() for k, v in json_object.iteritems()})
         return json_object
 
+    def iter_json_diff(self, json_object1, json_object2, case_conversion=False,
+                       ordered_lists=True, list_key=None, check_for_subset=False):
+        """Generator of the structural differences between two json objects,
+        see JsonDiff for the (operation, path, value1, value2) tuples.
+        The objects are walked once, callers which only need a status
+        can stop at the first difference.
+        :Arguments:
+            1. case_conversion: compare keys and strings case insensitively
+            2. ordered_lists: compare the items of lists by position,
+               as unordered collections when False
+            3. list_key: key matching the objects of lists whatever
+               their order, eg: "id"
+            4. check_for_subset: ignore the keys present in json_object1
+               only, to check that json_object2 is a subset of json_object1
+        """
+        json_diff = JsonDiff(ordered_lists=ordered_lists, list_key=list_key,
+                             ignore_case=case_conversion,
+                             ignore_extra_keys=check_for_subset)
+        return json_diff.iter_diff(json_object1, json_object2)
+
     def diff_json_objects(self, json_object1, json_object2,case_conversion=False):
         """ Takes two json objects as inputs and calculates the difference between them.
         :Returns:
@@ -131,47 +152,51 @@ class JsonUtils(object):
         return result, result_list
 
     def compare_json_objects(self, json_object1, json_object2, case_conversion=False,
-                             write_diff_to_console=True, check_for_subset=False):
+                             write_diff_to_console=True, check_for_subset=False,
+                             list_key=None):
         """Compares two json objects and returns true or false
-        This method recursively sorts all the lists and dictionaries in the
-        json objects and then performs the comparison
+        The order of the items of lists does not matter, lists of objects
+        are matched by the value of list_key when one is given.
         If user selects check_for_subset as True, then checks whether json_object2
-        is a subset of json_object1 or not by recursively sorting the json objects
+        is a subset of json_object1 or not
         """
         print_info("compare two json objects")
         result = False
         try:
-            if case_conversion == True:
-                json_object1 = self.case_conversion_json(json_object1)
-                json_object2 = self.case_conversion_json(json_object2)
-            if check_for_subset:
-                json_object1 = self.sort_json_object(json_object1)
-                json_object2 = self.sort_json_object(json_object2)
-                result = all(item in json_object1.items() for item in json_object2.items())
-            else:
-                result = self.sort_json_object(json_object1) == self.sort_json_object(json_object2)
-            if not result and write_diff_to_console:
-                self.diff_json_objects(json_object1, json_object2)
+            differences = self.iter_json_diff(json_object1, json_object2, case_conversion,
+                                              ordered_lists=False, list_key=list_key,
+                                              check_for_subset=check_for_subset)
+            result = self.report_json_diff(differences, write_diff_to_console)
         except Exception as exception:
             print_exception(exception)
         return result
 
     def compare_json_files(self, json_file1, json_file2):
         """Compares two json files and returns true or false
-        This method recursively sorts all the lists and dictionaries in the
-        json files into a sorted json object and then performs the comparison"""
+        The order of the items of lists does not matter"""
         print_info("compare two json files")
         result = False
         try:
             json_object1 = json.load(open(json_file1, 'r'))
             json_object2 = json.load(open(json_file2, 'r'))
-            result = self.sort_json_object(json_object1) == self.sort_json_object(json_object2)
-            if not result:
-                self.diff_json_objects(json_object1, json_object2)
+            result = self.report_json_diff(self.iter_json_diff(
+                json_object1, json_object2, ordered_lists=False))
         except Exception as exception:
             print_exception(exception)
         return result
 
+    def report_json_diff(self, differences, write_diff_to_console=True):
+        """Returns True when there are no differences, the differences
+        are printed when write_diff_to_console is True, otherwise the
+        comparison stops at the first difference """
+        if not write_diff_to_console:
+            return next(differences, None) is None
+        result = True
+        for difference in differences:
+            result = False
+            print_info(JsonDiff.format_difference(difference))
+        return result
+
     def write_json_to_file(self, json_object, file_path):
         """Writes the given json object to the provided file """
 
@@ -217,31 +242,25 @@ class JsonUtils(object):
             pNote(exception, "error")
         return result, data
     
-    def write_json_diff_to_file(self, json_object1, json_object2, output_file):
+    def write_json_diff_to_file(self, json_object1, json_object2, output_file,
+                                list_key=None):
         """
             Compares two json objects and if they does not match writes the
-            difference into the output file
+            difference into the output file, one line per differing JSONPath.
+            The order of the items of lists does not matter, lists of objects
+            are matched by the value of list_key when one is given.
         """
-        result = self.compare_json_objects(json_object1, json_object2,
-                                           write_diff_to_console=False)
-        status = True
-        if not result:
-            status = False
-            sorted_json1 = self.sort_json_object(json_object1)
-            sorted_json2 = self.sort_json_object(json_object2)
-            json_obj1 = json.dumps(
-                sorted_json1, indent=4, separators=(',', ':'),
-                encoding="utf-8")
-            json_obj2 = json.dumps(
-                sorted_json2, indent=4, separators=(',', ':'),
-                encoding="utf-8")
-            te = open(output_file, 'w')
-            diff = ("\n".join(
-                difflib.ndiff(json_obj1.splitlines(), json_obj2.splitlines())))
-            te.write(diff)
-            te.close()
-        return status
-    
+        differences = self.iter_json_diff(json_object1, json_object2,
+                                          ordered_lists=False, list_key=list_key)
+        first = next(differences, None)
+        if first is None:
+            return True
+        with open(output_file, 'w') as diff_file:
+            for difference in chain([first], differences):
+                diff_file.write(JsonDiff.format_difference(difference).encode("utf-8"))
+                diff_file.write("\n")
+        return False
+
     def compare_json_using_jsonpath(self, response, list_of_jsonpath, list_of_expected_api_responses):
         """
             Will get each json_path in list of jsonpath and get the value of
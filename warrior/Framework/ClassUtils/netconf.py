@@ -27,6 +27,7 @@ from xml.dom.minidom import parseString
 from lxml import etree
 
 from Framework.Utils.testcase_Utils import pNote
+from Framework.Utils.xml_Utils import evaluate_xpath
 
 BUF_SIZE = 65536
 POLL_INTERVAL = 0.1
@@ -271,7 +272,7 @@ class client(Thread):
                               "##{}##".format(notification))
                         match = False
                         xml = etree.fromstring(notification)
-                        temp = xml.xpath(waitstr[0], namespaces=waitstr[1])
+                        temp = evaluate_xpath(xml, waitstr[0], waitstr[1])
                         if isinstance(temp, bool) and temp:
                             match = True
                         elif isinstance(temp, list) and len(temp) > 0:
@@ -182,7 +182,7 @@ class WRest(object):
 
     def cmp_response(self, response, expected_api_response,
                      expected_response_type, output_file,
-                     generate_output_diff_file=True):
+                     generate_output_diff_file=True, list_key=None):
         """
             Performs the comparison between api response
             and expected_api_response
@@ -199,6 +199,8 @@ class WRest(object):
               then generates an output file by writing the difference
               to the file by default and if it set to False then doesnot
               generate any file.
+              6.list_key: key matching the objects of lists of json
+              responses whatever their order, eg: "id"
             returns:
                 Returns True if the response matches with
                 the expected response else False.
@@ -234,7 +236,8 @@ class WRest(object):
                                                 expected_api_response)
                     extracted_response = JSON.loads(extracted_response)
                     status = self.json_utils.write_json_diff_to_file(
-                        extracted_response, expected_api_response, output_file)
+                        extracted_response, expected_api_response, output_file,
+                        list_key=list_key)
 
                 elif 'text' in response.headers['Content-Type']:
                     try:
@@ -0,0 +1,171 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Pool of authenticated cli sessions shared by the testcases of a suite
+
+When the pool is enabled (-sessionpool), CliActions.disconnect returns
+SSH/TELNET sessions to the pool instead of closing them and
+CliActions.connect reuses an idle session of the same system, subsystem,
+session name and credentials instead of logging in again.
+
+A session is reused only when it is alive and answers a probe with its
+prompt. Idle sessions are closed when the pool is full, when they have
+been idle for too long and at the end of the testsuite.
+
+There is one pool per process, a process forked with idle sessions in its
+pool starts with an empty pool and leaves the inherited sessions to its
+parent."""
+
+import os
+import time
+import atexit
+import hashlib
+import threading
+from collections import OrderedDict
+
+from Framework.Utils.print_Utils import print_debug, print_exception
+
+
+class CliSessionPool(object):
+    """Idle WarriorConnect sessions by pool key """
+
+    _pool = None
+    _pool_lock = threading.Lock()
+    # close_pool is registered at exit when the first pool is created
+    _exit_registered = False
+
+    def __init__(self, max_sessions=32, max_idle_time=600, probe_timeout=5):
+        """Constructor
+        max_sessions: maximum number of idle sessions in the pool
+        max_idle_time: seconds after which an idle session is closed
+        probe_timeout: seconds to wait for the prompt of a session before
+        reusing it """
+        self.max_sessions = max_sessions
+        self.max_idle_time = max_idle_time
+        self.probe_timeout = probe_timeout
+        self.pid = os.getpid()
+        # (pool key, id of the session): (session, release time),
+        # the oldest released session first
+        self.idle = OrderedDict()
+        self.lock = threading.Lock()
+
+    @classmethod
+    def get_pool(cls, max_sessions=32, max_idle_time=600):
+        """Returns the session pool of the process, the limits are
+        updated when the pool exists """
+        with cls._pool_lock:
+            if cls._pool is None or cls._pool.pid != os.getpid():
+                cls._pool = cls(max_sessions, max_idle_time)
+                if not cls._exit_registered:
+                    atexit.register(cls.close_pool)
+                    cls._exit_registered = True
+            else:
+                cls._pool.max_sessions = max_sessions
+                cls._pool.max_idle_time = max_idle_time
+            return cls._pool
+
+    @classmethod
+    def close_pool(cls):
+        """Closes the idle sessions of the pool of the process """
+        with cls._pool_lock:
+            pool, cls._pool = cls._pool, None
+        if pool is not None and pool.pid == os.getpid():
+            pool.close_all()
+
+    @staticmethod
+    def get_key(system_name, session_name, credentials):
+        """Returns the pool key of a session, the credentials are hashed,
+        the logfile of the testcase is not part of the key """
+        items = sorted((key, str(value)) for key, value in credentials.items()
+                       if key != "logfile")
+        return (system_name, session_name, hashlib.sha1(repr(items)).hexdigest())
+
+    def acquire(self, key):
+        """Returns an idle healthy session for the key, None when there is
+        none, the unhealthy sessions of the key are closed """
+        while True:
+            with self.lock:
+                expired = self._pop_expired()
+                war_conn_object = None
+                for idle_key in self.idle:
+                    if idle_key[0] == key:
+                        war_conn_object, _ = self.idle.pop(idle_key)
+                        break
+            self._close_later(expired)
+            if war_conn_object is None:
+                return None
+            if self.is_healthy(war_conn_object):
+                return war_conn_object
+            print_debug("Closing unhealthy pooled session {0}".format(key[:2]))
+            self._close(war_conn_object)
+
+    def release(self, key, war_conn_object):
+        """Returns a session to the pool, returns False when the session
+        cannot be pooled, the oldest idle sessions are closed when the pool
+        is full """
+        if self.max_sessions < 1 or not war_conn_object.isalive():
+            return False
+        with self.lock:
+            self.idle[(key, id(war_conn_object))] = (war_conn_object, time.time())
+            evicted = self._pop_expired()
+            while len(self.idle) > self.max_sessions:
+                evicted.append(self.idle.popitem(last=False)[1][0])
+        self._close_later(evicted)
+        return war_conn_object not in evicted
+
+    def is_healthy(self, war_conn_object):
+        """Returns True when the session is alive and answers with its
+        prompt """
+        try:
+            return war_conn_object.isalive() and \
+                war_conn_object.probe_prompt(self.probe_timeout)
+        except Exception as exception:
+            print_exception(exception)
+            return False
+
+    def close_all(self):
+        """Closes all the idle sessions """
+        with self.lock:
+            sessions = [session for session, _ in self.idle.values()]
+            self.idle.clear()
+        for session in sessions:
+            self._close(session)
+
+    def _pop_expired(self):
+        """Removes the sessions idle for more than max_idle_time from the
+        pool and returns them, called with the lock """
+        expired = []
+        deadline = time.time() - self.max_idle_time
+        for idle_key, (session, released) in self.idle.items():
+            if released > deadline:
+                break
+            del self.idle[idle_key]
+            expired.append(session)
+        return expired
+
+    def _close_later(self, sessions):
+        """Closes sessions in a background thread, closing a telnet
+        session takes several seconds """
+        if sessions:
+            thread = threading.Thread(target=lambda: [self._close(session)
+                                                      for session in sessions])
+            thread.daemon = True
+            thread.start()
+
+    @staticmethod
+    def _close(war_conn_object):
+        """Closes a session, errors are reported only """
+        try:
+            war_conn_object.disconnect()
+        except Exception as exception:
+            print_exception(exception)
@@ -0,0 +1,161 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Verification patterns matched against the output of a command as it
+arrives
+
+The patterns of a command are compiled once and searched in every chunk of
+output read from the session together with the last `window` characters of
+the previous output, only these characters (plus `margin` characters of
+context for the lookbehinds) are kept. A pattern is found as soon as it
+matches far enough from the end of the output for more output not to
+undo the match (`margin` characters), the patterns which never match are
+decided when the command completes.
+
+The streamed search only decides whether a pattern is found, as long as
+the matches are shorter than the window and the lookarounds shorter than
+the margin. The match itself may differ from the match in the complete
+response (a greedy pattern matches less of a partial output), the found
+patterns are searched again in the response when the command completes,
+from `window` characters before the streamed match as no earlier match
+can start before.
+
+This module must not import Framework.Utils, cli_Utils uses it."""
+
+import re
+
+
+class StreamPattern(object):
+    """A verification pattern and its search state """
+
+    def __init__(self, pattern, found):
+        """Constructor
+        pattern: regular expression searched in the output
+        found: True when the pattern is expected in the output """
+        self.regex = re.compile(pattern)
+        self.found = found
+        # offset of the output from which the matches are searched
+        self.pos = 0
+        self.match = None
+        # offsets of the output where the match starts and ends
+        self.start = None
+        self.end = None
+        self.decided = False
+
+    def decide(self, match, start=None, end=None):
+        """Records the match of the pattern, None when it is not found """
+        self.match = match
+        self.start = start
+        self.end = end
+        self.decided = True
+
+
+class StreamVerifier(object):
+    """Searches the verification patterns of a command in its output,
+    one chunk at a time """
+
+    def __init__(self, patterns, end_early=False, window=4096, margin=64):
+        """Constructor
+        patterns: list of (pattern, found) of the verifications
+        end_early: feed returns True when all the patterns are decided
+        window: characters of output searched again with the next chunk
+        margin: characters of output needed around a match to decide it """
+        self.patterns = [StreamPattern(pattern, found) for pattern, found in patterns]
+        self.end_early = end_early
+        self.window = window
+        self.margin = margin
+        # end of the output kept for the next chunks, text starts at
+        # offset base of the output
+        self.text = ""
+        self.base = 0
+        self.length = 0
+        # offset of the last chunk in the output
+        self.chunk = 0
+
+    @property
+    def decided(self):
+        """True when all the patterns are found, a pattern which is not
+        found is decided only when the command is complete """
+        return all(pattern.decided for pattern in self.patterns)
+
+    def feed(self, data):
+        """Searches the undecided patterns in a chunk of output, returns
+        True when the command can end """
+        if data:
+            self.chunk = self.length
+            self.text += data
+            self.length += len(data)
+            for pattern in self.patterns:
+                if not pattern.decided:
+                    self._search(pattern)
+            self._trim()
+        return self.end_early and self.decided
+
+    def finish(self, response):
+        """Decides the remaining patterns when the command is complete,
+        response is the response of the command, the output fed up to
+        the end prompt in the last chunk, the response is fed at once when
+        the output was not streamed
+
+        :Returns:
+            1. matches = match object re.search finds in the response for
+               every pattern, False when the pattern is not found
+        """
+        if not self.length:
+            self.feed(response)
+        total = len(response)
+        for pattern in self.patterns:
+            if pattern.decided and pattern.end is not None and pattern.end > total:
+                # matched in the output read after the end of the response
+                pattern.pos = max(pattern.pos, self.base)
+                pattern.decided = False
+            if not pattern.decided:
+                self._search(pattern, total)
+        return [pattern.match and self._search_response(pattern, response) or False
+                for pattern in self.patterns]
+
+    def _search_response(self, pattern, response):
+        """Returns the match re.search finds in the response for a found
+        pattern, the search starts window characters before the streamed
+        match instead of the start of the response """
+        return pattern.regex.search(response, max(0, pattern.start - self.window)) \
+            or pattern.regex.search(response)
+
+    def _search(self, pattern, total=None):
+        """Searches a pattern from its offset, the pattern is decided when total
+        (the length of the complete output) is given """
+        if total is None:
+            match = pattern.regex.search(self.text, pattern.pos - self.base)
+        else:
+            match = pattern.regex.search(self.text, pattern.pos - self.base,
+                                         max(0, total - self.base))
+        if total is not None:
+            pattern.decide(match, match and self.base + match.start(),
+                           match and self.base + match.end())
+        elif match is None:
+            pattern.pos = max(pattern.pos, self.chunk - self.window)
+        elif match.end() + self.margin <= len(self.text) or \
+                match.end() - match.start() > self.window:
+            pattern.decide(match, self.base + match.start(), self.base + match.end())
+        else:
+            # the match may change with more output
+            pattern.pos = min(self.base + match.start(),
+                              max(pattern.pos, self.chunk - self.window))
+
+    def _trim(self):
+        """Drops the output which is not searched anymore """
+        positions = [pattern.pos for pattern in self.patterns if not pattern.decided]
+        start = max(self.base, min(positions or [self.length]) - self.margin)
+        if start > self.base:
+            self.text = self.text[start - self.base:]
+            self.base = start
@@ -0,0 +1,154 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Cache of compiled testdata blocks
+
+data_Utils.get_command_details_from_testdata expands the testdata blocks
+matching a (title, row) into command details dictionaries (global values,
+varconfig, $wdf{}, ${ENV.*}, ${REPO.*}, iteration and list substitutions).
+data_Utils.get_command_records_from_testdata builds the same blocks up to
+the iteration and list substitutions, which are expanded while the commands
+are consumed. The cache keeps the dictionaries of a call together with what
+they depend on:
+
+    1. the signature (path, mtime, size) of every file it read
+    2. the value of every ${ENV.*}/${REPO.*} variable it substituted
+
+An entry is used only when the files did not change and every variable
+resolves to the same value as during the expansion, otherwise the blocks
+are expanded again.
+
+This module must not import Framework.Utils, data_Utils uses it."""
+
+import os
+import copy
+import threading
+from collections import OrderedDict
+from Framework.ClassUtils.xml_cache_class import XmlDocumentCache
+
+
+class DynamicValueRecorder(object):
+    """Records the ${ENV.*}/${REPO.*} variables resolved by the current
+    thread while a testdata block is expanded """
+
+    def __init__(self):
+        """Constructor """
+        self.local = threading.local()
+
+    def start(self):
+        """Starts recording for the current thread """
+        self.local.values = OrderedDict()
+
+    def stop(self):
+        """Stops recording and returns the recorded
+        (variable, value) pairs, None if recording was not started """
+        values = getattr(self.local, 'values', None)
+        self.local.values = None
+        return None if values is None else values.items()
+
+    def record(self, variable, value):
+        """Records the value of a variable when recording is on, the
+        value of the first resolution of a variable is kept """
+        values = getattr(self.local, 'values', None)
+        if values is not None and variable not in values:
+            values[variable] = value
+
+
+class CompiledTestdataCache(object):
+    """LRU cache of the expanded testdata blocks of a
+    get_command_details_from_testdata call
+
+    The dictionaries stored in the cache are never given to the callers,
+    get returns a deep copy which the callers may modify."""
+
+    def __init__(self, max_entries=512):
+        """Constructor """
+        self.max_entries = max_entries
+        # key: (file signatures, dynamic values, testdata dict)
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_signature(filename):
+        """Returns the signature of a file, (absolute path, None, None)
+        for a file that does not exist """
+        signature = XmlDocumentCache.get_key(filename)
+        if signature is None:
+            signature = (os.path.abspath(filename), None, None)
+        return signature
+
+    @classmethod
+    def get_signatures(cls, filenames):
+        """Returns the signatures of the files, None if one of them
+        cannot be cached (xml objects of database blocks) """
+        signatures = set()
+        for filename in filenames:
+            if filename is None or filename is False or filename == "":
+                continue
+            if not isinstance(filename, basestring):
+                return None
+            signatures.add(cls.get_signature(filename))
+        return tuple(sorted(signatures))
+
+    @classmethod
+    def _is_valid(cls, signatures, dynamic_values, resolve):
+        """Checks whether the files and the dynamic values
+        of an entry are unchanged """
+        for signature in signatures:
+            if cls.get_signature(signature[0]) != signature:
+                return False
+        for variable, value in dynamic_values:
+            if resolve(variable) != value:
+                return False
+        return True
+
+    def get(self, key, resolve):
+        """Returns a copy of the cached testdata dict of the key, None when
+        there is no valid entry. resolve(variable) returns the current value
+        of a dynamic variable in the format recorded during the expansion """
+        with self.lock:
+            entry = self.entries.get(key)
+        if entry is not None:
+            signatures, dynamic_values, testdata_dict = entry
+            if self._is_valid(signatures, dynamic_values, resolve):
+                with self.lock:
+                    if key in self.entries:
+                        self.entries[key] = self.entries.pop(key)
+                    self.hits += 1
+                return copy.deepcopy(testdata_dict)
+        with self.lock:
+            self.entries.pop(key, None)
+            self.misses += 1
+        return None
+
+    def put(self, key, signatures, dynamic_values, testdata_dict):
+        """Stores a copy of the testdata dict of the key """
+        entry = (signatures, tuple(dynamic_values), copy.deepcopy(testdata_dict))
+        with self.lock:
+            self.entries.pop(key, None)
+            self.entries[key] = entry
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        """Drops all the entries """
+        with self.lock:
+            self.entries.clear()
+
+    def get_stats(self):
+        """Returns the hit/miss counters of the cache """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "entries": len(self.entries)}
@@ -25,6 +25,7 @@ from Framework.Utils.testcase_Utils import pNote
 from Framework.Utils.print_Utils import print_error, print_exception,\
 print_debug, print_warning
 from Framework.ClassUtils.configuration_element_class import ConfigurationElement
+from Framework.ClassUtils.command_record_class import CommandRecord
 
 # Always keep 'repeat_list' as a last key for CMD_PARAMS dictionary
 CMD_PARAMS = OrderedDict([("command_list", "send"),
@@ -52,6 +53,7 @@ CMD_PARAMS = OrderedDict([("command_list", "send"),
                           ("operator_list", "operator"),
                           ("cond_value_list", "cond_value"),
                           ("cond_type_list", "cond_type"),
+                          ("stream_verify_list", "stream_verify"),
                           ("repeat_list", "repeat")])  # keep this in the last
 
 
@@ -190,12 +192,38 @@ class TestData(object):
 
         return verify_text_substituted
 
-    def list_substitution_precheck(self, varconfigfile, details_dict, start_pat="${", end_pat="}"):
+    @staticmethod
+    def get_cfg_elem_obj(varconfigfile, start_pat="${", end_pat="}"):
+        """
+            load and parse the varconfig file
+        :param varconfigfile:
+            varconfig file path or xml object, can be None
+        :return:
+            ConfigurationElement of the varconfig file or None
+        """
+        cfg_elem_obj = None
+        if varconfigfile is not None:
+            # when varconfigfile is an XMl object(root element) - this happens
+            # only when varconfigfile is taken from database server
+            if isinstance(varconfigfile, ElementTree.Element) is True:
+                cfg_elem_obj = ConfigurationElement("Varconfig_from_database",
+                                                    start_pat, end_pat)
+                cfg_elem_obj.parse_data(varconfigfile, elem_type="xml_object")
+            else:
+                cfg_elem_obj = ConfigurationElement(varconfigfile, start_pat, end_pat)
+                cfg_elem_obj.parse_data(varconfigfile)
+        return cfg_elem_obj
+
+    def list_substitution_precheck(self, varconfigfile, details_dict, start_pat="${",
+                                   end_pat="}", cfg_elem_obj=None):
         """
             entry function for cmd and verify text substitution check
-        :param cfg_elem_obj:
-            the object that load and parse the varconfig file
+        :param varconfigfile:
+            varconfig file path or xml object
         :param details_dict:
+        :param cfg_elem_obj:
+            the object that load and parse the varconfig file, it is created
+            from the varconfigfile when not provided
         :return:
             pair of list of boolean returned from cmd_quote_check and verify_text_check
         """ 
@@ -206,15 +234,8 @@ class TestData(object):
         verify_text_substituted = [False]*len(details_dict["command_list"])
 
         if varconfigfile is not None:
-            # when varconfigfile is an XMl object(root element) - this happens
-            # only when varconfigfile is taken from database server
-            if isinstance(varconfigfile, ElementTree.Element) is True:
-                cfg_elem_obj = ConfigurationElement("Varconfig_from_database",
-                                                    start_pat, end_pat)
-                cfg_elem_obj.parse_data(varconfigfile, elem_type="xml_object")
-            else:
-                cfg_elem_obj = ConfigurationElement(varconfigfile, start_pat, end_pat)
-                cfg_elem_obj.parse_data(varconfigfile)
+            if cfg_elem_obj is None:
+                cfg_elem_obj = self.get_cfg_elem_obj(varconfigfile, start_pat, end_pat)
             cmd_list_substituted = self.cmd_quote_check(cfg_elem_obj, details_dict)
             if details_dict["verify_text_list"]:
                 verify_text_substituted = self.verify_text_check(cfg_elem_obj, details_dict)
@@ -547,6 +568,16 @@ class TestDataIterations(object):
             last value of this list is the total number of
             commands in the in the expanded cmd_list)
         """
+        details_dict, cmd_loc_list, res_status = \
+        self._resolve_iteration_patterns(details_dict)
+        self._report_iteration_status(res_status)
+        return details_dict, cmd_loc_list
+
+    def _resolve_iteration_patterns(self, details_dict):
+        """
+        resolve_iteration_patterns without the status message,
+        returns the updated details_dict, cmd_loc_list and the status
+        """
         cmd_list = details_dict["command_list"]
         vc_file_list = details_dict["vc_file_list"]
         repeat_list = details_dict["repeat_list"]
@@ -612,7 +643,11 @@ class TestDataIterations(object):
                 if cmd_size == 1:
                     cmd_loc_list.append(i + cmd_size)
                 cmd_size -= 1
+        return details_dict, cmd_loc_list, res_status
 
+    @staticmethod
+    def _report_iteration_status(res_status):
+        """Logs the status of resolving the iteration patterns of a block """
         if res_status:
             print_debug("resolving iteration patterns in the command, "\
                         "command_parameters, verify search, verifcation "\
@@ -622,9 +657,73 @@ class TestDataIterations(object):
             print_debug("resolving iteration patterns in the command, "\
                         "command_parameters, verify search, verifcation "\
                         "parameters was failed")
-        return details_dict, cmd_loc_list
 
 
+    def iter_command_records(self, details_dict, varconfigfile, iter_type=None,
+                             start_pat="${", end_pat="}"):
+        """
+        Generator of the commands of a testdata block with the iteration
+        patterns, list substitutions and varconfig variables resolved
+
+        A testdata command is expanded only when the commands expanded
+        from the previous testdata commands have been consumed, only the
+        commands of a single testdata command are held in memory.
+        The commands of a per_td_block iteration are arranged across the
+        whole block, such a block is expanded before its first command
+        is produced.
+
+        :Yields:
+            a CommandRecord per command, its index is the position of
+            the command in the expanded block
+        """
+        index = 0
+        for cmd_slice in self.iter_command_slices(details_dict, varconfigfile, iter_type,
+                                                  start_pat, end_pat):
+            for position in range(len(cmd_slice["command_list"])):
+                yield CommandRecord.from_details(cmd_slice, position, index)
+                index += 1
+
+    def iter_command_slices(self, details_dict, varconfigfile, iter_type=None,
+                            start_pat="${", end_pat="}"):
+        """
+        Generator of the expanded details dict of each command of a testdata
+        block, see iter_command_records. The whole block is produced as a
+        single details dict for a per_td_block iteration.
+
+        :Yields:
+            a details dict with the commands expanded from a testdata command
+
+        The status of resolving the iteration patterns is logged once, when
+        the whole block has been expanded.
+        """
+        td_obj = TestData()
+        cfg_elem_obj = td_obj.get_cfg_elem_obj(varconfigfile, start_pat, end_pat)
+        # Type-2 iteration - per_td_block
+        if iter_type == "per_td_block":
+            slices = [details_dict]
+        else:
+            slices = (self._get_command_slice(details_dict, index)
+                      for index in range(len(details_dict["command_list"])))
+        res_status = True
+        for cmd_slice in slices:
+            cmd_slice, cmd_loc_list, slice_status = \
+            self._resolve_iteration_patterns(cmd_slice)
+            res_status = res_status and slice_status
+            if iter_type == "per_td_block":
+                cmd_slice, cmd_loc_list = self.repeat_per_td_block\
+                (cmd_slice, cmd_loc_list)
+                cmd_slice = self.arrange_per_td_block(cmd_slice, cmd_loc_list)
+
+            # List substitution happens after iteration because list sub cannot recognize the + sign in iteration
+            cmd_list_substituted, verify_text_substituted = td_obj.list_substitution_precheck\
+            (varconfigfile, cmd_slice, start_pat, end_pat, cfg_elem_obj)
+            td_obj.list_substitution(cmd_slice, varconfigfile, cmd_list_substituted,
+                                     verify_text_substituted, start_pat, end_pat)
+
+            yield td_obj.varsub_varconfig_substitutions\
+            (cmd_slice, vc_file=varconfigfile, var_sub=None, start_pat=start_pat, end_pat=end_pat)
+        self._report_iteration_status(res_status)
+
     def validate_iteration_patterns(self, cmd, details_dict, index):
         """
         Validate iteration patterns provided in the
@@ -1139,7 +1238,7 @@ class TestDataIterations(object):
         # Get the root of vc_file if there are problems is getting the root
         # catch the exception and assign root=None
         try:
-            root = xml_Utils.getRoot(vc_file)
+            root = xml_Utils.get_cached_root(vc_file)
         except Exception as exception:
             root = None
             print_exception(exception)
@@ -1254,6 +1353,14 @@ class TestDataIterations(object):
                 break
         return value
 
+    @staticmethod
+    def _get_command_slice(details_dict, index):
+        """
+        Get a details dict holding only the command at the index
+        """
+        return dict((key, value[index:index+1])
+                    for key, value in details_dict.items())
+
     @staticmethod
     def _check_list_lengths(details_dict):
         """
@@ -0,0 +1,192 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Compiled ${...} variable templates
+
+A string with variable references like "ping ${ENV.host} -c ${REPO.count}"
+is compiled once into its literal segments and the names of its references,
+the substitution of the references joins the segments with the values of
+the variables. Compiled templates are cached by string and patterns.
+
+This module must not import Framework.Utils, data_Utils and string_Utils
+use it."""
+
+import threading
+
+
+class VarTemplate(object):
+    """Compiled form of a string with variable references, names[i] is
+    the reference between literals[i] and literals[i+1] """
+
+    __slots__ = ('literals', 'names')
+
+    def __init__(self, literals, names):
+        """Constructor """
+        self.literals = literals
+        self.names = names
+
+    @classmethod
+    def compile(cls, string, start_pat="${", end_pat="}"):
+        """Compiles a string, references are found the same way as
+        string_Utils.return_quote: a reference starts with start_pat and
+        ends with the end_pat that balances it, nested references are part
+        of the name of the outer reference """
+        literals = []
+        names = []
+        literal_start = 0
+        position = 0
+        start_len = len(start_pat)
+        while True:
+            start = string.find(start_pat, position)
+            if start < 0:
+                break
+            count = 1
+            index = start + 1
+            end = -1
+            while True:
+                next_end = string.find(end_pat, index)
+                if next_end < 0:
+                    break
+                next_start = string.find(start_pat, index)
+                if 0 <= next_start <= next_end:
+                    count += 1
+                    index = next_start + 1
+                    continue
+                count -= 1
+                if count == 0:
+                    end = next_end
+                    break
+                index = next_end + 1
+            if end < 0:
+                # unbalanced reference, the rest of the string is literal
+                break
+            literals.append(string[literal_start:start])
+            names.append(string[start+start_len:end])
+            literal_start = end + len(end_pat)
+            position = end + 1
+        literals.append(string[literal_start:])
+        return cls(tuple(literals), tuple(names))
+
+    def render(self, values):
+        """Returns the string with the references replaced by the values,
+        values is a sequence of strings in the order of names """
+        parts = [self.literals[0]]
+        for value, literal in zip(values, self.literals[1:]):
+            parts.append(value)
+            parts.append(literal)
+        return "".join(parts)
+
+
+class VarSubstitution(object):
+    """Substitutes the variable references of strings and of the strings
+    nested in lists and dicts in a single walk, using a cache of compiled
+    templates """
+
+    def __init__(self, max_templates=8192):
+        """Constructor """
+        self.max_templates = max_templates
+        # (string, start_pat, end_pat): VarTemplate
+        self.templates = {}
+        self.lock = threading.Lock()
+
+    def get_template(self, string, start_pat="${", end_pat="}"):
+        """Returns the compiled template of the string """
+        key = (string, start_pat, end_pat)
+        template = self.templates.get(key)
+        if template is None:
+            template = VarTemplate.compile(string, start_pat, end_pat)
+            with self.lock:
+                if len(self.templates) >= self.max_templates:
+                    self.templates.clear()
+                self.templates[key] = template
+        return template
+
+    def get_names(self, string, start_pat="${", end_pat="}"):
+        """Returns the list of the names of the references of the string """
+        if start_pat not in string:
+            return []
+        return list(self.get_template(string, start_pat, end_pat).names)
+
+    def substitute_string(self, string, prefixes, resolve, on_error=None,
+                          start_pat="${", end_pat="}"):
+        """Substitutes the references of a string whose name contains one of
+        the prefixes with resolve(name), other references are left as they are.
+
+        prefixes are applied in order as if the string was substituted once
+        per prefix: the value of a reference of a prefix is substituted
+        again for the prefixes that follow it.
+
+        Returns None when a reference cannot be resolved (resolve raises
+        KeyError or TypeError or returns a value that is not a string),
+        on_error(prefix, name, string) is called for the reference """
+        if start_pat not in string:
+            return string
+        template = self.get_template(string, start_pat, end_pat)
+        if not template.names:
+            return string
+        values = []
+        resolved = {}
+        changed = False
+        for name in template.names:
+            if name in resolved:
+                values.append(resolved[name])
+                continue
+            for position, prefix in enumerate(prefixes):
+                if prefix in name:
+                    break
+            else:
+                resolved[name] = start_pat + name + end_pat
+                values.append(resolved[name])
+                continue
+            try:
+                value = resolve(name)
+            except (KeyError, TypeError):
+                value = None
+            if not isinstance(value, basestring):
+                if on_error is not None:
+                    on_error(prefix, name, string)
+                return None
+            if position + 1 < len(prefixes):
+                value = self.substitute_string(value, prefixes[position+1:],
+                                               resolve, on_error, start_pat, end_pat)
+                if value is None:
+                    return None
+            resolved[name] = value
+            values.append(value)
+            changed = True
+        return template.render(values) if changed else string
+
+    def substitute(self, value, prefixes, resolve, on_error=None,
+                   start_pat="${", end_pat="}"):
+        """Substitutes the references in a string or in the strings nested in
+        lists and dicts, see substitute_string. A string with a reference that
+        cannot be resolved is replaced by None. Lists and dicts that contain
+        substituted strings are returned as new objects, others are returned
+        as they are """
+        if isinstance(value, basestring):
+            return self.substitute_string(value, prefixes, resolve, on_error,
+                                          start_pat, end_pat)
+        if isinstance(value, list):
+            new_value = [self.substitute(item, prefixes, resolve, on_error,
+                                         start_pat, end_pat) for item in value]
+            if any(new is not old for new, old in zip(new_value, value)):
+                return new_value
+        elif isinstance(value, dict):
+            new_items = [(key, self.substitute(item, prefixes, resolve, on_error,
+                                               start_pat, end_pat))
+                         for key, item in value.items()]
+            if any(new is not value[key] for key, new in new_items):
+                new_value = value.copy()
+                new_value.update(new_items)
+                return new_value
+        return value
@@ -38,6 +38,8 @@ class WarriorConnect(object):
         self.session_object = None
         self.conn_string = ""
         self.status = None
+        # key of the session in the cli session pool, None when not pooled
+        self.pool_key = None
 
     def connect(self, credentials):
         """ To create SSH/Telnet connections using pexpect/paramiko modules.
@@ -126,6 +128,43 @@ class WarriorConnect(object):
 
         return status
 
+    def probe_prompt(self, timeout=5):
+        """
+        Sends an empty line and waits for the prompt of the session
+        :Arguments:
+            1. timeout = seconds to wait for the prompt
+        :Returns:
+            True if the prompt is received else False
+        """
+
+        if self.conn_type not in ["SSH", "TELNET"] or not self.session_object:
+            return False
+        target_host = self.session_object.target_host
+        pexpect = self.session_object.pexpect
+        target_host.sendline("")
+        result = target_host.expect([self.session_object.prompt, pexpect.EOF,
+                                     pexpect.TIMEOUT], timeout=timeout)
+        return result == 0
+
+    def set_logfile(self, logfile):
+        """
+        Writes the output of the pexpect session to a new logfile, the
+        previous logfile is closed
+        """
+
+        if self.conn_type not in ["SSH", "TELNET"] or not self.session_object:
+            return
+        target_host = self.session_object.target_host
+        previous = target_host.logfile
+        try:
+            target_host.logfile = open(logfile, "a")
+            self.session_object.logfile = logfile
+        except Exception as exception:
+            print_exception(exception)
+        else:
+            if previous not in [None, sys.stdout]:
+                previous.close()
+
     def read_nonblocking(self, size=1024, timeout=None, *args, **kwargs):
         """
         Reads characters(size) from pexpect/paramiko session
@@ -0,0 +1,142 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Process wide cache of parsed xml documents
+
+Testcase, datafile, testdata and varconfig files are read by many helpers
+of xml_Utils and data_Utils during the execution of a single keyword, the
+cache parses a file once and keeps its root element till the file changes.
+Result and log files are rewritten during the execution, their readers
+bypass the cache (cache=False).
+
+This module must not import Framework.Utils, xml_Utils uses it."""
+
+import os
+import threading
+from collections import OrderedDict
+from xml.etree import ElementTree
+
+
+def copy_element(element):
+    """Returns a deep copy of an ElementTree element, faster
+    than copy.deepcopy as only the xml content is copied """
+    new_element = ElementTree.Element(element.tag, element.attrib.copy())
+    new_element.text = element.text
+    new_element.tail = element.tail
+    new_element[:] = [copy_element(child) for child in element]
+    return new_element
+
+
+class XmlDocumentCache(object):
+    """LRU cache of parsed xml files keyed by (absolute path, mtime, size)
+
+    The root elements returned by get_root are shared by all the callers
+    and must not be modified, get_root_copy returns a private copy.
+    The memory used by the cache is bounded by the estimated size of the
+    parsed documents (max_bytes, see get_parsed_size), the least recently
+    used files are dropped first.
+
+    The documents are parsed with ElementTree.parse, another parse function
+    with the same interface (lxml etree.parse) can be provided."""
+
+    # approximate memory used by a parsed element (object, attrib dict,
+    # children list), 800 to 1000 bytes measured on the wftests files
+    ELEMENT_BYTES = 800
+
+    def __init__(self, max_bytes=128*1024*1024, parse=None):
+        """Constructor """
+        self.max_bytes = max_bytes
+        self.parse = parse or ElementTree.parse
+        self.total_bytes = 0
+        # absolute path: (key, root element, size)
+        self.documents = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_key(filename):
+        """Returns the cache key of the file, None if the file cannot be
+        cached (file objects, missing files) """
+        if not isinstance(filename, basestring):
+            return None
+        try:
+            stat = os.stat(filename)
+        except (OSError, TypeError):
+            return None
+        return os.path.abspath(filename), stat.st_mtime, stat.st_size
+
+    @classmethod
+    def get_parsed_size(cls, root, file_size):
+        """Returns the estimated memory used by a parsed document, the
+        elements plus their text (bounded by the file size) """
+        return file_size + cls.ELEMENT_BYTES * sum(1 for _ in root.iter())
+
+    def get_root(self, filename, cache=True):
+        """Returns the shared root element of the xml file, the file is
+        parsed only if it is not in the cache or changed since it was
+        parsed. Parse errors are raised as by ElementTree.parse.
+        With cache=False the file is parsed and not added to the cache """
+        key = self.get_key(filename) if cache else None
+        if key is None:
+            return self.parse(filename).getroot()
+        path = key[0]
+        with self.lock:
+            document = self.documents.pop(path, None)
+            if document is not None and document[0] == key:
+                self.documents[path] = document
+                self.hits += 1
+                return document[1]
+            if document is not None:
+                self.total_bytes -= document[2]
+            self.misses += 1
+        root = self.parse(filename).getroot()
+        with self.lock:
+            previous = self.documents.pop(path, None)
+            if previous is not None:
+                self.total_bytes -= previous[2]
+            size = self.get_parsed_size(root, key[2])
+            if size <= self.max_bytes:
+                self.documents[path] = (key, root, size)
+                self.total_bytes += size
+            while self.total_bytes > self.max_bytes and self.documents:
+                _, (_, _, evicted_size) = self.documents.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+        return root
+
+    def get_root_copy(self, filename, cache=True):
+        """Returns a copy of the root element of the xml file which
+        can be modified by the caller """
+        if not cache:
+            return self.parse(filename).getroot()
+        return copy_element(self.get_root(filename))
+
+    def invalidate(self, filename=None):
+        """Drops a file (all files when filename is None) from the cache """
+        with self.lock:
+            if filename is None:
+                self.documents.clear()
+                self.total_bytes = 0
+                return
+            document = self.documents.pop(os.path.abspath(filename), None)
+            if document is not None:
+                self.total_bytes -= document[2]
+
+    def get_stats(self):
+        """Returns the hit/miss counters of the cache """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses,
+                    "evictions": self.evictions, "files": len(self.documents),
+                    "bytes": self.total_bytes}
@@ -0,0 +1,144 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Canonical form of xml documents for comparisons
+
+The canonical form of an element follows the dictionary built by xmltodict
+for the element, which xml_Utils.compare_xml used to compare documents:
+
+    - None for an element without attributes, children and text
+    - the stripped text for an element with text only
+    - otherwise the '@name' attributes, the children by tag (a tuple of
+      values for repeated tags, in document order) and the '#text'
+
+Mappings are frozensets of (key, value) items, the order of the attributes
+and of the children with different tags does not matter. Tags keep their
+{namespace}, the prefixes used by the documents do not matter.
+
+The canonical forms are hashable, their hashes are computed once, equal
+documents are found without building any string. The differences of two
+documents are produced one at a time with the path of the differing nodes.
+
+This module must not import Framework.Utils, xml_Utils uses it."""
+
+
+class CanonicalXml(object):
+    """Canonical form of the root element of an xml document """
+
+    def __init__(self, root):
+        """Constructor, root is an ElementTree element """
+        self.tag = root.tag
+        self.value = self.canonicalize(root)
+        self.hash = hash((self.tag, self.value))
+
+    @classmethod
+    def canonicalize(cls, element):
+        """Returns the canonical form of an element """
+        text = element.text or ""
+        items = {}
+        for key, value in element.attrib.items():
+            items["@" + key] = value
+        if len(element):
+            texts = [text]
+            repeated = set()
+            for child in element:
+                if child.tail:
+                    texts.append(child.tail)
+                value = cls.canonicalize(child)
+                if child.tag in items:
+                    if child.tag in repeated:
+                        items[child.tag].append(value)
+                    else:
+                        items[child.tag] = [items[child.tag], value]
+                        repeated.add(child.tag)
+                else:
+                    items[child.tag] = value
+            for tag in repeated:
+                items[tag] = tuple(items[tag])
+            text = "".join(texts)
+        text = text.strip() or None
+        if not items:
+            return text
+        if text is not None:
+            items["#text"] = text
+        return frozenset(items.items())
+
+    def __eq__(self, other):
+        """Equality of the documents, the hashes are compared first """
+        return isinstance(other, CanonicalXml) and self.hash == other.hash and \
+            self.tag == other.tag and self.value == other.value
+
+    def __ne__(self, other):
+        """Inequality of the documents """
+        return not self.__eq__(other)
+
+    def __hash__(self):
+        """Hash of the canonical form """
+        return self.hash
+
+    def iter_diff(self, other):
+        """Generator of the differences with another document,
+        one unicode line per differing node:
+            - path: node present only in this document
+            + path: node present only in the other document
+            ! path: value != other value
+        """
+        if self.tag != other.tag:
+            yield u"- /{0}".format(self.tag)
+            yield u"+ /{0}".format(other.tag)
+            return
+        for line in self._iter_value_diff(u"/" + self.tag, self.value, other.value):
+            yield line
+
+    @classmethod
+    def _iter_value_diff(cls, path, value1, value2):
+        """Generator of the differences between two canonical values of
+        the node at path """
+        if value1 == value2:
+            return
+        if isinstance(value1, frozenset) and isinstance(value2, frozenset):
+            items1 = dict(value1)
+            items2 = dict(value2)
+            for key in sorted(set(items1) | set(items2)):
+                child_path = u"{0}/{1}".format(path, key)
+                if key not in items2:
+                    yield u"- {0}".format(child_path)
+                elif key not in items1:
+                    yield u"+ {0}".format(child_path)
+                else:
+                    for line in cls._iter_value_diff(child_path, items1[key], items2[key]):
+                        yield line
+        elif isinstance(value1, tuple) and isinstance(value2, tuple):
+            for index in range(max(len(value1), len(value2))):
+                item_path = u"{0}[{1}]".format(path, index + 1)
+                if index >= len(value2):
+                    yield u"- {0}".format(item_path)
+                elif index >= len(value1):
+                    yield u"+ {0}".format(item_path)
+                else:
+                    for line in cls._iter_value_diff(item_path, value1[index], value2[index]):
+                        yield line
+        else:
+            yield u"! {0}: {1} != {2}".format(path, cls._describe(value1),
+                                              cls._describe(value2))
+
+    @staticmethod
+    def _describe(value):
+        """Short description of a canonical value for the diff lines """
+        if isinstance(value, frozenset):
+            return "<element>"
+        if isinstance(value, tuple):
+            return "<{0} elements>".format(len(value))
+        if value is None:
+            return "<empty>"
+        return u"'{0}'".format(value)
@@ -0,0 +1,80 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Cache of compiled lxml XPath expressions
+
+element.xpath(path, namespaces=ns) parses the expression and registers the
+namespaces for every call. The cache compiles an expression with etree.XPath
+once per (expression, namespace map) and evaluates the compiled expression
+on the elements, the results are the results of element.xpath.
+
+Equal namespace maps share a single dict, compiled expressions are kept per
+thread as lxml XPath objects must not be evaluated by several threads at the
+same time.
+
+This module requires lxml and must not import Framework.Utils, xml_Utils
+uses it when lxml is installed."""
+
+import threading
+from collections import OrderedDict
+from lxml import etree
+
+
+class CompiledXPathCache(object):
+    """LRU cache of etree.XPath objects by expression and namespace map """
+
+    def __init__(self, max_entries=1024):
+        """Constructor """
+        self.max_entries = max_entries
+        # sorted namespace items: shared namespace dict
+        self.namespaces = {}
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def get_namespaces(self, namespaces):
+        """Returns (key, shared dict) of a namespace map, (None, None)
+        when there are no namespaces """
+        if not namespaces:
+            return None, None
+        key = tuple(sorted(namespaces.items()))
+        shared = self.namespaces.get(key)
+        if shared is None:
+            with self.lock:
+                shared = self.namespaces.setdefault(key, dict(key))
+        return key, shared
+
+    def _get_entries(self):
+        """Returns the compiled expressions of the current thread """
+        entries = getattr(self.local, 'entries', None)
+        if entries is None:
+            entries = self.local.entries = OrderedDict()
+        return entries
+
+    def get_xpath(self, path, namespaces=None):
+        """Returns the compiled etree.XPath of the expression, XPathSyntaxError
+        is raised for an invalid expression """
+        ns_key, shared = self.get_namespaces(namespaces)
+        key = (path, ns_key)
+        entries = self._get_entries()
+        xpath = entries.pop(key, None)
+        if xpath is None:
+            xpath = etree.XPath(path, namespaces=shared)
+            if len(entries) >= self.max_entries:
+                entries.popitem(last=False)
+        entries[key] = xpath
+        return xpath
+
+    def evaluate(self, element, path, namespaces=None):
+        """Evaluates the expression on an lxml element or tree,
+        same result as element.xpath(path, namespaces=namespaces) """
+        return self.get_xpath(path, namespaces)(element)
@@ -18,15 +18,23 @@ import sys
 import time
 import re
 import subprocess
+import Queue
+import threading
+import traceback
 import Tools
 import Framework.ClassUtils
-from Framework.Utils import datetime_utils, data_Utils, xml_Utils
+from Framework.Utils import datetime_utils, data_Utils, xml_Utils, config_Utils,\
+string_Utils, file_Utils, testcase_Utils
 from Framework.Utils.data_Utils import get_object_from_datarepository
 from Framework.Utils.print_Utils import print_debug, print_info,\
 print_error, print_exception, print_warning
 from Framework.Utils.testcase_Utils import pNote
 from Framework.Utils.list_Utils import get_list_by_separating_strings
-from Framework.ClassUtils.WNetwork.loging import ThreadedLog
+from Framework.Utils.encryption_utils import decrypt
+from Framework.ClassUtils.WNetwork.loging import LogCollector
+from Framework.ClassUtils.stream_verifier_class import StreamVerifier
+from Framework.ClassUtils.expect_engine_class import ExpectEngine
+from Framework.ClassUtils.session_pool_class import CliSessionPool
 from WarriorCore.Classes.war_cli_class import WarriorCliClass
 from Framework.ClassUtils import database_utils_class
 
@@ -39,12 +47,19 @@ except ImportError:
                "without pexpect module. Users can however create"\
                "their own custom libraries for cli interaction \n")
 
+# defaults of the connect keywords of CliActions, also used for the
+# connections opened in parallel by open_connections
+CONNECT_PROMPT = ".*(%|#|\$)"
+CONNECT_IP_TYPE = "ip"
+CONNECT_TIMEOUT = 60
+
+
 def cmdprinter(cmdfunc):
     def inner(*args, **kwargs):
         if WarriorCliClass.cmdprint:
             result = (True,"")
             if cmdfunc.__name__ == "_send_cmd_get_status":
-                pNote(":CMD: %s"%(args[1]["command_list"][kwargs['index']]))
+                pNote(":CMD: %s"%(args[1].command))
             elif cmdfunc.__name__ == "_send_command_retrials":
                 pass
             elif cmdfunc.__name__ == "send_command":
@@ -393,6 +408,277 @@ def get_connection_port(conn_type, inpdict):
 
     return inpdict
 
+
+def get_session_pool():
+    """Returns the cli session pool when it is enabled (-sessionpool)
+    else None """
+    if not get_object_from_datarepository('ow_session_pool', verbose=False):
+        return None
+    max_sessions = get_object_from_datarepository('ow_session_pool_size',
+                                                  verbose=False) or 32
+    max_idle_time = get_object_from_datarepository('ow_session_pool_idle',
+                                                   verbose=False) or 600
+    return CliSessionPool.get_pool(max_sessions, max_idle_time)
+
+
+def get_connection(system_name, session_name, credentials):
+    """Returns a WarriorConnect object connected with the credentials,
+    an idle session of the session pool is reused when the pool is
+    enabled, the new sessions are then returned to the pool on
+    disconnect """
+    from Framework.ClassUtils.warrior_connect_class import WarriorConnect
+    pool = get_session_pool()
+    pool_key = None
+    if pool is not None and credentials['conn_type'] in ["SSH", "TELNET"] \
+       and not WarriorCliClass.cmdprint:
+        pool_key = pool.get_key(system_name, session_name, credentials)
+        war_conn_object = pool.acquire(pool_key)
+        if war_conn_object is not None:
+            war_conn_object.set_logfile(credentials['logfile'])
+            pNote("Reusing a pooled session for system={0}, session={1}"
+                  .format(system_name, session_name))
+            return war_conn_object
+    war_conn_object = WarriorConnect()
+    war_conn_object.connect(credentials)
+    if war_conn_object.status is True:
+        war_conn_object.pool_key = pool_key
+    return war_conn_object
+
+
+def get_ssh_credentials(datafile, system_name, session_name=None,
+                        prompt=CONNECT_PROMPT, ip_type=CONNECT_IP_TYPE,
+                        int_timeout=CONNECT_TIMEOUT, via_host=None):
+    """Returns the credentials of the ssh connection to a system or a
+    subsystem, None/False when they are not in the datafile """
+    credentials = data_Utils.get_credentials(datafile, system_name,
+                                             [ip_type, 'ssh_port', 'username',
+                                              'password', 'prompt', 'timeout',
+                                              'conn_options', 'custom_keystroke'])
+    if credentials is None or credentials is False:
+        return credentials
+    session_id = data_Utils.get_session_id(system_name, session_name)
+    if not credentials["custom_keystroke"]:
+        credentials["custom_keystroke"] = "wctrl:M"
+    credentials = get_connection_port("ssh", credentials)
+    credentials["logfile"] = file_Utils.getCustomLogFile(config_Utils.filename,
+                                                         config_Utils.logsdir,
+                                                         'ssh_%s_' % session_id)
+    credentials["prompt"] = prompt if not credentials["prompt"]\
+    else credentials["prompt"]
+    credentials["timeout"] = int_timeout if not credentials["timeout"]\
+    else credentials["timeout"]
+    credentials["password"] = decrypt(credentials["password"])
+
+    if ip_type != "ip":
+        credentials['ip'] = credentials[ip_type]
+    # To get the details of the intermediate system
+    if via_host is not None:
+        via_crendentials = data_Utils.get_credentials(datafile, via_host,
+                                                      [ip_type, 'ssh_port',
+                                                       'username', 'password',
+                                                       'timeout'])
+        credentials['conn_type'] = "SSH_NESTED"
+        credentials['via_ip'] = via_crendentials[ip_type]
+        credentials['via_port'] = via_crendentials['ssh_port']
+        credentials['via_username'] = via_crendentials['username']
+        credentials['via_password'] = via_crendentials['password']
+        credentials["via_timeout"] = int_timeout if not \
+            via_crendentials["timeout"] else \
+            int(via_crendentials["timeout"])
+    else:
+        credentials['conn_type'] = "SSH"
+    return credentials
+
+
+def get_telnet_credentials(datafile, system_name, session_name=None,
+                           ip_type=CONNECT_IP_TYPE, int_timeout=CONNECT_TIMEOUT):
+    """Returns the credentials of the telnet connection to a system or a
+    subsystem, None/False when they are not in the datafile """
+    credentials = data_Utils.get_credentials(datafile, system_name,
+                                             [ip_type, 'telnet_port', 'username',
+                                              'prompt', 'password', 'timeout',
+                                              'conn_options', 'custom_keystroke'])
+    if credentials is None or credentials is False:
+        return credentials
+    session_id = data_Utils.get_session_id(system_name, session_name)
+    if not credentials["custom_keystroke"]:
+        credentials["custom_keystroke"] = "wctrl:M"
+    credentials = get_connection_port("telnet", credentials)
+    credentials['logfile'] = file_Utils.getCustomLogFile(config_Utils.filename,
+                                                         config_Utils.logsdir,
+                                                         'telnet_{0}_'\
+                                                         .format(session_id))
+    credentials["timeout"] = int_timeout if not credentials["timeout"]\
+    else credentials["timeout"]
+    credentials["password"] = decrypt(credentials["password"])
+
+    if ip_type != "ip":
+        credentials['ip'] = credentials[ip_type]
+    credentials['conn_type'] = "TELNET"
+    return credentials
+
+
+def connect_session(system_name, session_name, credentials, prepared=None):
+    """Returns the WarriorConnect object of a system, prepared is the
+    (credentials, WarriorConnect object, notes, duration) of the
+    connection opened in parallel by open_connections if any """
+    if prepared is None:
+        return get_connection(system_name, session_name, credentials)
+    _, war_conn_object, notes, duration = prepared
+    for note in notes:
+        testcase_Utils.TCOBJ.p_note_level(note, ptc=False)
+    pNote("Connection time for system={0}, session={1}: {2:.2f} sec"
+          .format(system_name, session_name, duration))
+    return war_conn_object
+
+
+def get_datafile_system_list(datafile):
+    """Returns the names of all the systems of the datafile,
+    system[subsystem] for the systems with subsystems """
+    root = xml_Utils.getRoot(datafile)
+    systems = root.findall('system')
+    system_list = []
+    for system in systems:
+        #check if the system has subsystem or not.
+        subsystems = system.findall('subsystem')
+        if subsystems != []:
+            for subsystem in subsystems:
+                subsystem_name = subsystem.get('name')
+                system_name = system.get('name') + '[' + subsystem_name + ']'
+                system_list.append(system_name)
+        #if there is no subsystem use the system.
+        else:
+            system_name = system.get('name')
+            system_list.append(system_name)
+    return system_list
+
+
+def get_call_system_names(datafile, system_list):
+    """Returns the system or system[subsystem] names of a list of
+    system names which may have lists of subsystems """
+    call_system_names = []
+    for system_name in system_list:
+        system_name, subsystem_list = \
+            data_Utils.resolve_system_subsystem_list(datafile, system_name)
+        if subsystem_list is None:
+            call_system_names.append(system_name)
+        else:
+            call_system_names.extend("{0}[{1}]".format(system_name, subsystem_name)
+                                     for subsystem_name in subsystem_list)
+    return call_system_names
+
+
+def open_connections(datafile, system_list, session_name, max_workers):
+    """Opens the ssh/telnet connections to a list of systems in at most
+    max_workers parallel threads with the defaults of the connect keywords,
+    returns {(system name, session name): (credentials, WarriorConnect
+    object, notes, duration)} of the connections, see connect_session """
+    prepared = {}
+    prepare_list = []
+    for call_system_name in get_call_system_names(datafile, system_list):
+        conn_type = data_Utils.getSystemData(datafile, call_system_name, "conn_type")
+        if conn_type == "ssh":
+            credentials = get_ssh_credentials(datafile, call_system_name, session_name)
+        elif conn_type == "telnet":
+            credentials = get_telnet_credentials(datafile, call_system_name,
+                                                 session_name)
+        else:
+            continue
+        if credentials is not None and credentials is not False:
+            prepare_list.append((call_system_name, session_name, credentials))
+    if not prepare_list:
+        return prepared
+    pNote("Opening {0} connections, {1} at a time".format(len(prepare_list),
+                                                          max_workers))
+    results = run_in_threads(_open_connection, prepare_list, max_workers)
+    for (call_system_name, _, credentials), result in zip(prepare_list, results):
+        if result is not None:
+            prepared[(call_system_name, session_name)] = (credentials,) + result
+    return prepared
+
+
+def _open_connection(system_name, session_name, credentials):
+    """Opens a connection in a thread of open_connections, returns
+    (WarriorConnect object, notes, duration), the notes written by the
+    connection are kept in memory to be reported by connect_session """
+    config_Utils.register_kw_thread()
+    config_Utils.set_resultfile(None)
+    testcase_Utils.TCOBJ.register_thread()
+    start_time = time.time()
+    try:
+        testcase_Utils.TCOBJ.p_testcase()
+        war_conn_object = get_connection(system_name, session_name, credentials)
+        notes = [note.text for note in testcase_Utils.TCOBJ.root.iter("Note")]
+    finally:
+        testcase_Utils.TCOBJ.unregister_thread()
+        config_Utils.unregister_kw_thread()
+    return war_conn_object, notes, time.time() - start_time
+
+
+def close_sessions(datafile, system_list, session_name, max_workers):
+    """Closes the ssh/telnet sessions of a list of systems in at most
+    max_workers parallel threads, the sessions with a disconnect smart
+    action or which go back to the session pool are left to disconnect,
+    returns {session_id: time taken to close the session} """
+    from Framework.ClassUtils.warrior_connect_class import WarriorConnect
+    durations = {}
+    close_list = []
+    for call_system_name in get_call_system_names(datafile, system_list):
+        session_id = data_Utils.get_session_id(call_system_name, session_name)
+        war_conn_object = get_object_from_datarepository(session_id, verbose=False)
+        if not isinstance(war_conn_object, WarriorConnect) or \
+           war_conn_object.conn_type not in ["SSH", "TELNET"] or \
+           (war_conn_object.pool_key and get_session_pool() is not None) or \
+           get_object_from_datarepository(session_id + "_system", verbose=False):
+            continue
+        close_list.append((session_id, war_conn_object))
+    if not close_list:
+        return durations
+    results = run_in_threads(close_session, close_list, max_workers)
+    for (session_id, _), duration in zip(close_list, results):
+        if duration is not None:
+            durations[session_id] = duration
+    return durations
+
+
+def close_session(session_id, war_conn_object):
+    """Closes a session, returns the time it took """
+    start_time = time.time()
+    war_conn_object.disconnect()
+    return time.time() - start_time
+
+
+def run_in_threads(function, args_list, max_workers):
+    """Calls function with every tuple of arguments of args_list in at most
+    max_workers threads, returns the results in the order of args_list,
+    None for the calls which raised an exception """
+    results = [None] * len(args_list)
+    task_q = Queue.Queue()
+    for index, args in enumerate(args_list):
+        task_q.put((index, args))
+
+    def worker():
+        """Calls function for the tasks of the queue till it is empty """
+        while True:
+            try:
+                index, args = task_q.get_nowait()
+            except Queue.Empty:
+                return
+            try:
+                results[index] = function(*args)
+            except Exception:
+                print_error('unexpected error {0}'.format(traceback.format_exc()))
+
+    thread_list = []
+    for _ in range(max(1, min(int(max_workers or 1), len(args_list)))):
+        thread = threading.Thread(target=worker)
+        thread.daemon = True
+        thread.start()
+        thread_list.append(thread)
+    for thread in thread_list:
+        thread.join()
+    return results
+
 @cmdprinter
 def send_command(session_object, start_prompt, end_prompt, command,
                  timeout=60):
@@ -563,37 +849,30 @@ def send_commands_from_testdata(testdatafile, obj_session, **args):
         if row:
             pNote("**************{}**************".format('Row: ' + row))
     system_name = args.get("system_name")
-    testdata_dict = data_Utils.get_command_details_from_testdata(testdatafile, varconfigfile,
-                                                                 var_sub=var_sub, title=title,
-                                                                 row=row, system_name=system_name, datafile=datafile)
-    finalresult = True if len(testdata_dict) > 0 else False
-    for key, details_dict in testdata_dict.iteritems():
+    testdata_records = data_Utils.get_command_records_from_testdata(testdatafile, varconfigfile,
+                                                                    var_sub=var_sub, title=title,
+                                                                    row=row, system_name=system_name, datafile=datafile)
+    finalresult = True if len(testdata_records) > 0 else False
+    for key, records in testdata_records.iteritems():
         response_dict = {}
         responses_dict[key]=""
-        command_list = details_dict["command_list"]
         stepdesc = "Send the following commands: "
         pNote(stepdesc)
-        n=0
-        for commands in command_list:
-            pNote("Command #{0}\t: {1}".format((n+1), commands))
-            n = n + 1
-        intsize = len(command_list)
-        if intsize == 0:
-            finalresult = False
-
-        # Send Commands
-        for i in range(0, intsize):
+        # Commands are expanded from the testdata one at a time
+        # while they are sent
+        i = -1
+        for i, record in enumerate(records):
             print("\n")
             print_debug(">>>")
-            command = details_dict["command_list"][i]
+            command = record.command
             pNote("Command #{0}\t: {1}".format(str(i+1), command))
-            new_obj_session, details_dict = _get_obj_session(details_dict, obj_session, system_name,
-                                                         index=i)
+            new_obj_session, record = _get_obj_session(record, obj_session, system_name,
+                                                       index=i)
             if new_obj_session:
-                result, response = _send_cmd_get_status(new_obj_session, details_dict, index=i, system_name=system_name)
-                result, response = _send_command_retrials(new_obj_session, details_dict, index=i,
+                result, response = _send_cmd_get_status(new_obj_session, record, index=i, system_name=system_name)
+                result, response = _send_command_retrials(new_obj_session, record, index=i,
                                                           result=result, response=response, system_name=system_name)
-                response_dict = _get_response_dict(details_dict, i, response,
+                response_dict = _get_response_dict(record, i, response,
                                                    response_dict)
                 print_debug("<<<")
             else:
@@ -606,12 +885,16 @@ def send_commands_from_testdata(testdatafile, obj_session, **args):
                 result = "ERROR"
                 finalresult = "ERROR"
             finalresult = finalresult and result
+        if i < 0:
+            finalresult = False
         responses_dict[key]=response_dict
     return finalresult, responses_dict
 
 @cmdprinter
 def _send_cmd(obj_session, **kwargs):
-    """method to send command based on the type of object """
+    """method to send command based on the type of object,
+    the observer gets the output of the command as it is read (pexpect
+    sessions of WarriorConnect objects only) """
     result = False
     response = ""
     command = kwargs.get('command')
@@ -620,8 +903,14 @@ def _send_cmd(obj_session, **kwargs):
         startprompt = kwargs.get('startprompt', ".*")
         endprompt = kwargs.get('endprompt', None)
         cmd_timeout = kwargs.get('cmd_timeout', None)
-        result, response = obj_session.send_command(startprompt, endprompt,
-                                                    command, cmd_timeout)
+        observer = kwargs.get('observer', None)
+        if observer is None:
+            result, response = obj_session.send_command(startprompt, endprompt,
+                                                        command, cmd_timeout)
+        else:
+            result, response = ExpectEngine().send_command(
+                [(None, obj_session)], startprompt, endprompt, command,
+                cmd_timeout, [observer])[0]
     # below block is for backward compatibility - should be removed when we
     # take out send_command method from this file
     elif isinstance(obj_session, pexpect.spawn):
@@ -636,16 +925,12 @@ def _send_cmd(obj_session, **kwargs):
     return result, response
 
 
-def _get_response_dict(details_dict, index, response, response_dict):
-    """Get the response dict for a command. """
-    resp_ref = details_dict["resp_ref_list"][index]
-    resp_req = details_dict["resp_req_list"][index]
-    resp_pat_req = details_dict["resp_pat_req_list"][index]
-
-    resp_req = {None:'y', '':'y',
-                'no':'n', 'n':'n'}.get(str(resp_req).lower(), 'y')
-    resp_ref = {None:index+1, '':index+1 }.get(resp_ref, str(resp_ref))
-    #response_key=resp_ref_list[i] if resp_ref_list[i] else i+1
+def _get_response_dict(record, index, response, response_dict):
+    """Get the response dict for a command.
+    record is the command record, index its position in the testdata block """
+    resp_ref = record.resp_ref
+    resp_req = record.resp_req
+    resp_pat_req = record.resp_pat_req
     if not resp_req=="n":
         if resp_pat_req is not None:
             # if the requested pattern not found return empty string
@@ -664,16 +949,20 @@ def start_threads(started_thread_for_system, thread_instance_list, same_system,
     gotten from monitor attributes and verify_on attributes
 
     If a system_name has a * against it, it indicates that the system is the
-    same as the one on which the testcase is running. Thread would not be
-    started for that system.
+    same as the one on which the testcase is running. The response would not
+    be collected for that system.
+
+    The responses of the other systems are collected by the log collector
+    of the testcase, a single thread reading all the monitored sessions.
 
     :Returns:
 
     started_thread_for_system (list[str]) = Stores the system names for which
-    threads were succesfully created
+    the response is collected
 
-    thread_instance_list (list[str]) = stores the instances of thread created
-    for corresponding system in the started_thread_for_system list,
+    thread_instance_list (list[int]) = stores the marks of the log collector
+    buffers of the systems in the started_thread_for_system list, the
+    response of a system starts at its mark
 
     same_system (list[str]) = stores the system name which was the same as the
     system on which the TC is running without the trailing *,
@@ -702,21 +991,22 @@ def start_threads(started_thread_for_system, thread_instance_list, same_system,
                     print_info("{0} does not exist in data repository".format(unique_log_verify_list[i]))
                 else:
                     try:
-                        new_thread = ThreadedLog()
-                        new_thread.start_thread(datarep_obj)
+                        collector = LogCollector.get_collector(config_Utils.logsdir)
+                        start_mark = collector.watch(unique_log_verify_list[i], datarep_obj)
                         print_info("Collecting response from: {0}".format(unique_log_verify_list[i]))
                         started_thread_for_system.append(unique_log_verify_list[i])
-                        thread_instance_list.append(new_thread)
-                    except:
+                        thread_instance_list.append(start_mark)
+                    except Exception:
                         print_info("Unable to collect response from: {0}".format(unique_log_verify_list[i]))
     return started_thread_for_system, thread_instance_list, same_system
 
 
 def get_response_dict(started_thread_for_system, thread_instance_list,
                       same_system, response):
-    """This function iterates over thread_instance_list and gets the data that
-    the threads have stored in its data variable. Updates the remote_resp_dict
-    with the system name and the corresponding data collected.
+    """This function stops collecting the response of the systems in
+    started_thread_for_system and gets the response collected since the marks
+    in thread_instance_list. Updates the remote_resp_dict with the system
+    name and the corresponding data collected.
 
     The system names in same_system also get stored in the remote_resp_dict but
     their value is the same as the response that was obtained through the
@@ -730,28 +1020,18 @@ def get_response_dict(started_thread_for_system, thread_instance_list,
     for i in range(0, len(same_system)):
         remote_resp_dict[same_system[i]] = response
 
+    if len(started_thread_for_system) > 0:
+        collector = LogCollector.get_collector(config_Utils.logsdir)
     for i in range(0, len(started_thread_for_system)):
-        data = thread_instance_list[i].data
-        thread_instance_list[i].stop_thread()
+        end_mark = collector.unwatch(started_thread_for_system[i])
+        data = collector.slice(started_thread_for_system[i],
+                               thread_instance_list[i], end_mark)
         pNote("\n\n++++++++++++++++++++++++ RESPONSE FROM SYSTEM: {0} "
               "++++++++++++++++++++\n\n".format(started_thread_for_system[i]))
         pNote(data)
         pNote("\n\n++++++++++++++++++++++++ END OF DATA FROM SYSTEM: {0} "
               "++++++++++++++++++++\n\n".format(started_thread_for_system[i]))
         remote_resp_dict[started_thread_for_system[i]] = data
-
-    if len(started_thread_for_system) > 0:
-        print_info("Waiting for maximum of 30 seconds to stop collecting "
-                   "logs from verify_on system(s)")
-
-    for i in range(0, len(started_thread_for_system)):
-        thread_instance_list[i].join_thread(timeout=30, retry=3)
-        if thread_instance_list[i].thread_status() is True:
-            print_error("Unable to stop collecting logs from {0}.Please check "
-                        "below message for all exception trace that occurred: "
-                        "\n{1}".format(started_thread_for_system[i],
-                                       thread_instance_list[i].
-                                       stop_thread_err_msg))
     return remote_resp_dict
 
 
@@ -791,52 +1071,82 @@ def get_unique_log_and_verify_list(log_list, verify_on_list, system_name):
     return final_list
 
 
+def _get_stream_verifier(record, verify_on_list, system_name):
+    """Returns the StreamVerifier searching the verifications of a command
+    in its output as it arrives and the indexes of these verifications,
+    (None, []) when the verifications of the command are not streamed.
+
+    Only the verifications on the system of the command (verify_on_list
+    is the list of systems of every verification) with a search text and a
+    valid found value are streamed, the command ends early only when all
+    its verifications are streamed """
+    verify_text_list = record.verify_text
+    verify_context_list = record.verify_context
+    if record.stream_verify == "no" or verify_text_list is None or \
+       record.verify is None or (record.inorder_search and len(verify_text_list) > 1):
+        return None, []
+    patterns = []
+    indexes = []
+    for i in range(0, len(verify_text_list)):
+        verify_text = verify_text_list[i]
+        context = data_Utils.get_no_impact_logic(verify_context_list[i]) \
+            if verify_context_list[i] else False
+        if not verify_text or not context or i >= len(verify_on_list) or \
+           verify_on_list[i] != [system_name]:
+            continue
+        found = string_Utils.conv_str_to_bool(context[1])
+        if record.vc_file:
+            verify_text = string_Utils.sub_from_varconfig(record.vc_file,
+                                                          [verify_text])[0]
+        try:
+            re.compile(verify_text)
+        except (re.error, TypeError):
+            continue
+        if found is not None:
+            patterns.append((verify_text, found))
+            indexes.append(i)
+    if not patterns:
+        return None, []
+    end_early = record.stream_verify == "end" and \
+        len(indexes) == len(verify_text_list)
+    return StreamVerifier(patterns, end_early), indexes
+
+
 @cmdprinter
-def _send_cmd_get_status(obj_session, details_dict, index, system_name=None):
+def _send_cmd_get_status(obj_session, record, index, system_name=None):
     """Sends a command, verifies the response and returns
-    status of the command """
-    command = details_dict["command_list"][index]
-    startprompt = details_dict["startprompt_list"][index]
-    endprompt = details_dict["endprompt_list"][index]
-    verify_list = details_dict["verify_list"][index]
-    cmd_timeout = details_dict["timeout_list"][index]
-    verify_text_list = details_dict["verify_text_list"][index]
-    verify_context_list = details_dict["verify_context_list"][index]
-    sleeptime = details_dict["sleeptime_list"][index]
-    resp_ref = details_dict["resp_ref_list"][index]
-    resp_req = details_dict["resp_req_list"][index]
-    resp_pat_req = details_dict["resp_pat_req_list"][index]
-    verify_on_list = details_dict["verify_on_list"][index]
-    log_list = details_dict["log_list"][index]
-    inorder_search = details_dict["inorder_search_list"][index]
-    varconfigfile = details_dict["vc_file_list"][index]
-    operator = details_dict["operator_list"][index]
-    cond_value = details_dict["cond_value_list"][index]
-    cond_type = details_dict["cond_type_list"][index]
-    unique_log_verify_list = get_unique_log_and_verify_list(log_list,
+    status of the command.
+    record is the command record, index its position in the testdata block """
+    command = record.command
+    startprompt = record.startprompt
+    endprompt = record.endprompt
+    verify_list = record.verify
+    cmd_timeout = record.timeout
+    verify_text_list = record.verify_text
+    verify_context_list = record.verify_context
+    sleeptime = int(record.sleeptime)
+    verify_on_list = record.verify_on
+    inorder_search = record.inorder_search
+    varconfigfile = record.vc_file
+    operator = record.operator
+    cond_value = record.cond_value
+    cond_type = record.cond_type
+    unique_log_verify_list = get_unique_log_and_verify_list(record.log,
                                                             verify_on_list,
                                                             system_name)
-
-    startprompt = {None: ".*", "": ".*"}.get(startprompt, str(startprompt))
-    resp_req = {None: 'y', '': 'y',
-                'no': 'n', 'n': 'n'}.get(str(resp_req).lower(), 'y')
-    resp_ref = {None: index+1, '': index+1}.get(resp_ref, str(resp_ref))
-    resp_pat_req = {None: ""}.get(resp_pat_req, str(resp_pat_req))
-    sleeptime = {None: 0, "": 0, "none": 0, False: 0, "false": 0}.get(
-                                str(sleeptime).lower(), str(sleeptime))
-    sleeptime = int(sleeptime)
-
-    if inorder_search is not None and inorder_search.lower().startswith("y"):
-        inorder_search = True
-    else:
-        inorder_search = False
+    verify_on_list_as_list = get_list_by_separating_strings(verify_on_list,
+                                                            ",", system_name)
+    verifier, stream_indexes = _get_stream_verifier(record,
+                                                    verify_on_list_as_list,
+                                                    system_name)
 
     pNote("Startprompt\t: {0}".format(startprompt))
     pNote("Endprompt\t: {0}".format(endprompt))
     pNote("Sleeptime\t: {0}".format(sleeptime))
-    pNote("Response required: {0}".format(resp_req))
-    pNote("Response reference: {0}".format(resp_ref))
-    pNote("Response pattern required: {0}".format(resp_pat_req))
+    pNote("Response required: {0}".format(record.resp_req))
+    pNote("Response reference: {0}".format(record.resp_ref))
+    pNote("Response pattern required: {0}".format(
+        record.resp_pat_req if record.resp_pat_req is not None else ""))
 
     if not command:
         pNote("Received a boolean False or None type instead of a string "
@@ -852,7 +1162,8 @@ def _send_cmd_get_status(obj_session, details_dict, index, system_name=None):
 
         result, response = _send_cmd(obj_session, startprompt=startprompt,
                                      endprompt=endprompt, command=command,
-                                     cmd_timeout=cmd_timeout)
+                                     cmd_timeout=cmd_timeout,
+                                     observer=verifier and verifier.feed)
 
     if sleeptime > 0:
         pNote("Sleep time of '{0} seconds' requested post command "
@@ -865,10 +1176,14 @@ def _send_cmd_get_status(obj_session, details_dict, index, system_name=None):
                                              same_system, response)
     except NameError:
         remote_resp_dict = get_response_dict([], [], [], response)
-    verify_on_list_as_list = get_list_by_separating_strings(verify_on_list,
-                                                            ",", system_name)
     if result and result is not 'ERROR':
         if verify_text_list is not None and verify_list is not None:
+            stream_matches = None
+            if verifier is not None:
+                stream_matches = dict(zip(stream_indexes,
+                                          verifier.finish(response)))
+                pNote("Verifications searched in the streamed output: "
+                      "{0}".format(len(stream_indexes)), "debug")
             verify_group = (operator, cond_value, cond_type)
             if inorder_search is True and len(verify_text_list) > 1:
                 result = data_Utils.verify_resp_inorder(
@@ -880,7 +1195,7 @@ def _send_cmd_get_status(obj_session, details_dict, index, system_name=None):
                             verify_text_list, verify_context_list, command,
                             response, varconfigfile, verify_on_list_as_list,
                             verify_list, remote_resp_dict, endprompt,
-                            verify_group)
+                            verify_group, stream_matches)
     command_status = {True: "PASS", False: "FAIL", "ERROR": "ERROR"}.get(
                                                                     result)
     pNote("COMMAND STATUS:{0}".format(command_status))
@@ -888,21 +1203,22 @@ def _send_cmd_get_status(obj_session, details_dict, index, system_name=None):
     return result, response
 
 
-def _get_obj_session(details_dict, obj_session, kw_system_name, index):
+def _get_obj_session(record, obj_session, kw_system_name, index):
     """If system name is provided in testdata file
     get the session of that system name and use it or
-    use the current obj_session"""
+    use the current obj_session.
+    record is the command record, index its position in the testdata block """
 
     value = False
     kw_system_nameonly, _ = data_Utils.split_system_subsystem(kw_system_name)
-    td_sys = details_dict["sys_list"][index]
+    td_sys = record.sys
     # To get the session name if it is provided as part of sys tag in td
     td_sys_split = td_sys.split('.') if isinstance(td_sys, str) else []
     if len(td_sys_split) == 2:
         td_sys = td_sys_split[0]
         session = td_sys_split[1]
     else:
-        session = details_dict["session_list"][index]
+        session = record.session
 
     td_sys = td_sys.strip() if isinstance(td_sys, str) else td_sys
     td_sys = {None:False, False:False, "":False}.get(td_sys, td_sys)
@@ -928,10 +1244,10 @@ def _get_obj_session(details_dict, obj_session, kw_system_name, index):
         system_name = kw_system_name
 
     pNote("System name\t: {0}".format(system_name))
-    return value, details_dict
+    return value, record
 
 @cmdprinter
-def _send_command_retrials(obj_session, details_dict, index, **kwargs):
+def _send_command_retrials(obj_session, record, index, **kwargs):
     """ Sends a command to a session, if a user provided pattern
     is found in the command response then tries to resend the command multiple
     times.
@@ -940,23 +1256,19 @@ def _send_command_retrials(obj_session, details_dict, index, **kwargs):
                     in order to retry the command.
     retry_count = no of times to retry.
     """
-    retry = details_dict["retry_list"][index]
-    retry = {None:'n', '':'n', 'none':'n'}.get(str(retry).lower(), retry)
+    retry = record.retry
     result = kwargs.get('result')
     response = kwargs.get('response')
     if retry == 'y' and (result == False or result == 'ERROR'):
-        retry_timer = details_dict["retry_timer_list"][index]
-        retry_onmatch = details_dict["retry_onmatch_list"][index]
-        retry_count = details_dict["retry_count_list"][index]
-        retry_timer = {None:60, "":60, "none":60}.get(str(retry_timer).lower(), retry_timer)
-        retry_count = {None:5, "":5, "none":5}.get(str(retry_count).lower(), retry_count)
+        retry_timer = record.retry_timer
+        retry_onmatch = record.retry_onmatch
+        retry_count = record.retry_count
         print ('\n')
         pNote("Retry was requested for the command")
         pNote("Command re-trials will begin since the most recent "\
               "command status was FAIL or ERROR")
         pNote("Retry count\t: {0}".format(retry_count))
         pNote("Retry timer\t: {0}".format(retry_timer))
-        retry_onmatch = {None:False, "":False}.get(retry_onmatch, str(retry_onmatch))
         print_onmatch = {False:""}.get(retry_onmatch, str(retry_onmatch))
         pNote("Retry onmatch: {0}".format(print_onmatch))
         count = 0
@@ -970,7 +1282,7 @@ def _send_command_retrials(obj_session, details_dict, index, **kwargs):
                     pNote("Wait for {0}sec (retry_timer) before sending"\
                                " the command again".format(retry_timer))
                     time.sleep(int(retry_timer))
-                    result, response = _send_cmd_get_status(obj_session, details_dict, index, system_name=kwargs.get("system_name"))
+                    result, response = _send_cmd_get_status(obj_session, record, index, system_name=kwargs.get("system_name"))
                     command_status = {True: "PASS", False:"FAIL", "ERROR":"ERROR"}.get(result)
                     pNote("RETRIAL ATTEMPT:{0} STATUS:{1}".format(count, command_status))
                 else:
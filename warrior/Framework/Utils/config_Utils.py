@@ -12,7 +12,9 @@ limitations under the License.
 '''
 
 import time
+import threading
 from WarriorCore.Classes import war_print_class 
+from Framework.Utils.print_Utils import print_error
 
 console_logfile = None
 junit_resultfile = None
@@ -25,10 +27,19 @@ logfile = None
 par_data_repository={}
 redirect_print = war_print_class.RedirectPrint(console_logfile)
 tc_path = None
+# result file and console logfile of the keyword threads
+thread_data = threading.local()
 
 def debug_file(console_filepath):
     global console_logfile
 
+    if is_kw_thread():
+        try:
+            thread_data.console_logfile = open(console_filepath, 'a')
+            redirect_print.get_thread_file(thread_data.console_logfile)
+        except Exception as exception:
+            print_error("unexpected error {0}".format(exception))
+        return
     try:
         console_logfile = open(console_filepath, 'a')
         redirect_print.get_file(console_logfile)
@@ -42,7 +53,39 @@ def junit_file(junit_filepath):
     
 def set_resultfile(filepath):
     global resultfile
-    resultfile = filepath
+    if is_kw_thread():
+        thread_data.resultfile = filepath
+    else:
+        resultfile = filepath
+
+def get_resultfile():
+    """Returns the result file of the current keyword thread,
+    the global result file when not called from a keyword thread """
+    if is_kw_thread():
+        return thread_data.resultfile
+    return resultfile
+
+def register_kw_thread():
+    """Registers the current thread as a keyword thread, the result file
+    and the console logfile set by a keyword thread are used only by
+    that thread, it starts with the current result file """
+    thread_data.registered = True
+    thread_data.resultfile = resultfile
+    thread_data.data_repository = data_repository
+    thread_data.console_logfile = None
+
+def unregister_kw_thread():
+    """Closes the console logfile of the keyword thread and unregisters it """
+    if getattr(thread_data, 'console_logfile', None) is not None:
+        thread_data.console_logfile.close()
+    redirect_print.get_thread_file(None)
+    thread_data.registered = False
+    thread_data.data_repository = None
+    thread_data.console_logfile = None
+
+def is_kw_thread():
+    """Returns True if the current thread is a registered keyword thread """
+    return getattr(thread_data, 'registered', False)
     
 def set_datafile(filepath):
     global datafile
@@ -63,7 +106,17 @@ def set_filename(name):
     
 def set_datarepository(repository):
     global data_repository
-    data_repository = repository
+    if is_kw_thread():
+        thread_data.data_repository = repository
+    else:
+        data_repository = repository
+
+def get_datarepository():
+    """Returns the data repository of the current keyword thread,
+    the global data repository when not called from a keyword thread """
+    if is_kw_thread():
+        return thread_data.data_repository
+    return data_repository
 
 
 def set_data_repository_for_parallel(repository):
@@ -238,7 +238,8 @@ def convert_xml_to_csv(input_file, mapping_file=None,
     """
     count = 0
     try:
-        dict_response = xml_Utils.convert_xml_to_list_of_dict(input_file)
+        # the xml file is streamed one row at a time
+        dict_response = xml_Utils.iter_xml_as_dicts(input_file)
         if mapping_file:
             mapping_dict = data_Utils.get_credentials(mapping_file,
                                                       'mapping_scheme')
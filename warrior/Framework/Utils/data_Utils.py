@@ -24,8 +24,23 @@ from Framework.ClassUtils.testdata_class import TestData, TestDataIterations
 from Framework.Utils.xml_Utils import get_attributevalue_from_directchildnode as av_fromdc
 from Framework.Utils.string_Utils import sub_from_varconfigfile
 from Framework.ClassUtils import database_utils_class
+from Framework.ClassUtils.datafile_index_class import DatafileIndex
+from Framework.ClassUtils.testdata_cache_class import CompiledTestdataCache,\
+DynamicValueRecorder
+from Framework.ClassUtils.var_substitution_class import VarSubstitution
 from __builtin__ import str
 
+# absolute path: (parsed root, DatafileIndex) of the datafiles of this process
+datafile_indexes = {}
+
+# expanded testdata blocks of this process and the ${ENV.*}/${REPO.*}
+# variables resolved while expanding them
+TESTDATA_CACHE = CompiledTestdataCache()
+DYNAMIC_VALUES = DynamicValueRecorder()
+
+# compiled ${...} templates of the substituted strings
+VAR_SUBSTITUTION = VarSubstitution()
+
 cmd_params = OrderedDict([("command_list", "send"),
                           ("sys_list", "sys"),
                           ("session_list", "session"),
@@ -50,6 +65,7 @@ cmd_params = OrderedDict([("command_list", "send"),
                           ("operator_list", "operator"),
                           ("cond_value_list", "cond_value"),
                           ("cond_type_list", "cond_type"),
+                          ("stream_verify_list", "stream_verify"),
                           ("repeat_list", "repeat")])
 
 
@@ -111,7 +127,10 @@ def getSystemData(datafile, system_name, cnode, system='system'):
     if element is not None:
         value = element.get(cnode, None)
         if value is None:
-            value = xml_Utils.get_text_from_direct_child(element, cnode)
+            index = get_datafile_index(datafile)
+            child = index.find_child(element, cnode) if index is not None \
+                    else element.find(cnode)
+            value = child.text if child is not None else False
         value = sub_from_env_var(value)
 
     return value
@@ -184,14 +203,36 @@ def get_credentials(datafile, system_name, myInfo=[], tag_name="system",
     return updated_dict
 
 
+def get_datafile_index(datafile):
+    """Returns the DatafileIndex of the datafile, the index is built once
+    for every parsed version of the file and is shared by all the callers.
+    Returns None if the datafile is not an existing file """
+    if not isinstance(datafile, basestring) or not file_Utils.fileExists(datafile):
+        return None
+    root = xml_Utils.get_cached_root(datafile)
+    path = os.path.abspath(datafile)
+    entry = datafile_indexes.get(path)
+    if entry is None or entry[0] is not root:
+        entry = (root, DatafileIndex(root))
+        datafile_indexes[path] = entry
+    return entry[1]
+
+
 def _get_system_or_subsystem(datafile, system_name, tag="system", attr='name'):
     """Get a system or subsystem node
-    returns None if system or subsystem could not be found"""
+    returns None if system or subsystem could not be found
+
+    The node is an element of the shared index of the datafile
+    and must not be modified """
     element = None
     system_name, subsystem_name = split_system_subsystem(system_name)
 
-    system_node = xml_Utils.getElementWithTagAttribValueMatch(datafile, tag,
-                                                              attr, system_name)
+    index = get_datafile_index(datafile)
+    if index is not None:
+        system_node = index.get_element(tag, attr, system_name)
+    else:
+        system_node = xml_Utils.getElementWithTagAttribValueMatch(datafile, tag,
+                                                                  attr, system_name)
     msg1 = 'system={0} is not found in datafile={1}'.format(system_name,
                                                             datafile)
     msg2 = 'The subsystem={0} is not found under ' \
@@ -202,10 +243,14 @@ def _get_system_or_subsystem(datafile, system_name, tag="system", attr='name'):
         if subsystem_name is None:
             element = system_node
         else:
-            subsystem = xml_Utils.getElementWithTagAttribValueMatch(system_node,
-                                                                    'subsystem',
-                                                                    attr,
-                                                                    subsystem_name)
+            if index is not None:
+                subsystem = index.get_child_element(system_node, 'subsystem', attr,
+                                                    subsystem_name)
+            else:
+                subsystem = xml_Utils.getElementWithTagAttribValueMatch(system_node,
+                                                                        'subsystem',
+                                                                        attr,
+                                                                        subsystem_name)
             if subsystem is not False and subsystem is not None:
                 element = subsystem
             else:
@@ -256,13 +301,18 @@ def get_child_tag_value_list(datafile, system_name, child_list=[], *args):
     """Parse the datafile for the system and get the tag list ,
     value list of all the children provided in the child_list"""
 
-    element = xml_Utils.getElementWithTagAttribValueMatch(datafile, 'system',
-                                                          'name', system_name)
+    index = get_datafile_index(datafile)
+    if index is not None:
+        element = index.get_element('system', 'name', system_name)
+    else:
+        element = xml_Utils.getElementWithTagAttribValueMatch(datafile, 'system',
+                                                              'name', system_name)
     if element is not None and element is not False:
         tag_list = []
         value_list = []
         for child in child_list:
-            cnode = element.find(child)
+            cnode = index.find_child(element, child) if index is not None \
+                    else element.find(child)
             if cnode is not None and cnode is not False:
                 for child in cnode:
                     tag_list.append(child.tag)
@@ -274,14 +324,14 @@ def get_child_tag_value_list(datafile, system_name, child_list=[], *args):
 def update_datarepository(input_dict):
     """Updates the data repository with the provided
     dictionary"""
-    data_repository = config_Utils.data_repository
+    data_repository = config_Utils.get_datarepository()
     data_repository.update(input_dict)
 
 
 def get_object_from_datarepository(object_key, verbose=True):
     """Gets the value for the object with the provided name from datarepositoy """
     try:
-        data_repository = config_Utils.data_repository
+        data_repository = config_Utils.get_datarepository()
         obj = data_repository[object_key]
     except KeyError:
         obj = False
@@ -292,14 +342,113 @@ def get_object_from_datarepository(object_key, verbose=True):
 
 def get_command_details_from_testdata(testdatafile, varconfigfile=None, **attr):
     """Gets the command_list, startprompt_list, endprompt_list,
-    verify_list from testdata """
-    testdata_dict = {}
+    verify_list from testdata
+
+    Returns {testdata key: details dict} where every list of the details
+    dict holds the values of all the expanded commands of the testdata
+    block, use get_command_records_from_testdata to get the commands one
+    at a time as they are expanded """
+    return _get_testdata(testdatafile, varconfigfile, expand=True, **attr)
+
+
+def get_command_records_from_testdata(testdatafile, varconfigfile=None, **attr):
+    """Gets the commands of the testdata blocks matching the title and row
+
+    Returns {testdata key: generator of CommandRecord}, a command record
+    holds the values of a single command of the details dict of
+    get_command_details_from_testdata with their defaults normalized.
+    The iteration patterns and list substitutions of a testdata command
+    are expanded only when the records of the previous commands have been
+    consumed, so the first command is available without expanding the
+    whole block """
+    blocks = _get_testdata(testdatafile, varconfigfile, expand=False, **attr)
+    return dict((testdata_key, _iter_block_records(block))
+                for testdata_key, block in blocks.items())
+
+
+def _iter_block_records(block):
+    """Returns the generator of the command records of a testdata block """
+    td_iter_obj = TestDataIterations()
+    return td_iter_obj.iter_command_records(block["details_dict"],
+                                            block["varconfigfile"],
+                                            block["iter_type"],
+                                            block["start_pat"], block["end_pat"])
+
+
+def _get_block_details(block):
+    """Returns the details dict of all the expanded commands of a testdata block """
+    details_dict = dict((key, []) for key in block["details_dict"])
+    td_iter_obj = TestDataIterations()
+    for cmd_slice in td_iter_obj.iter_command_slices(block["details_dict"],
+                                                     block["varconfigfile"],
+                                                     block["iter_type"],
+                                                     block["start_pat"],
+                                                     block["end_pat"]):
+        for key, value_list in cmd_slice.items():
+            details_dict[key].extend(value_list)
+    return details_dict
+
+
+def _get_testdata(testdatafile, varconfigfile=None, expand=False, **attr):
+    """Gets the testdata blocks matching the title and row
+
+    Returns {testdata key: testdata block} when expand is False, a testdata
+    block holds the details dict of the block before the expansion of
+    iteration patterns and list substitutions and what is needed to
+    expand them. Returns {testdata key: details dict} of the expanded
+    blocks when expand is True.
+
+    The results are kept in the compiled testdata cache, they are built
+    again only when one of the files used to build them changes or a
+    substituted ${ENV.*}/${REPO.*} variable resolves to a different
+    value """
     var_sub = attr.get('var_sub', None)
     title = attr.get('title', None)
     row = attr.get('row', None)
     system_name = attr.get('system_name', None)
     datafile = attr.get("datafile", None)
     print_debug("title:{0} row:{1}".format(title, row))
+
+    cache_key = None
+    if isinstance(testdatafile, basestring) and \
+       (varconfigfile is None or isinstance(varconfigfile, basestring)):
+        cache_key = (os.path.abspath(testdatafile), varconfigfile, datafile,
+                     config_Utils.datafile, title, row, system_name, var_sub, expand)
+        testdata_dict = TESTDATA_CACHE.get(cache_key, _get_dynamic_value)
+        if testdata_dict is not None:
+            return testdata_dict
+        DYNAMIC_VALUES.start()
+    try:
+        blocks = _expand_testdata(testdatafile, varconfigfile, var_sub,
+                                  title, row, system_name, datafile)
+    finally:
+        dynamic_values = DYNAMIC_VALUES.stop() if cache_key is not None else None
+
+    files = [testdatafile, varconfigfile, datafile, config_Utils.datafile]
+    for block in blocks.values():
+        files.extend(block["details_dict"].get("vc_file_list", []))
+    testdata_dict = blocks
+    if expand:
+        testdata_dict = dict((testdata_key, _get_block_details(block))
+                             for testdata_key, block in blocks.items())
+
+    if cache_key is not None and testdata_dict:
+        signatures = TESTDATA_CACHE.get_signatures(files)
+        if signatures is not None:
+            TESTDATA_CACHE.put(cache_key, signatures, dynamic_values, testdata_dict)
+    return testdata_dict
+
+
+def get_testdata_cache_stats():
+    """Returns the hits/misses counters of the compiled testdata cache """
+    return TESTDATA_CACHE.get_stats()
+
+
+def _expand_testdata(testdatafile, varconfigfile, var_sub, title, row,
+                     system_name, datafile):
+    """Builds the testdata blocks matching the title and row into
+    {testdata key: testdata block} """
+    testdata_dict = {}
     not_found = 0
 
     # when the testdatafile is a dictionary - this happens only when
@@ -326,7 +475,7 @@ def get_command_details_from_testdata(testdatafile, varconfigfile=None, **attr):
 
         db_td_obj.close_connection()
     else:
-        root = xml_Utils.getRoot(testdatafile)
+        root = xml_Utils.get_cached_root(testdatafile)
         global_obj = root.find("global")
 
     # when the varconfigfile is a dictionary - this happens only when
@@ -359,27 +508,16 @@ def get_command_details_from_testdata(testdatafile, varconfigfile=None, **attr):
             (details_dict, vc_file=None, var_sub=var_sub, start_pat=start_pat, end_pat=end_pat)
 
             details_dict = td_obj.wdf_substitutions(details_dict, datafile, kw_system_name=system_name)
-            details_dict = sub_from_env_var(details_dict)
-            details_dict = sub_from_data_repo(details_dict)
-
-            td_iter_obj = TestDataIterations()
-            details_dict, cmd_loc_list = td_iter_obj.resolve_iteration_patterns\
-            (details_dict)
-            iter_type = testdata.get('iter_type', None)
-            # Type-2 iteration - per_td_block
-            if iter_type == "per_td_block":
-                details_dict, cmd_loc_list = td_iter_obj.repeat_per_td_block\
-                (details_dict, cmd_loc_list)
-                details_dict = td_iter_obj.arrange_per_td_block\
-                (details_dict, cmd_loc_list)
-
-            # List substitution happens after iteration because list sub cannot recognize the + sign in iteration
-            cmd_list_substituted, verify_text_substituted = td_obj.list_substitution_precheck(varconfigfile, details_dict, start_pat, end_pat)
-            td_obj.list_substitution(details_dict, varconfigfile, cmd_list_substituted, verify_text_substituted, start_pat, end_pat)
-
-            details_dict = td_obj.varsub_varconfig_substitutions\
-            (details_dict, vc_file=varconfigfile, var_sub=None, start_pat=start_pat, end_pat=end_pat)
-            testdata_dict[testdata_key] = details_dict
+            details_dict = subst_var_patterns_by_prefix(details_dict,
+                                                        prefix=("ENV", "REPO"))
+
+            # iteration patterns, list substitutions and varconfig variables
+            # are resolved when the commands are consumed (_iter_block_records)
+            testdata_dict[testdata_key] = {"details_dict": details_dict,
+                                           "varconfigfile": varconfigfile,
+                                           "iter_type": testdata.get('iter_type', None),
+                                           "start_pat": start_pat,
+                                           "end_pat": end_pat}
             found = 1
 
         else:
@@ -691,10 +829,13 @@ def get_verify_text_context_as_list(testdata, verify_list):
 def verify_resp_across_sys(match_list, context_list, command,
                            response, varconfigfile=None, verify_on_list=None,
                            verify_list=None, remote_resp_dict=None,
-                           endprompt="", verify_group=None):
+                           endprompt="", verify_group=None,
+                           stream_matches=None):
     """ New method to verify response of a command
     sent on one system with the response recieved from
-    another system """
+    another system
+    stream_matches = {index of a verification: its match object or False}
+    of the verifications searched while the response was streamed """
 
     msg = ("Verification required for command: '{0}' ".format(command))
     testcase_Utils.pNote(msg, "debug")
@@ -713,10 +854,12 @@ def verify_resp_across_sys(match_list, context_list, command,
             # context_list[i])
             try:
                 data = remote_resp_dict[verify_on_list[i][j]]
+                match_objects = [stream_matches[i]] if stream_matches \
+                    and i in stream_matches else None
                 tmp_status = verify_cmd_response(
                                 [match_list[i]], [context_list[i]], command,
                                 data, verify_on_list[i][j], varconfigfile,
-                                endprompt, verify_group)
+                                endprompt, verify_group, match_objects)
                 status = status and tmp_status
             except KeyError:
                 print_error("Response could not be collected for {0}, hence, "
@@ -755,9 +898,11 @@ def convert2type(value, data_type='str'):
 
 def verify_cmd_response(match_list, context_list, command, response,
                         verify_on_system, varconfigfile=None, endprompt="",
-                        verify_group=None):
+                        verify_group=None, match_objects=None):
     """Verifies the response with the provided
-    match and context list
+    match and context list, match_objects are the match objects (False when
+    not found) of the patterns already searched in the response, None for
+    the patterns to search
     """
     err_msg = "Incorrect or no value provided for verification search/found, "
     "check the verification data provided for the command. Command result will"
@@ -772,7 +917,9 @@ def verify_cmd_response(match_list, context_list, command, response,
         if context_list[i] and match_list[i]:
             noiimpact, found = get_no_impact_logic(context_list[i])
             found = string_Utils.conv_str_to_bool(found)
-            if response:
+            if match_objects is not None and match_objects[i] is not None:
+                match_object = match_objects[i]
+            elif response:
                 match_object = re.search(match_list[i], response)
             else:
                 match_object = False
@@ -1350,16 +1497,37 @@ def get_filepath_from_system(datafile, system_name, *args):
     return abspath_lst
 
 
-def get_var_by_string_prefix(string):
-    if string.startswith("ENV."):
-        return os.environ[string.split('.', 1)[1]]
-    if string.startswith("REPO."):
-        keys = string.split('.')
-        val = get_object_from_datarepository(keys[1])
-        for key in keys[2:]:
-            val = val[key]
-        else:
-            return val
+def get_var_by_string_prefix(string, verbose=True):
+    try:
+        value = None
+        if string.startswith("ENV."):
+            value = os.environ[string.split('.', 1)[1]]
+        elif string.startswith("REPO."):
+            keys = string.split('.')
+            value = get_object_from_datarepository(keys[1], verbose)
+            for key in keys[2:]:
+                value = value[key]
+    except Exception as exception:
+        DYNAMIC_VALUES.record(string, exception.__class__)
+        raise
+    DYNAMIC_VALUES.record(string, _get_dynamic_fingerprint(value))
+    return value
+
+
+def _get_dynamic_fingerprint(value):
+    """Only string values are substituted in the testdata, other
+    values are not substituted whatever their content is """
+    return value if isinstance(value, basestring) else type(value)
+
+
+def _get_dynamic_value(string):
+    """Returns the current value of a ${ENV.*}/${REPO.*} variable
+    as recorded by the compiled testdata cache """
+    try:
+        value = get_var_by_string_prefix(string, verbose=False)
+    except Exception as exception:
+        return exception.__class__
+    return _get_dynamic_fingerprint(value)
 
 
 def subst_var_patterns_by_prefix(raw_value, start_pattern="${",
@@ -1377,67 +1545,30 @@ def subst_var_patterns_by_prefix(raw_value, start_pattern="${",
     as provided and replaces it and return the updated dictionary. If
     keys is not found in the order or does not exist then None is substituted.
     source could be environment or datarepository for now.
+        prefix can be a tuple of prefixes e.g. ("ENV", "REPO"), all of them
+    are substituted in a single walk of the value with the same result as
+    one call per prefix. The strings nested in the lists and dicts of a
+    dictionary value are substituted in place of the value.
     """
-    error_msg1 = ("Could not find any %s variable {0!r} corresponding to {1!r}"
-                  "provided in input data/testdata file. \nWill default to "
-                  "None") % (prefix)
-    error_msg2 = ("Unable to substitute %s variable {0!r} corresponding to "
-                  "{1!r} provided in input data/testdata file") % (prefix)
+    prefixes = (prefix,) if isinstance(prefix, basestring) else tuple(prefix)
+
+    def report_error(var_prefix, string, value):
+        """Reports a variable that cannot be substituted """
+        print_error(("Could not find any %s variable {0!r} corresponding to {1!r}"
+                     "provided in input data/testdata file. \nWill default to "
+                     "None" % (var_prefix)).format(string, value))
+
     if type(raw_value) == dict:
         for k in raw_value:
-            value = raw_value[k]
-            extracted_var = string_Utils.return_quote(str(value),
-                                                      start_pattern,
-                                                      end_pattern)
-            extracted_var = [string for string in extracted_var
-                             if prefix in string]
-            if len(extracted_var) > 0:
-                for string in extracted_var:
-                    try:
-                        if isinstance(raw_value[k], str):
-                            raw_value[k] = raw_value[k].replace(
-                                start_pattern+string+end_pattern,
-                                get_var_by_string_prefix(string))
-                        elif isinstance(raw_value[k], (list, dict)):
-                            raw_value[k] = literal_eval(
-                                str(raw_value[k]).replace(
-                                    start_pattern+string+end_pattern,
-                                    get_var_by_string_prefix(string)))
-                        else:
-                            print_error("Unsupported format - " +
-                                        error_msg2.format(string, value))
-                    except (KeyError, TypeError):
-                        print_error(error_msg1.format(string, value))
-                        if isinstance(raw_value[k], str):
-                            raw_value[k] = None
-                        elif isinstance(raw_value[k], (list, dict)):
-                            search_str = ("'[^']*" + re.escape(start_pattern) +
-                                          string + re.escape(end_pattern) +
-                                          "[^']*'")
-                            search_obj = re.search(search_str,
-                                                   str(raw_value[k]))
-                            if search_obj:
-                                raw_value[k] = literal_eval(
-                                    str(raw_value[k]).replace(
-                                        search_obj.group(), 'None'))
-                    except SyntaxError:
-                        print_error("Syntax Error - " +
-                                    error_msg2.format(string, value))
+            raw_value[k] = VAR_SUBSTITUTION.substitute(raw_value[k], prefixes,
+                                                       get_var_by_string_prefix,
+                                                       report_error, start_pattern,
+                                                       end_pattern)
     elif type(raw_value) == str:
-        extracted_var = string_Utils.return_quote(str(raw_value),
-                                                  start_pattern, end_pattern)
-        extracted_var = [string for string in extracted_var
-                         if prefix in string]
-        if len(extracted_var) > 0:
-            for string in extracted_var:
-                try:
-                    raw_value = raw_value.replace(
-                                start_pattern+string+end_pattern,
-                                get_var_by_string_prefix(string))
-                except KeyError:
-                    print_error(error_msg1.format(string, raw_value))
-                    raw_value = None
-
+        raw_value = VAR_SUBSTITUTION.substitute_string(raw_value, prefixes,
+                                                       get_var_by_string_prefix,
+                                                       report_error, start_pattern,
+                                                       end_pattern)
     return raw_value
 
 
@@ -1467,8 +1598,8 @@ def substitute_var_patterns(raw_value, start_pattern="${", end_pattern="}"):
     if raw_value is None:
         return raw_value
     elif isinstance(raw_value, str):
-        extracted_var = string_Utils.return_quote(raw_value, start_pattern,
-                                                  end_pattern)
+        extracted_var = VAR_SUBSTITUTION.get_names(raw_value, start_pattern,
+                                                   end_pattern)
         for string in extracted_var:
             [prefix, var] = string.split('.', 1)
             if prefix in prefixes:
@@ -1677,7 +1808,7 @@ def get_default_ecf_and_et(arguments_dict, current_datafile, current_browser,
                         temp_var = temp_var + "=" + temp_list[i]
                     temp_var = temp_var.strip()
                     if "/" in temp_var:
-                        root = xml_Utils.getRoot(current_datafile)
+                        root = xml_Utils.get_cached_root(current_datafile)
                         arguments_dict[def_name_tuple[j]] = root.find(temp_var).text
                     else:
                         if current_browser.find(temp_var) is not None:
@@ -1704,20 +1835,32 @@ def get_all_system_or_subsystem(datafile, system_name=None):
     """
         return all the system elements or all the children of a system element with specific name
     """
+    index = get_datafile_index(datafile)
+    if index is None:
+        if system_name is None:
+            return xml_Utils.getElementListWithSpecificXpath(datafile, "./system")
+        return xml_Utils.getElementListWithSpecificXpath(datafile, "./system[@name='" + system_name + "']/*")
     if system_name is None:
-        return xml_Utils.getElementListWithSpecificXpath(datafile, "./system")
+        element_list = index.get_direct_children("system")
     else:
-        return xml_Utils.getElementListWithSpecificXpath(datafile, "./system[@name='" + system_name + "']/*")
+        element_list = [child for system in index.get_direct_children("system", "name", system_name)
+                        for child in system]
+    return [xml_Utils.copy_element(element) for element in element_list]
 
 def group_systems_with_same_tag_value(root, tag, value):
     """
         Put systems with the same tag value pair in one list
         and all other system in another list
+        root can be the root element or the path of the datafile
     """
-    all_system_list = xml_Utils.getChildElementsListWithSpecificXpath(root, "./system")
-    system_list = xml_Utils.getChildElementsListWithSpecificXpath(root, "./system/[" + tag + "='" + value + "']")
-    other_system_list = [ele for ele in all_system_list if ele not in system_list]
-    return system_list, other_system_list
+    index = get_datafile_index(root)
+    if index is None:
+        index = DatafileIndex(root)
+    all_system_list = index.get_direct_children("system")
+    system_list = index.group_by_tag_value(tag).get(value, [])
+    system_ids = set(id(ele) for ele in system_list)
+    other_system_list = [ele for ele in all_system_list if id(ele) not in system_ids]
+    return list(system_list), other_system_list
 
 def group_systems_with_unique_tag_value(root, tag):
     """
@@ -1752,8 +1895,24 @@ def get_system_list(datafile, node_req=False):
     if node_req = True returns 1. list of system names, 2. list of system nodes
     if node_rq = False returns on the list of system names
     """
-    root = xml_Utils.getRoot(datafile)
-    systems = root.findall('system')
+    index = get_datafile_index(datafile)
+    if index is not None:
+        # the lists are computed once for every parsed version of the datafile
+        if 'system_list' not in index.memo:
+            index.memo['system_list'] = _get_system_list(index.get_direct_children('system'))
+        system_list, system_node_list = index.memo['system_list']
+        system_list, system_node_list = list(system_list), list(system_node_list)
+    else:
+        root = xml_Utils.getRoot(datafile)
+        system_list, system_node_list = _get_system_list(root.findall('system'))
+    if node_req:
+        return system_list, system_node_list
+    else:
+        return system_list
+
+def _get_system_list(systems):
+    """Returns the list of system names and the list of system nodes of
+    the systems, the default subsystem is used for the systems having subsystems """
     system_list = []
     system_node_list = []
     for system in systems:
@@ -1779,10 +1938,7 @@ def get_system_list(datafile, node_req=False):
             system_node = system
         system_list.append(system_name)
         system_node_list.append(system_node)
-    if node_req:
-        return system_list, system_node_list
-    else:
-        return system_list
+    return system_list, system_node_list
 
 
 
@@ -45,7 +45,7 @@ def save_screenshot_onerror(status, current_browser):
     """ To get the filename, directory name and to take screenshot of the current browser window """
     if status != True:
         browser_object = BrowserManagement()
-        data_repository = config_Utils.data_repository
+        data_repository = config_Utils.get_datarepository()
         tc_name = data_repository['wt_testcase_filepath'].split("/")[-1].split('.xml')[0]
         step_number = data_repository['step_num']
         kw_name = data_repository['wt_keyword']
@@ -14,6 +14,7 @@ limitations under the License.
 """This is the library to hold all api's related to string operations """
 
 from Framework.ClassUtils.configuration_element_class import ConfigurationElement
+from Framework.ClassUtils.var_substitution_class import VarTemplate
 from Framework.Utils.print_Utils import print_info, print_error, print_exception
 
 import re
@@ -58,23 +59,7 @@ def return_quote(a, start_pat="${", end_pat="}"):
     :param a:
     :return:
     """
-    mode = 0
-    start = 0
-    count = 0
-    result = []
-    for index in range(len(a)):
-        if mode == 0 and a[index:index+len(start_pat)] == start_pat:
-            mode = 1
-            start = index+len(start_pat)
-            count += 1
-        elif mode == 1 and a[index:index+len(start_pat)] == start_pat:
-            count += 1
-        elif mode == 1 and a[index:index+len(end_pat)] == end_pat:
-            count -= 1
-            if count == 0:
-                result.append(a[start:index])
-                mode = 0
-    return result
+    return list(VarTemplate.compile(a, start_pat, end_pat).names)
 
 def sub_from_varconfig(varconfigfile, string_list, var_sub=None, start_pat="${", end_pat="}"):
     """
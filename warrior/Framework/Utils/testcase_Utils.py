@@ -13,7 +13,7 @@ limitations under the License.
 
 """Module that contains methods for testcase results related operations """
 from WarriorCore.Classes import testcase_utils_class
-TCOBJ = testcase_utils_class.TestcaseUtils()
+TCOBJ = testcase_utils_class.ThreadTestcaseUtils()
 
 """ ##################################################################################### """
 """ The functions below this line are to be used by keyword developers in their keywords: """
@@ -219,6 +219,11 @@ def pTestResult(text, resultfile):
     """report test case reult in result xml file"""
     TCOBJ.p_test_result(text, resultfile)
 
+def write_result():
+    """Writes the result of the current keyword to its result file,
+    the result file is otherwise written only when the next keyword starts """
+    TCOBJ.write_result()
+
 def append_result_files(dst_resultfile, kw_resultfile_list, dst_root='Testcase'):
     """append kw/system result xml files into testcase result xml file"""
     TCOBJ.append_result_files(dst_resultfile, kw_resultfile_list, dst_root)
@@ -13,25 +13,91 @@ limitations under the License.
 
 import sys
 import json
-import difflib
 import os
 import os.path
 from xml.dom import minidom
+from xml.sax.saxutils import escape
 from xml.etree import ElementTree
 from xml.etree.ElementTree import tostring
 from Framework.OSS import xmltodict
+from Framework.ClassUtils.xml_cache_class import XmlDocumentCache, copy_element
+from Framework.ClassUtils.xml_compare_class import CanonicalXml
 from print_Utils import print_debug, print_info, print_error, print_warning,\
 print_exception
 import file_Utils
 import json
+from io import BytesIO
 from collections import OrderedDict
 
+try:
+    # C implementation of iterparse, see iterparse_elements
+    from xml.etree import cElementTree as iter_etree
+except ImportError:
+    iter_etree = ElementTree
+
 try:
     from lxml import etree, objectify
+    from Framework.ClassUtils.xpath_cache_class import CompiledXPathCache
+    # compiled lxml xpath expressions of this process, see evaluate_xpath
+    XPATH_CACHE = CompiledXPathCache()
+    # xml files parsed with lxml, see get_cached_lxml_root
+    LXML_CACHE = XmlDocumentCache(parse=etree.parse)
 except ImportError as err:
+    XPATH_CACHE = None
+    LXML_CACHE = None
     print_error("Module lxml is not installed, Refer to the exception trace below for more details")
     print_exception(err)
 
+# parsed xml files of this process, see get_cached_root
+XML_CACHE = XmlDocumentCache()
+
+
+def get_cached_root(filename):
+    """Returns the root element of the xml file from the process wide
+    cache of parsed files, the file is parsed again only when it changes.
+
+    The root element is shared by all the callers and must not be modified,
+    use getRoot to get a copy that can be modified """
+    return XML_CACHE.get_root(filename)
+
+def get_xml_cache_stats():
+    """Returns the hits/misses/evictions counters of the parsed xml cache """
+    return XML_CACHE.get_stats()
+
+def get_cached_lxml_root(filename):
+    """Returns the lxml root element of the xml file from the process wide
+    cache of files parsed with lxml, None when lxml is not installed.
+
+    The root element is shared by all the callers and must not be modified """
+    if LXML_CACHE is None:
+        print_error("Module lxml is not installed, cannot parse {0} "
+                    "with lxml".format(filename))
+        return None
+    return LXML_CACHE.get_root(filename)
+
+def get_elements_with_xpath(filename, xpath, namespaces=None):
+    """Returns the results of an XPath 1.0 expression on the xml file, the
+    file is parsed once with lxml and the expression compiled once (see
+    evaluate_xpath). The elements returned are shared and must not be
+    modified. Returns an empty list when lxml is not installed """
+    root = get_cached_lxml_root(filename)
+    if root is None:
+        return []
+    return evaluate_xpath(root, xpath, namespaces)
+
+def _get_first_element_by_tag(filename, tag):
+    """Returns the first element with the tag in the xml file in document
+    order, None if there is no such element. With lxml the tag is matched
+    against the qualified names (prefix:name) as minidom getElementsByTagName
+    did, ElementTree matches {namespace}name """
+    if LXML_CACHE is not None:
+        elements = evaluate_xpath(LXML_CACHE.get_root(filename),
+                                  "(//*[name()='{0}'])[1]".format(tag))
+        return elements[0] if elements else None
+    for element in get_cached_root(filename).iter(tag):
+        return element
+    return None
+
 def create_subelement(parent, tag, attrib):
     """Creates a subelement with given tag
     and attributes under the parent element """
@@ -40,15 +106,22 @@ def create_subelement(parent, tag, attrib):
     return subelement
 
 def getValuebyTag (filename, tag):
-    doc = minidom.parse(filename)
-    itemlist = doc.getElementsByTagName(tag)[0].toxml()
-    itemvalue = itemlist.replace('<' + tag + '>', '').replace('</' + tag + '>', '')
-    return itemvalue
+    """Returns the content (text and serialized children) of the first
+    element with the tag in the xml file, the file is read from the cache
+    of parsed files. IndexError is raised when there is no such element """
+    element = _get_first_element_by_tag(filename, tag)
+    if element is None:
+        raise IndexError("no {0} element in {1}".format(tag, filename))
+    return _get_tag_value(element, tag)
 
 def getValuebyAttribute (filename, attribute, tag):
-    doc = minidom.parse(filename)
-    itemlist = doc.getElementsByTagName(tag)[0].toxml()
-    return itemlist.attributes[attribute].value
+    """Returns the value of the attribute of the first element with the
+    tag in the xml file, the file is read from the cache of parsed files.
+    IndexError is raised when there is no such element """
+    element = _get_first_element_by_tag(filename, tag)
+    if element is None:
+        raise IndexError("no {0} element in {1}".format(tag, filename))
+    return element.attrib[attribute]
 
 def get_first_child(node):
     """Gets the first child of a given node
@@ -67,26 +140,27 @@ def get_last_child(node):
     return element
 
 def getNodeCount(filename, node):
-    with open (filename, 'rt') as f:
-        tree = ElementTree.parse(f)
+    root = get_cached_root(filename)
     count = 0
-    for node in tree.findall('.//' + node):
+    for node in root.findall('.//' + node):
         count += 1
     return count
 
-def get_tree_from_file(filepath):
+def get_tree_from_file(filepath, cache=True):
 
     if file_Utils.fileExists(filepath):
-            tree = ElementTree.parse(filepath)
+            tree = ElementTree.ElementTree(XML_CACHE.get_root_copy(filepath, cache))
     else:
         print_error("xml file does not exist in provided path {0}".format(filepath))
         tree = False
     return tree
 
-def getRoot(filename):
-    tree = ElementTree.parse(filename)
-    root = tree.getroot()
-    return root
+def getRoot(filename, cache=True):
+    """Returns the root element of the xml file, the element
+    is a copy of the cached document and can be modified.
+    Files rewritten during the execution (results, logs) are read with
+    cache=False to keep them out of the cache """
+    return XML_CACHE.get_root_copy(filename, cache)
 
 def convert_element_to_string(element):
     """Converts the provided xml element to string """
@@ -96,7 +170,7 @@ def convert_element_to_string(element):
 
 def getNodeValuebyAttribute (filename, node, attribute):
     value = None
-    root = getRoot (filename)
+    root = get_cached_root(filename)
     element = root.find(node)
     if element is not None:
         value = element.get(attribute)
@@ -113,7 +187,7 @@ def nodeExists (filename, node):
     return status
 
 def getNodeText(filename, node):
-    root = ElementTree.parse(filename).getroot()
+    root = get_cached_root(filename)
     node = root.find(node)
     if node is not None:
         text = node.text
@@ -123,10 +197,10 @@ def getNodeText(filename, node):
 
 def get_node(filename, node_name):
     """Gets seraches for a node under the root and returns the node"""
-    root = ElementTree.parse(filename).getroot()
+    root = get_cached_root(filename)
     node = root.find(node_name)
     if node is not None:
-        return node
+        return copy_element(node)
     else: return False
 
 def write_tree_to_file(root, file_path):
@@ -139,8 +213,8 @@ def write_tree_to_file(root, file_path):
 def get_matching_firstlevel_children_from_root(filename, child_tag):
     """Takes a xml file as input and returns a list of first
     child elements to the root that matches the provided tag """
-    root = getRoot(filename)
-    child_list = root.findall(child_tag)
+    root = get_cached_root(filename)
+    child_list = [copy_element(child) for child in root.findall(child_tag)]
     return child_list
 
 def get_matching_firstlevel_children_from_node(node, child_tag):
@@ -151,7 +225,7 @@ def get_matching_firstlevel_children_from_node(node, child_tag):
 
 
 def get_node_list_iterative(filename, node_name):
-    root = ElementTree.parse(filename).getroot()
+    root = getRoot(filename)
     print root
     node_list = root.iterfind(node_name)
     print node_list
@@ -211,8 +285,7 @@ def getChildTextbyParentAttribute (datafile, pnode, patt, pattval, cnode):
     patval = parent node attribute value
     cnode = child node
     """
-    tree = ElementTree.parse(datafile)
-    root = tree.getroot()
+    root = get_cached_root(datafile)
     value = False
     for node in root.findall(pnode):
         attribute = node.get(patt)
@@ -233,8 +306,7 @@ def getChildTextbyParentTag (datafile, pnode, cnode):
     cnode = child node
     """
     value = False
-    tree = ElementTree.parse(datafile)
-    root = tree.getroot()
+    root = get_cached_root(datafile)
     node = root.find(pnode)
     if node is not None:
         child = node.find(cnode)
@@ -250,8 +322,7 @@ def getChildTextbyParentTag (datafile, pnode, cnode):
 
 
 def getChildAttributebyParentTag (datafile, pnode, cnode, cattrib):
-    tree = ElementTree.parse(datafile)
-    root = tree.getroot()
+    root = get_cached_root(datafile)
     node = root.find(pnode)
     if node is not None:
         child = node.find(cnode)
@@ -275,8 +346,7 @@ def getChildTextbyOtherChild (datafile, pnode, cnode, cvalue, rnode):
     cvalue = child node value
     rnode = reference node or False if doesn't exist
     """
-    tree = ElementTree.parse(datafile)
-    root = tree.getroot()
+    root = get_cached_root(datafile)
     rnodev = False
 
     for node in root.findall(pnode):
@@ -300,8 +370,7 @@ def verifyParentandChildrenMatch (datafile, pnode, cnode, cvalue, rnode, rvalue)
     rnode = reference node
     rvalue = refernce node value
     """
-    tree = ElementTree.parse(datafile)
-    root = tree.getroot()
+    root = get_cached_root(datafile)
     status = False
     for node in root.findall(pnode):
         value = node.find(cnode).text
@@ -331,8 +400,7 @@ def getNodebyParentandChildrenMatch (datafile, pnode, cnode, cvalue, rnode, rval
     rvalue = refernce node value
     lnode = lastnode
     """
-    tree = ElementTree.parse(datafile)
-    root = tree.getroot()
+    root = get_cached_root(datafile)
     lnodev = False
     for node in root.findall(pnode):
         value = node.find(cnode).text
@@ -359,8 +427,7 @@ def verifyNodesValueMatch (datafile, pnode, cnode, cvalue, rnode, rvalue, bnode,
     rvalue = refernce node value
     """
     try:
-        tree = ElementTree.parse(datafile)
-        root = tree.getroot()
+        root = get_cached_root(datafile)
     except Exception, e:
         print_error("unexpected error %s" % str(e))
         return False
@@ -422,10 +489,10 @@ def getElementsListWithTagAttribValueMatch(datafile, tag, attrib, value):
     value = attribute value that the sub-element with above given tag, attribute should have.
     """
     element_list = []
-    root = ElementTree.parse(datafile).getroot()
+    root = get_cached_root(datafile)
     for element in root.iterfind(".//%s[@%s='%s']" % (tag, attrib, value)):
         print element
-        element_list.append(element)
+        element_list.append(copy_element(element))
     return element_list
 
 def getElementWithTagAttribValueMatch(start, tag, attrib, value):
@@ -437,10 +504,12 @@ def getElementWithTagAttribValueMatch(start, tag, attrib, value):
     If there is not a match, it returns False.
     """
     node = False
+    from_file = False
     if isinstance(start, (file, str)):
         # check if file exist here
         if file_Utils.fileExists(start):
-            node = ElementTree.parse(start).getroot()
+            node = get_cached_root(start)
+            from_file = True
         else:
             print_warning('The file={0} is not found.'.format(start))
     elif isinstance(start, ElementTree.Element):
@@ -448,6 +517,8 @@ def getElementWithTagAttribValueMatch(start, tag, attrib, value):
     if node is not False and node is not None:
         elementName = ".//%s[@%s='%s']" % (tag, attrib, value)
         element = node.find(elementName)
+        if from_file and element is not None:
+            element = copy_element(element)
     else:
         element = node
     return element
@@ -480,9 +551,9 @@ def getElementListWithSpecificXpath(datafile, xpath):
     xpath = a valid xml path value as supported by python, refer https://docs.python.org/2/library/xml.etree.elementtree.html
     """
     element_list = []
-    root = ElementTree.parse(datafile).getroot()
+    root = get_cached_root(datafile)
     for element in root.iterfind(xpath):
-        element_list.append(element)
+        element_list.append(copy_element(element))
     return element_list
 
 def getElementStringWithSpecificXpath(datafile, xpath):
@@ -496,7 +567,7 @@ def getElementStringWithSpecificXpath(datafile, xpath):
     parent = parent element
     xpath = a valid xml path value as supported by python, refer https://docs.python.org/2/library/xml.etree.elementtree.html
     """
-    root = ElementTree.parse(datafile).getroot()
+    root = get_cached_root(datafile)
     element = root.find(xpath)
     ele_string = ElementTree.tostring(element)
     return ele_string
@@ -512,10 +583,10 @@ def getConfigElementTextWithSpecificXpath(datafile, xpath):
     parent = parent element
     xpath = a valid xml path value as supported by python, refer https://docs.python.org/2/library/xml.etree.elementtree.html
     """
-    root = ElementTree.parse(datafile).getroot()
+    root = get_cached_root(datafile)
     elem1 = root.find(xpath).text
 
-    elem2_root = ElementTree.parse(elem1)
+    elem2_root = get_cached_root(elem1)
     elem2 = elem2_root.find('config')
     elem2_string = ElementTree.tostring(elem2)
     return elem2_string
@@ -532,16 +603,20 @@ def getChildElementWithSpecificXpath(start, xpath):
     xpath = a valid xml path value as supported by python, refer https://docs.python.org/2/library/xml.etree.elementtree.html
     """
     node = False
+    from_file = False
     if isinstance(start, (file, str)):
         # check if file exist here
         if file_Utils.fileExists(start):
-            node = ElementTree.parse(start).getroot()
+            node = get_cached_root(start)
+            from_file = True
         else:
             print_warning('The file={0} is not found.'.format(start))
     elif isinstance(start, ElementTree.Element):
         node = start
     if node is not False or node is not None:
         element = node.find(xpath)
+        if from_file and element is not None:
+            element = copy_element(element)
     else:
         element = False
     return element
@@ -601,7 +676,8 @@ def get_all_child_nodes(parent_node):
 
 
 def get_elements_by_tagname_ignore_ns(filename, element_tag):
-    """"Parses an xml using minidom and gets all the elements with matching tag names in the file, ignores namespaces in the tag names """
+    """"Parses an xml using minidom and gets all the elements with matching tag names in the file, ignores namespaces in the tag names
+    see iter_elements_by_tagname_ignore_ns for very large files """
     doc = minidom.parse(filename)
     element_list = doc.getElementsByTagNameNS('*', element_tag)
     if len(element_list) == 0:
@@ -613,6 +689,9 @@ def get_elements_by_tagname_ignore_ns(filename, element_tag):
 
 #2015/12/09 ymizugaki add begin
 def getValuebyTagFromResponse (response, tag):
+    """Returns the content of the last element with the tag in the xml
+    response, get_value_by_tag_streaming returns the first one without
+    parsing the whole response """
     doc = minidom.parseString(response)
     item = doc.getElementsByTagName(tag)
     if len(item) != 0:
@@ -695,7 +774,7 @@ def removenms(xml):
         Returns:
             xml_string
     """
-    if os.path.exists(xml):
+    if _is_xml_file(xml):
         parser = etree.XMLParser(remove_blank_text=True, remove_comments=True)
         tree = etree.parse(xml, parser)
         root = tree.getroot()
@@ -753,7 +832,7 @@ def del_tags_from_xml(xml, tag_list=[]):
         Returns:
             It returns xml string
     """
-    if os.path.exists(xml):
+    if _is_xml_file(xml):
         tree = ElementTree.parse(xml)
         root = tree.getroot()
     else:
@@ -781,7 +860,7 @@ def del_attributes_from_xml(xml, attrib_list=[]):
         Returns:
             It returns xml string
     """
-    if os.path.exists(xml):
+    if _is_xml_file(xml):
         tree = ElementTree.parse(xml)
         root = tree.getroot()
     else:
@@ -802,20 +881,21 @@ def del_attributes_from_xml(xml, attrib_list=[]):
 def compare_xml(xml1, xml2, output_file=False, sorted_json=True,
                 remove_namespaces=False, tag_list=[], attrib_list=[]):
     """
-    This will compare two xml files or strings by converting to json
-    and then sorting and by default giving the sorted files
-    and writing the difference to a diff file.
+    This will compare two xml files or strings using their canonical form,
+    the order of the attributes and of the children with different tags
+    does not matter. The differences are reported with the path of the
+    differing nodes.
 
     Arguments:
         1. xml1 : The first xml among the two xml's which
             needs to be compared
         2. xml2 : The second xml among the two xml's
             which needs to be compared
-        3. output_file : It contains the difference between
-            the two sorted json objects
-        4. sorted_json : By default we are returning the sorted json
-            files and if the user selects sorted_json as False,
-            not returning the fileS
+        3. output_file : If provided, the differences between the two
+            xml's are written to this file
+        4. sorted_json : By default the two xml's are also written as
+            sorted json files and if the user selects sorted_json as False,
+            not writing the files
         5. remove_namespaces: If the user specifies remove_namespaces
             as True will remove namespaces and then compare xml's
         6. tag_list: If user specifies tag names in tag_list,
@@ -830,59 +910,39 @@ def compare_xml(xml1, xml2, output_file=False, sorted_json=True,
             output file path or diff_output depends on output_file value
     """
     try:
-        from Framework.ClassUtils.json_utils_class import JsonUtils
         if remove_namespaces:
             xml1 = removenms(xml1)
             xml2 = removenms(xml2)
 
-        xml1 = del_tags_from_xml(xml1, tag_list)
-        xml2 = del_tags_from_xml(xml2, tag_list)
+        if tag_list:
+            xml1 = del_tags_from_xml(xml1, tag_list)
+            xml2 = del_tags_from_xml(xml2, tag_list)
 
-        xml1 = del_attributes_from_xml(xml1, attrib_list)
-        xml2 = del_attributes_from_xml(xml2, attrib_list)
+        if attrib_list:
+            xml1 = del_attributes_from_xml(xml1, attrib_list)
+            xml2 = del_attributes_from_xml(xml2, attrib_list)
 
-        output1 = json.loads(json.dumps(
-                    (xmltodict.parse(xml1, xml_attribs=True))))
-        output2 = json.loads(json.dumps(
-                    (xmltodict.parse(xml2, xml_attribs=True))))
-
-        sorted_json1 = JsonUtils().sort_json_object(output1)
-        sorted_json2 = JsonUtils().sort_json_object(output2)
-
-        json_obj1 = json.dumps(
-            sorted_json1, indent=4, separators=(',', ':'), encoding="utf-8")
-        json_obj2 = json.dumps(
-            sorted_json2, indent=4, separators=(',', ':'), encoding="utf-8")
+        canonical1 = _get_canonical_xml(xml1)
+        canonical2 = _get_canonical_xml(xml2)
 
         if sorted_json:
-            sorted_file1 = "sorted_file1.json"
-            sorted_file2 = "sorted_file2.json"
-            sorted_file1 = file_Utils.addTimeDate(sorted_file1)
-            sorted_file2 = file_Utils.addTimeDate(sorted_file2)
-
-            f = open(sorted_file1, 'w')
-            f1 = open(sorted_file2, 'w')
-            f.write(json_obj1)
-            f1.write(json_obj2)
-            f.close()
-            f1.close()
+            sorted_file1 = _write_sorted_json_file(xml1, "sorted_file1.json")
+            sorted_file2 = _write_sorted_json_file(xml2, "sorted_file2.json")
         else:
             sorted_file1 = None
             sorted_file2 = None
 
-        if output1 == output2:
+        if canonical1 == canonical2:
             return True, sorted_file1, sorted_file2, None
 
-        diff = ("\n".join(
-            difflib.ndiff(json_obj1.splitlines(), json_obj2.splitlines())))
-
+        diff_lines = canonical1.iter_diff(canonical2)
         if output_file:
             output_file = file_Utils.addTimeDate(output_file)
-            te = open(output_file, 'w')
-            te.write(diff)
-            te.close()
+            with open(output_file, 'w') as diff_file:
+                for line in diff_lines:
+                    diff_file.write(line.encode("utf-8") + "\n")
         else:
-            output_file = diff
+            output_file = "\n".join(diff_lines)
 
         return False, sorted_file1, sorted_file2, output_file
 
@@ -891,6 +951,35 @@ def compare_xml(xml1, xml2, output_file=False, sorted_json=True,
         return False, None, None, output_file
 
 
+def _is_xml_file(xml):
+    """Returns True if xml is the path of an existing file, xml strings
+    are not looked up in the file system """
+    return not xml.lstrip().startswith("<") and os.path.exists(xml)
+
+def _get_canonical_xml(xml):
+    """Returns the CanonicalXml of an xml file or string """
+    if _is_xml_file(xml):
+        root = get_cached_root(xml)
+    else:
+        root = ElementTree.fromstring(xml)
+    return CanonicalXml(root)
+
+
+def _write_sorted_json_file(xml, filename):
+    """Writes an xml file or string as a sorted json file,
+    returns the path of the file """
+    from Framework.ClassUtils.json_utils_class import JsonUtils
+    # same content as the xml compared by compare_xml
+    xml = del_tags_from_xml(xml, [])
+    output = json.loads(json.dumps(xmltodict.parse(xml, xml_attribs=True)))
+    json_obj = json.dumps(JsonUtils().sort_json_object(output), indent=4,
+                          separators=(',', ':'), encoding="utf-8")
+    sorted_file = file_Utils.addTimeDate(filename)
+    with open(sorted_file, 'w') as json_file:
+        json_file.write(json_obj)
+    return sorted_file
+
+
 def get_children_as_dict(parent):
     child_list = getChildElementsListWithSpecificXpath(parent, "*")
     child_dict = {}
@@ -912,8 +1001,7 @@ def convert_xml_to_list_of_dict(file_name):
             list_of_dict: list of dictionaries where keys
             are tag names and values are respective text of the tag.
     """
-    tree = ElementTree.parse(file_name)
-    root = tree.getroot()
+    root = get_cached_root(file_name)
     list_of_dict = []
     for child in root:
         subchild_dict = OrderedDict()
@@ -923,17 +1011,32 @@ def convert_xml_to_list_of_dict(file_name):
 
     return list_of_dict
 
-#2016/06/22 ymizugaki add begin
-def getValuebyTagFromStringWithXpath(response, xpathString, ns):
-    xml = etree.fromstring(response)
-    item = xml.xpath(xpathString, namespaces=ns)
+def evaluate_xpath(element, xpath, namespaces=None):
+    """Evaluates an xpath expression on an lxml element, same result as
+    element.xpath(xpath, namespaces=namespaces). The expression is compiled
+    once and reused by the following calls """
+    if XPATH_CACHE is None:
+        return element.xpath(xpath, namespaces=namespaces)
+    return XPATH_CACHE.evaluate(element, xpath, namespaces)
+
+def get_first_value_with_xpath(element, xpath, namespaces=None):
+    """Returns the first result of an xpath expression on an lxml element,
+    empty string if the expression matches nothing """
+    item = evaluate_xpath(element, xpath, namespaces)
     if len(item) != 0:
         itemValue = item[0]
     else:
         itemValue = ""
     return itemValue
 
+#2016/06/22 ymizugaki add begin
+def getValuebyTagFromStringWithXpath(response, xpathString, ns):
+    xml = etree.fromstring(response)
+    return get_first_value_with_xpath(xml, xpathString, ns)
+
 def getValueListbyTagFromString(response, tag):
+    """Returns the contents of the elements with the tag in the xml
+    response, see get_value_list_by_tag_streaming for very large responses """
     doc = minidom.parseString(response)
     item = doc.getElementsByTagName(tag)
     itemlist = []
@@ -945,6 +1048,156 @@ def getValueListbyTagFromString(response, tag):
     return itemlist
 #2016/06/22 ymizugaki add end
 
+""" Below are streaming (iterparse) lookups for very large xml documents,
+only the matching element being processed is kept in memory """
+
+def _open_iterparse_source(xml):
+    """Returns (file object, True if it was opened here) for an xml file
+    path, an xml string or a file object """
+    if not isinstance(xml, basestring):
+        return xml, False
+    if not xml.lstrip().startswith("<"):
+        return open(xml, 'rb'), True
+    if isinstance(xml, unicode):
+        xml = xml.encode('utf-8')
+    return BytesIO(xml), True
+
+def _local_name(tag):
+    """Returns the tag without its {namespace} """
+    return tag.rsplit('}', 1)[-1] if isinstance(tag, basestring) else tag
+
+def iterparse_elements(xml, tag=None, ignore_ns=False, depth=None):
+    """
+    Streams the elements of an xml file, string or file object that match
+    the tag (all tags when tag is None) and the depth (0 for the root, all
+    depths when depth is None) without loading the document in memory.
+
+    An element is produced when its end tag is parsed, with its children,
+    hence a matching element nested in another one is produced before it.
+    It is cleared as soon as the next element is requested, use
+    copy_element to keep it. The memory used is bounded by the size of the
+    largest matching element, the parsing stops as soon as the caller
+    stops iterating.
+
+    Arguments:
+        1. xml: xml file path, xml string or file object
+        2. tag: tag of the elements, with its {namespace} unless ignore_ns
+        3. ignore_ns: True to match the tag without namespaces
+        4. depth: depth of the elements
+    """
+    for _, element in _iterparse_matches(xml, tag, ignore_ns, depth):
+        yield element
+
+def _iterparse_matches(xml, tag=None, ignore_ns=False, depth=None):
+    """Generator of (position, element) of the elements iterparse_elements
+    produces, position is the index of the element in document order
+    (start tags) among the matching elements """
+    if ignore_ns:
+        tag = _local_name(tag)
+    source, opened = _open_iterparse_source(xml)
+    try:
+        # (element, position or None) of the open elements
+        open_matches = []
+        matching = 0
+        position = 0
+        for event, element in iter_etree.iterparse(source, events=("start", "end")):
+            if event == "start":
+                element_tag = _local_name(element.tag) if ignore_ns else element.tag
+                if (tag is None or element_tag == tag) and \
+                   (depth is None or depth == len(open_matches)):
+                    open_matches.append((element, position))
+                    position += 1
+                    matching += 1
+                else:
+                    open_matches.append((element, None))
+                continue
+            _, element_position = open_matches.pop()
+            if element_position is not None:
+                yield element_position, element
+                matching -= 1
+            if matching == 0:
+                # nothing open needs the element anymore, drop it from the tree
+                element.clear()
+                if open_matches:
+                    open_matches[-1][0].remove(element)
+    finally:
+        if opened:
+            source.close()
+
+def _get_inner_xml(element):
+    """Returns the text and the serialized children of an element """
+    if LXML_CACHE is not None and isinstance(element, etree._Element):
+        tostring = etree.tostring
+    else:
+        tostring = iter_etree.tostring
+    return escape(element.text or "") + "".join(
+        tostring(child) for child in element)
+
+def _get_tag_value(element, tag):
+    """Returns the inner xml of an element without the tags of the nested
+    elements with the same tag, like the minidom lookups """
+    return _get_inner_xml(element).replace("<" + tag + ">", "").replace(
+        "</" + tag + ">", "")
+
+def get_value_list_by_tag_streaming(xml, tag, limit=None, ignore_ns=False):
+    """
+    Streaming variant of getValueListbyTagFromString for an xml file,
+    string or file object, returns the content (text and serialized
+    children, see _get_tag_value) of the elements with the tag in
+    document order. The parsing
+    stops once the first limit elements are found when limit is provided.
+    """
+    itemlist = []
+    if limit is not None and limit <= 0:
+        return itemlist
+    # contents of the nested elements produced before the elements
+    # containing them, by position
+    pending = {}
+    for position, element in _iterparse_matches(xml, tag, ignore_ns):
+        pending[position] = _get_tag_value(element, tag)
+        while len(itemlist) in pending:
+            itemlist.append(pending.pop(len(itemlist)))
+        if limit is not None and len(itemlist) >= limit:
+            return itemlist[:limit]
+    return itemlist
+
+def get_value_by_tag_streaming(xml, tag, ignore_ns=False):
+    """
+    Streaming lookup of a tag in an xml file, string or file object,
+    returns the content (text and serialized children, see _get_tag_value)
+    of the first element with the tag in document order, empty string if
+    there is no such element. The parsing stops and the source is closed
+    as soon as the element is parsed.
+    """
+    matches = _iterparse_matches(xml, tag, ignore_ns)
+    try:
+        for position, element in matches:
+            # nested elements with the tag are produced before the first one
+            if position == 0:
+                return _get_tag_value(element, tag)
+    finally:
+        matches.close()
+    return ""
+
+def iter_elements_by_tagname_ignore_ns(xml, element_tag):
+    """
+    Streaming variant of get_elements_by_tagname_ignore_ns, generator of
+    the ElementTree elements with the tag name in any namespace, see
+    iterparse_elements for the lifetime of the elements.
+    """
+    return iterparse_elements(xml, element_tag, ignore_ns=True)
+
+def iter_xml_as_dicts(file_name):
+    """
+    Streaming variant of convert_xml_to_list_of_dict, generator of one
+    OrderedDict {tag: text} of the children of each child of the root.
+    """
+    for child in iterparse_elements(file_name, depth=1):
+        subchild_dict = OrderedDict()
+        for subchild in child:
+            subchild_dict[subchild.tag] = subchild.text
+        yield subchild_dict
+
 def compare_xml_using_xpath(response, list_of_xpath, list_of_expected_api_responses):
     """
         Will get each xpath in list of xpath and get the value of
@@ -963,9 +1216,13 @@ def compare_xml_using_xpath(response, list_of_xpath, list_of_expected_api_respon
         status = False
 
     if status:
+        xml = None
         for index, xpath_pattern in enumerate(list_of_xpath):
             xpath = xpath_pattern.strip("xpath=")
-            value = getValuebyTagFromStringWithXpath(response, xpath, None)
+            # the response is parsed once for all the xpaths
+            if xml is None:
+                xml = etree.fromstring(response)
+            value = get_first_value_with_xpath(xml, xpath, None)
             if value != list_of_expected_api_responses[index]:
                 status = False
                 print_error("For the given {0} the expected response value is"
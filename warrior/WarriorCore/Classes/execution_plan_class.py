@@ -0,0 +1,254 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""Compiled execution plan of a testcase
+
+A Testcase xml file is compiled once into a TestcasePlan which holds one
+StepRecord per <step> element, every attribute the step drivers need
+(driver, keyword, typed arguments, impact, context, onError, runmode,
+retry, iteration_type) is parsed only during the compile phase.
+
+runmode (RMT/RUF/RUP) and retry repeats are not expanded into copies of
+the step, the plan keeps one segment per step with its repeat count and
+creates a light weight StepAttempt for a step number only when the
+drivers ask for it. Step numbers, attempt numbers and the step number
+to move to after the repeats (go_next) are identical to the numbers of
+the expanded step list used by the earlier versions of Warrior."""
+
+import os
+import bisect
+import copy
+import Framework.Utils as Utils
+from Framework.Utils.print_Utils import print_warning
+from WarriorCore import common_execution_utils
+from WarriorCore.Classes.argument_datatype_class import ArgumentDatatype
+
+
+class StepRecord(object):
+    """Compiled form of a <step> element of a testcase """
+
+    def __init__(self, element):
+        """Constructor, parses all the details of the step element """
+        self.element = element
+        self.driver = element.get('Driver')
+        self.plugin = element.get('Plugin')
+        self.keyword = element.get('Keyword')
+        self.context = Utils.testcase_Utils.get_context_from_xmlfile(element)
+        self.impact = Utils.testcase_Utils.get_impact_from_xmlfile(element)
+        self.description = Utils.testcase_Utils.get_description_from_xmlfile(element)
+        self.onerror_action = Utils.xml_Utils.get_attributevalue_from_directchildnode(
+            element, 'onError', 'action')
+        self.onerror_value = Utils.xml_Utils.get_attributevalue_from_directchildnode(
+            element, 'onError', 'value')
+        self.runmode_type, self.runmode_value = \
+            common_execution_utils.get_runmode_from_xmlfile(element)
+        self.retry_type, self.retry_cond, self.retry_cond_value, self.retry_value,\
+            self.retry_interval = common_execution_utils.get_retry_from_xmlfile(element)
+        self.iteration_type = self._get_iteration_type(element)
+        self.kw_system_name = self._get_kw_system_name(element)
+        self.depends_on = self._get_depends_on(element)
+        self.static_args, self.dynamic_args = self._compile_arguments(element)
+
+    @staticmethod
+    def _compile_arguments(element):
+        """Converts the arguments of the step to their python datatypes,
+        arguments that refer to environment variables can change during
+        execution and are kept as (name, raw value) to be resolved when
+        the step is executed """
+        static_args = {}
+        dynamic_args = []
+        arguments = element.find('Arguments')
+        if arguments is not None:
+            for argument in arguments.findall('argument'):
+                arg_name = argument.get('name')
+                if arg_name is None:
+                    continue
+                arg_value = argument.get('value')
+                if arg_value is None:
+                    arg_value = argument.text
+                if arg_value is not None and "${ENV." in arg_value:
+                    dynamic_args.append((arg_name, arg_value))
+                else:
+                    static_args[arg_name] = ArgumentDatatype(arg_name, arg_value)\
+                                            .convert_arg_to_datatype()
+        return static_args, dynamic_args
+
+    @staticmethod
+    def _get_iteration_type(element):
+        """Gets the iteration type of the step, defaults to standard """
+        iteration_type = None
+        iteration_type_tag = element.find("iteration_type")
+        if iteration_type_tag is not None:
+            iteration_type = iteration_type_tag.get("type")
+        if iteration_type is not None:
+            iteration_type = str(iteration_type).lower().strip()
+        else:
+            iteration_type = "standard"
+        return iteration_type
+
+    @staticmethod
+    def _get_kw_system_name(element):
+        """Gets the value of the system_name argument of the step """
+        kw_system_name = None
+        system_name_tag = element.find("Arguments/argument[@name='system_name']")
+        if system_name_tag is not None:
+            kw_system_name = system_name_tag.get("value")
+        if kw_system_name is not None:
+            kw_system_name = str(kw_system_name).strip()
+        return kw_system_name
+
+    @staticmethod
+    def _get_depends_on(element):
+        """Gets the list of step numbers (position of the <step> in the
+        testcase, starting from 1) provided in the depends_on attribute """
+        depends_on = element.get("depends_on")
+        if depends_on is None:
+            return []
+        return [value.strip() for value in depends_on.split(",") if value.strip()]
+
+    def get_arguments(self):
+        """Returns a new args_repository for an execution of the step """
+        args_repository = copy.deepcopy(self.static_args)
+        for arg_name, arg_value in self.dynamic_args:
+            arg_value = Utils.data_Utils.sub_from_env_var(arg_value)
+            args_repository[arg_name] = ArgumentDatatype(arg_name, arg_value)\
+                                        .convert_arg_to_datatype()
+        return args_repository
+
+
+class StepAttempt(object):
+    """One executable step of a TestcasePlan, i.e. one attempt
+    of a StepRecord, attributes not defined here are read from the
+    StepRecord """
+
+    def __init__(self, record, repeat_type=None, attempt=None, go_next=None):
+        """Constructor
+
+        repeat_type is None for steps executed once, 'runmode' or 'retry'
+        for the attempts of a repeated step """
+        self.record = record
+        self.repeat_type = repeat_type
+        self.attempt = attempt
+        self.go_next = go_next
+
+    def __getattr__(self, name):
+        """Delegate the step details to the StepRecord, the record itself
+        and the private attributes are not delegated (they are looked up
+        by pickle before the record is set) """
+        if name == 'record' or name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.record, name)
+
+    def get_runmode(self):
+        """Returns (runmode type, step number to go to after the runmode
+        attempts), same as get_runmode_from_xmlfile on an expanded step """
+        if self.repeat_type == 'runmode':
+            return self.record.runmode_type, self.go_next
+        return None, 1
+
+    def get_retry(self):
+        """Returns (retry type, condition, condition value, step number to go
+        to after the retry attempts, interval), same as get_retry_from_xmlfile
+        on an expanded step """
+        if self.repeat_type == 'retry':
+            return (self.record.retry_type, self.record.retry_cond,
+                    self.record.retry_cond_value, self.go_next,
+                    self.record.retry_interval)
+        return None, None, None, 5, 5
+
+
+class TestcasePlan(object):
+    """Compiled, immutable execution plan of a testcase
+
+    Behaves like a read only sequence of StepAttempt objects
+    indexed by (step number - 1) """
+
+    # compiled plans of this process keyed by (path, mtime, size)
+    _cache = {}
+
+    def __init__(self, records):
+        """Constructor, computes the repeat segments of the records """
+        self.records = records
+        # each segment is (start index, count, record, repeat_type)
+        self._segments = []
+        self._starts = []
+        self._length = 0
+        # (start index, stop index) of the attempts of each record
+        self.record_ranges = []
+        for record in records:
+            start = self._length
+            runmode_count = record.runmode_value if record.runmode_type is not None else 0
+            retry_count = record.retry_value if record.retry_type is not None else 0
+            if runmode_count > 0:
+                self._add_segment(record, runmode_count, 'runmode')
+            if retry_count > 0:
+                self._add_segment(record, retry_count, 'retry')
+            if record.runmode_type is None and record.retry_type is None:
+                self._add_segment(record, 1, None)
+            self.record_ranges.append((start, self._length))
+
+    def _add_segment(self, record, count, repeat_type):
+        """Adds a segment of count attempts of the record to the plan """
+        self._segments.append((self._length, count, record, repeat_type))
+        self._starts.append(self._length)
+        self._length += count
+
+    @classmethod
+    def from_testcase(cls, testcase_filepath):
+        """Returns the compiled plan of a Testcase xml file, plans are
+        immutable hence a file is compiled again only when it changes """
+        try:
+            stat = os.stat(testcase_filepath)
+            key = (os.path.abspath(testcase_filepath), stat.st_mtime, stat.st_size)
+        except OSError:
+            key = None
+        plan = cls._cache.get(key) if key is not None else None
+        if plan is None:
+            plan = cls.compile_testcase(testcase_filepath)
+            if key is not None:
+                cls._cache[key] = plan
+        return plan
+
+    @classmethod
+    def compile_testcase(cls, testcase_filepath):
+        """Compiles the steps of a Testcase xml file """
+        records = []
+        root = Utils.xml_Utils.getRoot(testcase_filepath)
+        steps = root.find('Steps')
+        if steps is None:
+            print_warning("Case: '{}' has no Steps/Keywords "
+                          "to be executed".format(testcase_filepath))
+        else:
+            records = [StepRecord(step) for step in steps.findall('step')]
+        return cls(records)
+
+    def __len__(self):
+        """Number of executable steps, repeats included """
+        return self._length
+
+    def __getitem__(self, index):
+        """Returns the StepAttempt for the index (step number - 1) """
+        if index < 0:
+            index += self._length
+        if index < 0 or index >= self._length:
+            raise IndexError("step index out of range")
+        start, count, record, repeat_type = \
+            self._segments[bisect.bisect_right(self._starts, index) - 1]
+        if repeat_type is None:
+            return StepAttempt(record)
+        return StepAttempt(record, repeat_type, index - start + 1, start + count + 1)
+
+    def __iter__(self):
+        """Iterates over the StepAttempt objects of the plan """
+        for index in range(self._length):
+            yield self[index]
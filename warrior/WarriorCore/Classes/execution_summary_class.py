@@ -26,7 +26,7 @@ class ExecutionSummary():
 
     def project_summary(self, junit_file):
         """To get the project name, project status and it's location"""
-        tree = xml_Utils.get_tree_from_file(self.junit_file)
+        tree = xml_Utils.get_tree_from_file(self.junit_file, cache=False)
         for names in tree.iter('testsuites'):
             proj_detail = names.attrib
             proj_name = proj_detail.get('name')
@@ -43,7 +43,7 @@ class ExecutionSummary():
 
     def suite_summary(self, junit_file):
         """ To get the name, status and location of both test suite and test case"""
-        tree = xml_Utils.get_tree_from_file(self.junit_file)
+        tree = xml_Utils.get_tree_from_file(self.junit_file, cache=False)
         for values in tree.iter('testsuite'):
             suite_detail = values.attrib
             suite_name = suite_detail.get('name')
@@ -68,7 +68,7 @@ class ExecutionSummary():
 
     def get_file_type(self, junit_file):
         """To get the file type which is given for execution"""
-        tree = xml_Utils.get_tree_from_file(self.junit_file)
+        tree = xml_Utils.get_tree_from_file(self.junit_file, cache=False)
         for names in tree.iter('testsuites'):
             file_detail = names.attrib
             file_val = file_detail.get('name')
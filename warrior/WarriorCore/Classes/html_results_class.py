@@ -31,7 +31,7 @@ class WarriorHtmlResults():
         self.junit_file = junit_file
         self.html_template = "{0}{1}reporting{1}html_results_template.html"\
                              .format(Tools.__path__[0], os.sep)
-        self.junit_root = xml_Utils.getRoot(self.junit_file)
+        self.junit_root = xml_Utils.getRoot(self.junit_file, cache=False)
         self.html_root = xml_Utils.getRoot(self.html_template)
         self.table = getElementWithTagAttribValueMatch(self.html_root, "table",
                                                "name", "ResultsSummaryTable")
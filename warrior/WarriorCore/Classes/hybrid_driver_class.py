@@ -66,7 +66,7 @@ from Framework.Utils import data_Utils, xml_Utils, config_Utils, \
                         testcase_Utils, file_Utils
 from Framework.Utils.testcase_Utils import pNote
 from Framework.Utils.print_Utils import print_debug, print_info
-from WarriorCore import step_driver, common_execution_utils
+from WarriorCore import step_driver
 import WarriorCore.onerror_driver as onerror_driver
 
 
@@ -83,8 +83,8 @@ class HybridDriver(object):
 
         self.data_repository = data_repository
 
-        # List of steps to be executed, these are the xml nodes of the steps
-        # in the testcase
+        # List of steps to be executed, this is the compiled plan
+        # (TestcasePlan) of the testcase
         # List of system names in the warrior data file
         # List of systems from the warrior data file as xml nodes
         # List of iteration type for each step
@@ -262,17 +262,17 @@ class HybridDriver(object):
                                          step_num):
         """
         """
-        runmode, value = common_execution_utils.get_runmode_from_xmlfile(step)
+        runmode, value = step.get_runmode()
 
         if runmode is not None:
             # if runmode is 'ruf' & step_status is False, skip the repeated
             # execution of same TC step and move to next actual step
-            if all(not exec_type_onerror, runmode == "ruf",
-                   step_status is False):
+            if all([not exec_type_onerror, runmode == "RUF",
+                    step_status is False]):
                 goto_stepnum = str(value)
             # if runmode is 'rup' & step_status is True, skip the repeated
             # execution of same TC step and move to next actual step
-            elif runmode == "rup" and step_status is True:
+            elif runmode == "RUP" and step_status is True:
                 goto_stepnum = str(value)
             else:
                 if any([step_status is False,
@@ -280,7 +280,7 @@ class HybridDriver(object):
                        str(step_status).upper() == "EXCEPTION",
                        exec_type_onerror is True]):
                     goto_stepnum = onerror_driver.main(
-                                    step, self.default_error_action,
+                                    step.element, self.default_error_action,
                                     self.default_error_value,
                                     exec_type_onerror)
                     # if (goto_stepnum == 'ABORT'): break
@@ -289,7 +289,7 @@ class HybridDriver(object):
                    str(step_status).upper() == "EXCEPTION",
                    exec_type_onerror is True]):
                 goto_stepnum = onerror_driver.main(
-                                step, self.default_error_action,
+                                step.element, self.default_error_action,
                                 self.default_error_value, exec_type_onerror)
                 if str(goto_stepnum).upper() == 'ABORT':
                     pass
@@ -385,11 +385,11 @@ class HybridDriver(object):
     def _update_skip_results(self, step, system_name, step_num):
         """
         """
-        keyword = step.get('Keyword')
+        keyword = step.keyword
         kw_resultfile = step_driver.get_keyword_resultfile(
                         self.data_repository, system_name, step_num, keyword)
         config_Utils.set_resultfile(kw_resultfile)
-        testcase_Utils.pKeyword(keyword, step.get('Driver'))
+        testcase_Utils.pKeyword(keyword, step.driver)
         testcase_Utils.reportStatus('Skip')
         print_info("\n-----------------------------------------------------\n")
         self.data_repository['wt_junit_object'].update_count(
@@ -400,6 +400,7 @@ class HybridDriver(object):
                 self.data_repository['wt_tc_timestamp'], step_num, keyword,
                 "SKIPPED", "skipped", "skipped", "skipped", "skipped",
                 "skipped")
+        testcase_Utils.write_result()
         result = ("Skip", kw_resultfile, None, None)
         return result
 
@@ -452,24 +453,9 @@ class HybridDriver(object):
 
     def _get_kw_system_name_list(self, step_list):
         """
-        Get the iteration type of a step
+        Get the system name provided as argument in each step
         """
-        kw_system_name_list = []
-
-        for step in step_list:
-            kw_system_name = None
-            system_name_tag = step.find(
-                            "Arguments/argument[@name='system_name']")
-            if system_name_tag is not None or False:
-                kw_system_name = system_name_tag.get("value")
-            if kw_system_name is False or kw_system_name is None:
-                kw_system_name = None
-            else:
-                kw_system_name = str(kw_system_name).strip()
-
-            kw_system_name_list.append(kw_system_name)
-
-        return kw_system_name_list
+        return [step.kw_system_name for step in step_list]
 
     def _get_exec_steps(self, step_list, iter_type_list):
         """
@@ -489,20 +475,7 @@ class HybridDriver(object):
         """
         Get the iteration type of a step
         """
-        iter_type_list = []
-
-        for step in step_list:
-            iteration_type = None
-            iteration_type_tag = step.find("iteration_type")
-            if iteration_type_tag is not None and \
-               iteration_type_tag is not False:
-                iteration_type = iteration_type_tag.get("type")
-            if iteration_type is not None and iteration_type is not False:
-                iteration_type = str(iteration_type).lower().strip()
-            else:
-                iteration_type = "standard"
-            iter_type_list.append(iteration_type)
-        return iter_type_list
+        return [step.iteration_type for step in step_list]
 
     def compute_system_resultfile(self, kw_resultfile_list, resultsdir,
                                   system_name):
@@ -223,9 +223,11 @@ class IronClaw(object):
         the keyword and returns a matching list
         Returns None of no match/duplicates found """
 
-        drv_obj = kw_driver_class.ModuleOperations(package_list, keyword)
+        matching_method_list, matching_function_list = \
+        kw_driver_class.KeywordRegistry.lookup(package_list, keyword)
 
-        search_result_list = drv_obj.matching_method_list + drv_obj.matching_function_list
+        search_result_list = [kw_info.exec_obj for kw_info in
+                              matching_method_list + matching_function_list]
         if len(search_result_list) == 1:
             print_info("Found one matching method/function for "\
                        "keyword '{0}'".format(keyword))
@@ -317,7 +317,7 @@ class Jira(object):
         """ Update the issue-id under the corresponding step
         in the testcase result xml file """
 
-        tree = xml_Utils.get_tree_from_file(result_xml_file)
+        tree = xml_Utils.get_tree_from_file(result_xml_file, cache=False)
         keywords = tree.findall('Keyword')
         for keyword in keywords:
             step = keyword.find('Step')
@@ -14,6 +14,7 @@ limitations under the License.
 """helper methods to create a Junit file"""
 import xml.etree.ElementTree as ET
 import os
+import time
 import  Tools
 import shutil
 from Framework.Utils.print_Utils import print_info
@@ -21,7 +22,20 @@ from WarriorCore.Classes.html_results_class import WarriorHtmlResults
 from WarriorCore.Classes.execution_summary_class import ExecutionSummary
 
 class Junit(object):
-    """Junit class"""
+    """Junit class
+
+    testsuite and testcase elements are indexed by their timestamp,
+    elements appended directly to the root (e.g. results merged from
+    other processes) are indexed on the first lookup that misses.
+
+    The junit file is written by flush_junit after every flush_steps
+    keywords or flush_interval seconds, the html results are generated
+    only by output_junit (end of testcase/testsuite/project or on demand)."""
+
+    flush_steps = 10
+    flush_interval = 30
+    # result counters merged from the result records of worker processes
+    count_keys = ["errors", "failures", "skipped", "passes", "exceptions", "keywords"]
 
     def __init__(self, filename, **kwargs):
         """constructor """
@@ -30,6 +44,14 @@ class Junit(object):
         self.filename = filename
         properties = self.create_element("properties")
         self.root.append(properties)
+        # timestamp: testsuite element
+        self.ts_index = {}
+        # timestamp: (testcase element, testsuite element)
+        self.tc_index = {}
+        self.pending_steps = 0
+        self.last_flush = time.time()
+        # (elem_type, timestamp): {attribute: (int value, string value)}
+        self.counters = {}
 
     def init_arg(self, **kwargs):
         default_keys = ["errors", "failures", "skipped", "time", "passes"]
@@ -49,6 +71,7 @@ class Junit(object):
             "property", {"name":"location", "value":location}))
 
         self.root.append(testsuite)
+        self.ts_index.setdefault(testsuite.get("timestamp"), testsuite)
 
     def create_testcase(self, location, timestamp, ts_timestamp, name, classname="customTestsuite_independant_testcase_execution", **kwargs):
         if self.root.find("testsuite") is None:
@@ -61,6 +84,7 @@ class Junit(object):
                 ts.append(tc)
                 properties = self.create_element("properties")
                 tc.append(properties)
+                self.tc_index.setdefault(timestamp, (tc, ts))
 
     @classmethod
     def create_element(cls, tagname="", attr=None, **kwargs):
@@ -74,22 +98,42 @@ class Junit(object):
             elem.set(str(key), str(val))
         return elem
 
-    def get_family_with_timestamp(self, timestamp):
+    def rebuild_index(self):
+        """Indexes all the testsuite and testcase elements of the tree,
+        the first element with a timestamp is the one returned by lookups """
+        self.ts_index = {}
+        self.tc_index = {}
         for testsuite in list(self.root):
+            if testsuite.tag == "testsuite":
+                self.ts_index.setdefault(testsuite.get("timestamp"), testsuite)
             for testcase in list(testsuite):
-                if testcase.get("timestamp") == timestamp:
-                    return [testcase, testsuite, self.root]
+                if testcase.get("timestamp") is not None:
+                    self.tc_index.setdefault(testcase.get("timestamp"), (testcase, testsuite))
+
+    def _get_tc_entry(self, timestamp):
+        """Returns (testcase, testsuite) with the timestamp or None """
+        entry = self.tc_index.get(timestamp)
+        if entry is None:
+            self.rebuild_index()
+            entry = self.tc_index.get(timestamp)
+        return entry
+
+    def get_family_with_timestamp(self, timestamp):
+        entry = self._get_tc_entry(timestamp)
+        if entry is not None:
+            return [entry[0], entry[1], self.root]
 
     def get_tc_with_timestamp(self, timestamp):
-        for testsuite in list(self.root):
-            for testcase in list(testsuite):
-                if testcase.get("timestamp") == timestamp:
-                    return testcase
+        entry = self._get_tc_entry(timestamp)
+        if entry is not None:
+            return entry[0]
 
     def get_ts_with_timestamp(self, timestamp):
-        for testsuite in list(self.root):
-            if testsuite.get("timestamp") == timestamp:
-                return testsuite
+        testsuite = self.ts_index.get(timestamp)
+        if testsuite is None:
+            self.rebuild_index()
+            testsuite = self.ts_index.get(timestamp)
+        return testsuite
 
     def add_keyword_result(self, tc_timestamp, step_num, kw_name, status, kw_timestamp, duration,
                            resultfile, impact, onerror):
@@ -101,6 +145,83 @@ class Junit(object):
                          "time":duration, "resultfile": resultfile, "impact":impact, "onerror":onerror}
         self.add_property(name=kw_name, value="KEYWORD_DISCARD", elem_type = "kw", timestamp=tc_timestamp, keyword_items=keyword_items)
 
+    def get_counts(self, elem):
+        """Returns the result counters of a testsuite/testcase element as ints """
+        return dict((key, int(elem.get(key))) for key in self.count_keys
+                    if elem.get(key) is not None)
+
+    def add_counts(self, elem, elem_type, timestamp, counts):
+        """Adds the counts to the result counters of the element, the
+        counters are kept as ints and parsed again only if the attribute
+        was changed by other means since the last update """
+        cache = self.counters.setdefault((elem_type, timestamp), {})
+        for key, value in counts.items():
+            current = elem.get(key)
+            if current is None:
+                continue
+            cached = cache.get(key)
+            total = (cached[0] if cached is not None and cached[1] == current
+                     else int(current)) + value
+            cache[key] = (total, str(total))
+            elem.set(key, cache[key][1])
+
+    def get_testcase_record(self, tc_timestamp):
+        """Returns a compact record of the result of a testcase executed in
+        a worker process: (testcase timestamp, testcase xml, counts) """
+        testcase = self.get_tc_with_timestamp(tc_timestamp)
+        if testcase is None:
+            return None
+        return tc_timestamp, ET.tostring(testcase), self.get_counts(testcase)
+
+    def get_error_testcase_record(self, tc_timestamp, name, classname):
+        """Returns the result record (see get_testcase_record) of a testcase
+        which ended in a worker process without reporting its result,
+        the testcase is reported as an error """
+        testcase = self.create_element("testcase", classname=classname, timestamp=tc_timestamp,
+                                       exceptions="0", keywords="0", name=name, status="ERROR",
+                                       **self.init_arg(errors="1"))
+        testcase.append(self.create_element("properties"))
+        testcase.append(self.create_element("error", {}))
+        return tc_timestamp, ET.tostring(testcase), self.get_counts(testcase)
+
+    def get_keyword_record(self, tc_timestamp, since=None):
+        """Returns a compact record of the keyword results of a testcase
+        executed in a worker process: (testcase timestamp, keyword rows, counts)
+
+        since = record taken when the worker started, only the keyword
+        rows and counts added after it are returned """
+        testcase = self.get_tc_with_timestamp(tc_timestamp)
+        if testcase is None:
+            return None
+        rows = [dict(item.attrib) for item in testcase.find("properties")
+                if item.get("type") == "keyword"]
+        counts = self.get_counts(testcase)
+        if since is not None:
+            rows = rows[len(since[1]):]
+            counts = dict((key, value - since[2].get(key, 0))
+                          for key, value in counts.items())
+        return tc_timestamp, rows, counts
+
+    def add_testcase_record(self, record):
+        """Adds the testcase of a result record to the first testsuite
+        and its counts to the testsuite """
+        testsuite = self.root.find("testsuite")
+        tc_timestamp, testcase_xml, counts = record
+        testcase = ET.fromstring(testcase_xml)
+        testsuite.append(testcase)
+        self.tc_index.setdefault(tc_timestamp, (testcase, testsuite))
+        self.add_counts(testsuite, "ts", testsuite.get("timestamp"), counts)
+
+    def add_keyword_record(self, record):
+        """Adds the keyword rows of a result record to the testcase
+        and its counts to the testcase """
+        tc_timestamp, rows, counts = record
+        testcase = self.get_tc_with_timestamp(tc_timestamp)
+        properties = testcase.find("properties")
+        for row in rows:
+            properties.append(self.create_element("property", row))
+        self.add_counts(testcase, "tc", tc_timestamp, counts)
+
     def add_testcase_message(self, timestamp, status):
         elem = self.get_tc_with_timestamp(timestamp)
         if elem is None:
@@ -189,14 +310,34 @@ class Junit(object):
         html_result_obj.html_from_junit()
         html_result_obj.output_html()
 
+    def write_junit(self, path):
+        """Writes the junit file to the path, returns the file path """
+        fpath = path + os.sep + self.filename + "_junit.xml"
+        tree = ET.ElementTree(self.root)
+        tree.write(fpath)
+        self.pending_steps = 0
+        self.last_flush = time.time()
+        return fpath
+
+    def flush_junit(self, path, force=False):
+        """Called after every keyword, writes the junit file when flush_steps
+        keywords are pending or flush_interval seconds passed since the
+        last write. The html results are not generated here.
+
+        Returns True if the junit file was written """
+        self.pending_steps += 1
+        if force or self.pending_steps >= self.flush_steps or \
+           time.time() - self.last_flush >= self.flush_interval:
+            self.write_junit(path)
+            return True
+        return False
+
     def output_junit(self, path, print_summary=True):
         """output the actual file
         copy xslt to the results folder
         Print execution summary in console based on 'print_summary' value """
 
-        fpath = path + os.sep + self.filename + "_junit.xml"
-        tree = ET.ElementTree(self.root)
-        tree.write(fpath)
+        fpath = self.write_junit(path)
         if print_summary is True:
             summary_obj = ExecutionSummary(fpath)
             summary_obj.print_result_in_console(fpath)
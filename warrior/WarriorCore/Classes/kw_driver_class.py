@@ -16,10 +16,17 @@ information about the keywords, executes the keywords and reports the
 keyword status back to the product driver """
 
 
+import os
+import sys
+import json
 import inspect
+import threading
+import pkgutil
+import importlib
 import traceback
 import Framework.Utils as Utils
-from Framework.Utils.print_Utils import print_info, print_error, print_exception
+from Framework.Utils.print_Utils import print_info, print_error, print_exception,\
+print_debug
 from Framework.Utils.testcase_Utils import pNote_level
 from WarriorCore.Classes.war_cli_class import WarriorCliClass
 
@@ -32,8 +39,11 @@ class ModuleOperations(object):
     2. finding the methods or functions matching the
     keyword name """
 
-    def __init__(self, package_list, keyword):
-        """ Constructor """
+    def __init__(self, package_list, keyword=None):
+        """ Constructor
+
+        keyword is optional, when it is not provided only the
+        module/class/method/function lists are built """
         self.package_list = package_list
         self.import_sub_modules()
         self.module_list = self.get_module_list_from_pkglist()
@@ -121,21 +131,282 @@ class ModuleOperations(object):
                 match_list.append(element)
         return match_list
 
+class KeywordInfo(object):
+    """Keyword information stored in the KeywordRegistry
+    holds the location of the keyword (module/class/name) and
+    pre extracted signature metadata, the function/method object
+    and the wdesc string are resolved only when needed """
+
+    def __init__(self, module_name, class_name, name, all_args, req_args,
+                 exec_obj=None):
+        """Constructor """
+        self.module_name = module_name
+        self.class_name = class_name
+        self.name = name
+        self.all_args = all_args
+        self.req_args = req_args
+        self._exec_obj = exec_obj
+        self._wdesc = None
+
+    @classmethod
+    def from_object(cls, exec_obj):
+        """Create a KeywordInfo from a method/function object """
+        if inspect.ismethod(exec_obj):
+            module_name = exec_obj.im_class.__module__
+            class_name = exec_obj.im_class.__name__
+        else:
+            module_name = exec_obj.__module__
+            class_name = None
+        args, _, _, defaults = inspect.getargspec(exec_obj)
+        all_args = [arg for arg in args if arg != 'self']
+        req_args = args[:-len(defaults)] if defaults is not None else list(args)
+        req_args = [arg for arg in req_args if arg != 'self']
+        return cls(module_name, class_name, exec_obj.__name__, all_args, req_args,
+                   exec_obj)
+
+    @property
+    def is_method(self):
+        """True when the keyword is a class method """
+        return self.class_name is not None
+
+    @property
+    def exec_obj(self):
+        """The function/method object of the keyword,
+        imported from its module on first access """
+        if self._exec_obj is None:
+            module = importlib.import_module(self.module_name)
+            if self.class_name is not None:
+                self._exec_obj = getattr(getattr(module, self.class_name), self.name)
+            else:
+                self._exec_obj = getattr(module, self.name)
+        return self._exec_obj
+
+    @property
+    def wdesc(self):
+        """The WDesc string of the keyword, extracted only once """
+        if self._wdesc is None:
+            self._wdesc = Utils.testcase_Utils.get_wdesc_string(self.exec_obj)
+        return self._wdesc
+
+    def to_list(self):
+        """Serializable form of the keyword info used in the on-disk index """
+        return [self.module_name, self.class_name, self.name, self.all_args, self.req_args]
+
+    @classmethod
+    def from_list(cls, info_list):
+        """Create a KeywordInfo from its on-disk index form """
+        module_name, class_name, name, all_args, req_args = info_list
+        return cls(str(module_name), str(class_name) if class_name else None, str(name),
+                   [str(arg) for arg in all_args], [str(arg) for arg in req_args])
+
+
+class KeywordRegistry(object):
+    """Process wide keyword registry
+
+    The Actions packages of a driver are reflected only once per process,
+    every keyword found is stored in a dict keyed by (package name, keyword)
+    with its signature metadata. The result of the reflection is also
+    persisted to an on-disk index keyed by the mtimes of the package
+    modules, so that a cold start with unchanged packages skips the
+    reflection walk and imports only the modules of the keywords executed.
+    The modules which fail to import are recorded in the index, the index
+    of the package is rebuilt once they can be imported.
+
+    The on-disk index location can be changed using the WARRIOR_KW_INDEX
+    environment variable, setting it to an empty value disables the index """
+
+    _registry = {}
+    _packages = {}
+    _index = None
+    # keyword threads register the packages at the same time
+    _lock = threading.RLock()
+    index_file = os.environ.get('WARRIOR_KW_INDEX',
+                                os.path.join(os.path.expanduser('~'), '.warrior',
+                                             'kw_registry_index.json'))
+
+    @classmethod
+    def lookup(cls, package_list, keyword):
+        """Returns the list of matching methods and the list of
+        matching functions (as KeywordInfo objects) for the keyword
+        in the provided package list """
+        matching_method_list = []
+        matching_function_list = []
+        for package in package_list:
+            cls.register_package(package)
+            for info in cls._registry.get((package.__name__, keyword), []):
+                if info.is_method:
+                    matching_method_list.append(info)
+                else:
+                    matching_function_list.append(info)
+        return matching_method_list, matching_function_list
+
+    @classmethod
+    def preload(cls, package, keyword_list):
+        """Registers the package and imports the modules of the keywords
+        in keyword_list, used before forking worker processes so that
+        the workers inherit the imported keywords """
+        cls.register_package(package)
+        for keyword in keyword_list:
+            for info in cls._registry.get((package.__name__, keyword), []):
+                try:
+                    info.wdesc
+                except Exception as exception:
+                    print_debug("unable to preload keyword '{0}': {1}".format(keyword,
+                                                                               exception))
+
+    @classmethod
+    def register_package(cls, package):
+        """Registers all the keywords of a package, does nothing
+        if the package is already registered in this process """
+        pkg_name = package.__name__
+        if pkg_name in cls._packages:
+            return
+        with cls._lock:
+            if pkg_name in cls._packages:
+                return
+            pkg_index = cls._get_index().get(pkg_name)
+            if pkg_index is not None and cls._is_index_valid(package, pkg_index):
+                pkg_registry = {}
+                for keyword, info_list in pkg_index["keywords"].items():
+                    pkg_registry[(pkg_name, keyword)] = [KeywordInfo.from_list(info)
+                                                         for info in info_list]
+            else:
+                failed_list = cls._import_modules(package)
+                pkg_registry, keywords, module_list = cls._reflect_package(package)
+                cls._save_index(package, keywords, module_list, failed_list)
+            registry = dict(cls._registry)
+            registry.update(pkg_registry)
+            cls._registry = registry
+            cls._packages[pkg_name] = True
+
+    @staticmethod
+    def _import_modules(package):
+        """Imports the modules of the package one at a time, returns the
+        names of the modules which fail to import """
+        failed_list = []
+        for _, name, _ in pkgutil.iter_modules(package.__path__):
+            module_name = "{0}.{1}".format(package.__name__, name)
+            try:
+                importlib.import_module(module_name)
+            except Exception as exception:
+                print_debug("unable to import {0}: {1}".format(module_name, exception))
+                failed_list.append(module_name)
+        return failed_list
+
+    @staticmethod
+    def _reflect_package(package):
+        """Walks the package using ModuleOperations, returns the registry
+        entries of every method and function found, the index keywords
+        and the modules of the package """
+        pkg_name = package.__name__
+        drv_obj = ModuleOperations([package])
+        pkg_registry = {}
+        keywords = {}
+        for exec_obj in drv_obj.method_list + drv_obj.function_list:
+            try:
+                info = KeywordInfo.from_object(exec_obj)
+            except TypeError:
+                # builtins/extension callables do not have an argspec
+                continue
+            pkg_registry.setdefault((pkg_name, info.name), []).append(info)
+            keywords.setdefault(info.name, []).append(info.to_list())
+        return pkg_registry, keywords, drv_obj.module_list
+
+    @staticmethod
+    def _get_module_state(package, module_list=None):
+        """Returns the module names in the package directory
+        and the mtimes of the provided modules files """
+        names = sorted([name for _, name, _ in pkgutil.iter_modules(package.__path__)])
+        mtimes = {}
+        for module in module_list or []:
+            filename = getattr(module, '__file__', None)
+            if filename is None:
+                continue
+            filename = os.path.splitext(filename)[0] + '.py'
+            if os.path.isfile(filename):
+                mtimes[filename] = os.path.getmtime(filename)
+        return names, mtimes
+
+    @classmethod
+    def _is_index_valid(cls, package, pkg_index):
+        """Index is valid when no module was added or removed
+        from the package, no module file was modified and the modules
+        which failed to import still fail """
+        names, _ = cls._get_module_state(package)
+        if package.__path__[0] != pkg_index.get("path") or names != pkg_index.get("names"):
+            return False
+        for filename, mtime in pkg_index.get("mtimes", {}).items():
+            if not os.path.isfile(filename) or os.path.getmtime(filename) != mtime:
+                return False
+        for module_name in pkg_index.get("failed", []):
+            if sys.modules.get(module_name) is not None:
+                return False
+            try:
+                importlib.import_module(module_name)
+            except Exception:
+                continue
+            return False
+        return True
+
+    @classmethod
+    def _get_index(cls):
+        """Reads the on-disk index once per process """
+        if cls._index is None:
+            cls._index = {}
+            if cls.index_file and os.path.isfile(cls.index_file):
+                try:
+                    with open(cls.index_file) as index_fd:
+                        cls._index = json.load(index_fd)
+                except (IOError, ValueError):
+                    print_debug("Unable to read keyword index {0}".format(cls.index_file))
+        return cls._index
+
+    @classmethod
+    def _save_index(cls, package, keywords, module_list, failed_list):
+        """Updates the on-disk index with the keywords of a package """
+        if not cls.index_file:
+            return
+        names, mtimes = cls._get_module_state(package, module_list)
+        index = cls._get_index()
+        index[package.__name__] = {"path": package.__path__[0], "names": names,
+                                   "mtimes": mtimes, "keywords": keywords,
+                                   "failed": failed_list}
+        try:
+            index_dir = os.path.dirname(cls.index_file)
+            if index_dir and not os.path.isdir(index_dir):
+                os.makedirs(index_dir)
+            tmp_file = "{0}.{1}".format(cls.index_file, os.getpid())
+            with open(tmp_file, 'w') as index_fd:
+                json.dump(index, index_fd)
+            os.rename(tmp_file, cls.index_file)
+        except (IOError, OSError):
+            print_debug("Unable to write keyword index {0}".format(cls.index_file))
+
+
 class KeywordOperations(object):
     """KeywordOperations class has methods that
     gets the mandatory/optional args requored to execute
     a keyword and their values"""
 
-    def __init__(self, keyword, exec_obj, args_repository, data_repository):
-        """Constructor """
+    def __init__(self, keyword, exec_obj, args_repository, data_repository,
+                 kw_info=None):
+        """Constructor
+
+        kw_info is an optional KeywordInfo object from the KeywordRegistry,
+        when provided its pre extracted argument lists are used instead of
+        inspecting the function/method object again """
 
         self.keyword = keyword
         self.exec_obj = exec_obj
         self.args_repository = args_repository
         self.data_repository = data_repository
 
-        self.all_args_list = self.get_all_arguments()
-        self.req_args_list = self.get_mandatory_arguments()
+        if kw_info is not None:
+            self.all_args_list = list(kw_info.all_args)
+            self.req_args_list = list(kw_info.req_args)
+        else:
+            self.all_args_list = self.get_all_arguments()
+            self.req_args_list = self.get_mandatory_arguments()
         self.optional_args_list = list(set(self.all_args_list) - set(self.req_args_list))
 
     def get_all_arguments(self):
@@ -21,8 +21,14 @@ as it will lead to cyclic imports.
 """
 
 import xml.etree.ElementTree as ET
+import atexit
 import inspect
+import json
+import os
 import re
+import threading
+import time
+import weakref
 
 from Framework.Utils.print_Utils import  print_info, print_debug, print_warning,\
 print_error, print_exception, print_sub, print_notype
@@ -31,6 +37,166 @@ print_error, print_exception, print_sub, print_notype
 #import Framework.Utils.config_Utils as config_Utils
 #import Framework.Utils.xml_Utils as xml_Utils
 
+
+class ResultEventLog(object):
+    """Append only event log of a result xml file
+
+    Every element and attribute added to the in-memory result tree is
+    appended as an event (one json list per line) to <resultfile>.events,
+    the events are buffered and written in batches. The result xml file
+    itself is written only once when the result is complete, the event
+    log is then removed. If the process dies before that, the result xml
+    file is rebuilt from the event log by recover_resultfile.
+
+    An existing tree is added to the event log (snapshot) only when it is
+    changed, a tree which is not changed is not serialized again.
+
+    Events:
+        ["s", xml string, element ids]      snapshot of an existing tree
+        ["r", id, tag]                      new root element
+        ["e", id, parent id, tag, text, attributes]   new sub element
+        ["a", id, name, value]              attribute set on an element
+    """
+
+    flush_count = 200
+    flush_interval = 1.0
+
+    def __init__(self, resultfile, root=None):
+        """Constructor
+        root: existing tree of the result, added to the event log when
+        it is changed """
+        self.root = root
+        self.resultfile = resultfile
+        self.event_file = resultfile + ".events"
+        self.ids = {}
+        self.buffer = []
+        self.last_flush = time.time()
+        self.dirty = False
+        self.started = False
+
+    def get_id(self, element):
+        """Returns the id of the element in the event log """
+        element_id = self.ids.get(id(element))
+        if element_id is None:
+            element_id = len(self.ids) + 1
+            self.ids[id(element)] = element_id
+        return element_id
+
+    def add_event(self, event):
+        """Buffers an event, the buffer is written to the event
+        log every flush_count events or flush_interval seconds """
+        self.buffer.append(json.dumps(event))
+        self.dirty = True
+        if len(self.buffer) >= self.flush_count or \
+           time.time() - self.last_flush >= self.flush_interval:
+            self.flush()
+
+    def snapshot(self):
+        """Adds the existing tree to the event log, called before the
+        tree is changed """
+        if self.root is None:
+            return
+        root = self.root
+        self.root = None
+        ids = [self.get_id(element) for element in root.iter()]
+        self.add_event(["s", ET.tostring(root), ids])
+
+    def new_root(self, root):
+        """Adds a new root element to the event log """
+        self.root = None
+        self.add_event(["r", self.get_id(root), root.tag])
+
+    def sub_element(self, parent, element):
+        """Adds a sub element to the event log """
+        self.add_event(["e", self.get_id(element), self.ids.get(id(parent)), element.tag,
+                        element.text, element.attrib])
+
+    def set_attribute(self, element, name, value):
+        """Adds an attribute of an element to the event log """
+        self.add_event(["a", self.get_id(element), name, value])
+
+    def flush(self):
+        """Appends the buffered events to the event log """
+        self.last_flush = time.time()
+        if not self.buffer:
+            return
+        try:
+            with open(self.event_file, 'a' if self.started else 'w') as event_file:
+                event_file.write('\n'.join(self.buffer) + '\n')
+            self.started = True
+        except IOError:
+            pass
+        self.buffer = []
+
+    def close(self):
+        """Discards the event log once the result file is written """
+        self.buffer = []
+        if self.started and os.path.exists(self.event_file):
+            os.remove(self.event_file)
+        self.started = False
+
+    @staticmethod
+    def recover_resultfile(resultfile):
+        """Rebuilds a result xml file from its event log, returns
+        True if the result file was rebuilt """
+        event_file = resultfile + ".events"
+        if not os.path.exists(event_file):
+            return False
+        root = None
+        elements = {}
+        with open(event_file) as events:
+            for line in events:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # incomplete last line of a process that died
+                    break
+                if event[0] == "s":
+                    root = ET.fromstring(event[1])
+                    for element, element_id in zip(root.iter(), event[2]):
+                        elements[element_id] = element
+                elif event[0] == "r":
+                    root = ET.Element(event[2])
+                    elements[event[1]] = root
+                elif event[0] == "e":
+                    parent = elements.get(event[2])
+                    if parent is None:
+                        continue
+                    element = ET.SubElement(parent, event[3], event[5])
+                    element.text = event[4]
+                    elements[event[1]] = element
+                elif event[0] == "a" and event[1] in elements:
+                    elements[event[1]].set(event[2], event[3])
+        if root is None:
+            return False
+        ET.ElementTree(root).write(resultfile)
+        os.remove(event_file)
+        return True
+
+
+# TestcaseUtils objects whose result is written when the execution ends
+LIVE_TCOBJS = weakref.WeakSet()
+EXIT_LOCK = threading.Lock()
+EXIT_REGISTERED = False
+
+
+def write_live_results():
+    """Writes the results still pending when the execution ends """
+    for tcobj in list(LIVE_TCOBJS):
+        tcobj.write_result()
+
+
+def register_at_exit(tcobj):
+    """Writes the result of a TestcaseUtils object when the execution
+    ends, a single exit hook writes the results of all the live objects """
+    global EXIT_REGISTERED
+    with EXIT_LOCK:
+        if not EXIT_REGISTERED:
+            atexit.register(write_live_results)
+            EXIT_REGISTERED = True
+        LIVE_TCOBJS.add(tcobj)
+
+
 class TestcaseUtils(object):
     """testcase utils class"""
     def __init__(self):
@@ -47,6 +213,9 @@ class TestcaseUtils(object):
         self.grequirementloop = 0
         self.gsubkey = {}
         self.gsubkeyloop = 0
+        self.event_log = None
+        self.writing = False
+        self.exit_registered = False
 
     def file_utils(self):
         """
@@ -62,27 +231,90 @@ class TestcaseUtils(object):
            
 
 
-    def print_output(self):
-        """ Prints the dump of the xml object to the file specified.
-        This function can be used for debugging purpose and
-        its called at the end of the functional calls.
+    def get_event_log(self):
+        """Returns the event log of the current result file, the result
+        of the previous result file is written when the result file changes """
+        import Framework.Utils.config_Utils as config_Utils
+        resultfile = config_Utils.get_resultfile()
+        if self.event_log is not None and self.event_log.resultfile != resultfile:
+            self.write_result()
+        if self.event_log is None and resultfile and not self.writing:
+            if not self.exit_registered:
+                # write the result still pending when the execution ends
+                register_at_exit(self)
+                self.exit_registered = True
+            self.event_log = ResultEventLog(resultfile, self.root)
+        return self.event_log
+
+    def new_root(self, tag):
+        """Creates a new root element of the result tree """
+        root = ET.Element(tag)
+        event_log = self.get_event_log()
+        if event_log is not None:
+            event_log.new_root(root)
+        return root
+
+    def sub_element(self, parent, tag, text=None, **attrib):
+        """Creates a sub element in the result tree """
+        event_log = self.get_event_log()
+        if event_log is not None:
+            event_log.snapshot()
+        element = ET.SubElement(parent, tag, **attrib)
+        if text is not None:
+            element.text = text
+        if event_log is not None:
+            event_log.sub_element(parent, element)
+        return element
+
+    def set_attribute(self, element, name, value):
+        """Sets an attribute of an element of the result tree """
+        event_log = self.get_event_log()
+        if event_log is not None:
+            event_log.snapshot()
+        element.set(name, value)
+        if event_log is not None:
+            event_log.set_attribute(element, name, value)
 
-        :Arguments:
-            resultfile = Result File
+    def print_output(self):
+        """ The changes of the xml object are appended to the event log of
+        the result file, the xml object is written to the result file only
+        by write_result (end of keyword, change of result file, new result
+        tree) instead of rewriting the whole file on every change.
 
         :Returns:
             None
         """
+        event_log = self.get_event_log()
+        if event_log is not None:
+            event_log.dirty = True
 
+    def write_result(self):
+        """ Writes the xml object to the result file if it changed
+        since it was last written and removes the event log.
+
+        :Returns:
+            None
+        """
+        if self.event_log is None or self.writing:
+            return
+        event_log = self.event_log
+        self.event_log = None
+        if not event_log.dirty or self.root is None:
+            event_log.close()
+            return
+        self.writing = True
         try:
-            import Framework.Utils.config_Utils as config_Utils 
-            resultfile = config_Utils.resultfile
             tree = ET.ElementTree(self.root)
-            tree.write(resultfile)
+            tree.write(event_log.resultfile)
+            event_log.close()
         except UnicodeDecodeError as e:
+            event_log.flush()
             print_exception(e)
         except Exception as err:
+            event_log.flush()
             print_exception(err)
+        finally:
+            self.writing = False
 
     @staticmethod
     def p_open(fileobject):
@@ -98,7 +330,8 @@ class TestcaseUtils(object):
     def p_testcase(self):
         """Creates a  self.root tag in the testcase result xml file"""
 
-        self.root = ET.Element("Testcase")
+        self.write_result()
+        self.root = self.new_root("Testcase")
         self.current_pointer = self.root
         self.print_output()
 
@@ -108,10 +341,9 @@ class TestcaseUtils(object):
         self.p_testcase()
         self.gkeywordloop = self.gkeywordloop+1
         print_info("\n********************* Keyword: %s *********************\n" % keyword_txt)
-        self.gkeyword[self.gkeywordloop] = ET.SubElement(self.root, "Keyword")
+        self.gkeyword[self.gkeywordloop] = self.sub_element(self.root, "Keyword")
         self.current_pointer = self.gkeyword[self.gkeywordloop]
-        name = ET.SubElement(self.gkeyword[self.gkeywordloop], "Name")
-        name.text = keyword_txt
+        self.sub_element(self.gkeyword[self.gkeywordloop], "Name", keyword_txt)
         self.p_driver(driver_txt)
         self.print_output()
 
@@ -120,52 +352,48 @@ class TestcaseUtils(object):
         self.gsubkeyloop = self.gsubkeyloop+1
         print_info("\n***************Sub-Keyword: %s "
                    "***************\n" % keyword_txt)
-        self.gsubkey[self.gsubkeyloop] = ET.SubElement(\
-                self.gstep[self.gsteploop], "Keyword")
+        self.gsubkey[self.gsubkeyloop] = self.sub_element(\
+                self.gstep[self.gsteploop], "Keyword", keyword_txt)
         self.current_pointer = self.gsubkey[self.gsubkeyloop]
-        self.gsubkey[self.gsubkeyloop].text = keyword_txt
         self.print_output()
 
 
     def p_driver(self, driver_txt):
         """Create a Driver tag"""
-        ldriver = ET.SubElement(self.current_pointer, "Driver")
-        ldriver.text = driver_txt
+        self.sub_element(self.current_pointer, "Driver", driver_txt)
         self.print_output()
 
     def p_step(self, step_txt=""):
         """Create a step tag"""
         self.gsteploop = self.gsteploop+1
-        self.gstep[self.gsteploop] = ET.SubElement(self.gkeyword[self.gkeywordloop], "Step")
+        self.gstep[self.gsteploop] = self.sub_element(self.gkeyword[self.gkeywordloop], "Step",
+                                                      step_txt)
         self.current_pointer = self.gstep[self.gsteploop]
-        self.gstep[self.gsteploop].text = step_txt
         self.print_output()
 
     def update_kw_resultfile(self, kw_resultfile):
         """ adds step_num attribute to the step tag in
         test case result xml file"""
-        rf = ET.SubElement(self.gkeyword[self.gkeywordloop], "Resultfile")
-        rf.text = str(kw_resultfile)
+        self.sub_element(self.gkeyword[self.gkeywordloop], "Resultfile", str(kw_resultfile))
 
     def update_step_num(self, step_num):
         """ adds step_num attribute to the step tag in
         test case result xml file"""
-        self.gkeyword[self.gkeywordloop].set('step_num', str(step_num))
-        self.gstep[self.gsteploop].set('step_num', str(step_num))
+        self.set_attribute(self.gkeyword[self.gkeywordloop], 'step_num', str(step_num))
+        self.set_attribute(self.gstep[self.gsteploop], 'step_num', str(step_num))
 
     def update_arguments(self, args):
         """Update the arguments supplied to the keyword """
-        arguements = ET.SubElement(self.gkeyword[self.gkeywordloop], "Arguments")
+        arguements = self.sub_element(self.gkeyword[self.gkeywordloop], "Arguments")
         for arg in args:
-            ET.SubElement(arguements, "argument", name=str(arg), value=str(args[arg]))
+            self.sub_element(arguements, "argument", name=str(arg), value=str(args[arg]))
 
     def p_substep(self, substep_txt=""):
         """Create a substep tag"""
         self.gsubsteploop = self.gsubsteploop+1
-        self.gsubstep[self.gsubsteploop] = ET.SubElement(self.gstep[\
-                                                self.gsteploop], "SubStep")
+        self.gsubstep[self.gsubsteploop] = self.sub_element(self.gstep[\
+                                                self.gsteploop], "SubStep", substep_txt)
         self.current_pointer = self.gsubstep[self.gsubsteploop]
-        self.gsubstep[self.gsubsteploop].text = substep_txt
         print_info("\n<< Substep >>")
         print_info("Keyword Description: {0}".format(substep_txt))
 
@@ -209,8 +437,7 @@ class TestcaseUtils(object):
                 p_type(txt)
         # self.current_pointer may be None,which is not a intended behavior
         if write_locn is not None:
-            doc = ET.SubElement(write_locn, "Note")
-            doc.text = txt
+            self.sub_element(write_locn, "Note", txt)
             self.print_output()
         # The below elif is bypasses the else below. As we may want to
         # print items (banners) before we have a handle to write
@@ -251,8 +478,7 @@ class TestcaseUtils(object):
         :Returns:
             None
         """
-        doc = ET.SubElement(self.current_pointer, str(name))
-        doc.text = str(txt)
+        self.sub_element(self.current_pointer, str(name), str(txt))
         self.print_output()
 
     def p_status(self, status, level):
@@ -265,8 +491,7 @@ class TestcaseUtils(object):
             levelobj = self.gkeyword[self.gkeywordloop]
         elif level.upper() == "SUBKEYWORD":
             levelobj = self.gsubkey[self.gsubkeyloop]
-        status_tag = ET.SubElement(levelobj, "%sStatus" % level)
-        status_tag.text = status
+        self.sub_element(levelobj, "%sStatus" % level, status)
         self.print_output()
 
     def p_pass(self, level, text=""):
@@ -310,9 +535,9 @@ class TestcaseUtils(object):
 
         self.grequirementloop = self.grequirementloop + 1
         print_info("Requirement: %s " % requirement_id)
-        self.grequirement[self.grequirementloop] = ET.SubElement(self.current_pointer,
-                                                                 "Requirement")
-        self.grequirement[self.grequirementloop].text = requirement_id
+        self.grequirement[self.grequirementloop] = self.sub_element(self.current_pointer,
+                                                                    "Requirement",
+                                                                    requirement_id)
         self.print_output()
 
     @staticmethod
@@ -458,36 +683,46 @@ class TestcaseUtils(object):
 
     def p_test_result(self, text, resultfile):
         """Report test result"""
+        self.write_result()
         result = self.convert_logic(text)
-        self.root = self.xml_utils().getRoot(resultfile)
+        self.root = self.xml_utils().getRoot(resultfile, cache=False)
         tcstatus = ET.SubElement(self.root, "TCstatus")
         tcstatus.text = result
         tree = ET.ElementTree(self.root)
         tree.write(resultfile)
 
     def append_result_files(self, dst_resultfile, kw_resultfile_list, dst_root='Testcase', childtag='Keyword'):
-        """Append kw/system result files into a testcase result file"""
+        """Append kw/system result files into a testcase result file.
+        The files are streamed one element at a time into a new result file
+        which replaces the testcase result file """
+        self.write_result()
+        xml_utils = self.xml_utils()
         try:
-            finstring = ''
+            kw_files = []
             for kw_file in kw_resultfile_list:
                 if kw_file is not None and kw_file is not False:
-                    tree = self.xml_utils().get_tree_from_file(kw_file)
-                    self.root = tree.getroot()
-                    for child in self.root:
-                        if child.tag == childtag:
-                            finstring = finstring+self.xml_utils().convert_element_to_string(child)
-            tc_string = ' '
-            if self.file_utils().fileExists(dst_resultfile):
-                tc_tree = ET.parse(dst_resultfile)
-                tc_root = tc_tree.getroot()
-                for tc_child in tc_root:
-                    tc_string = tc_string+self.xml_utils().convert_element_to_string(tc_child)
-            finalresult = '\n'.join(['<{0}>'.format(dst_root), tc_string + finstring,
-                                     '</{0}>'.format(dst_root)])
-            with open(dst_resultfile, 'w') as resultfile:
-                resultfile.write(finalresult)
-                resultfile.flush()
-                resultfile.close()
+                    if not self.file_utils().fileExists(kw_file) and \
+                       ResultEventLog.recover_resultfile(kw_file):
+                        print_warning("result file {0} is rebuilt from its "
+                                      "event log".format(kw_file))
+                    if not self.file_utils().fileExists(kw_file):
+                        print_error("xml file does not exist in provided path "
+                                    "{0}".format(kw_file))
+                        continue
+                    kw_files.append(kw_file)
+            new_resultfile = dst_resultfile + ".new"
+            with open(new_resultfile, 'w') as resultfile:
+                resultfile.write('<{0}>\n '.format(dst_root))
+                if self.file_utils().fileExists(dst_resultfile):
+                    for tc_child in xml_utils.iterparse_elements(dst_resultfile, depth=1):
+                        resultfile.write(xml_utils.convert_element_to_string(tc_child))
+                for kw_file in kw_files:
+                    for child in xml_utils.iterparse_elements(kw_file, childtag, depth=1):
+                        resultfile.write(xml_utils.convert_element_to_string(child))
+                resultfile.write('\n</{0}>'.format(dst_root))
+            if os.path.exists(dst_resultfile):
+                os.remove(dst_resultfile)
+            os.rename(new_resultfile, dst_resultfile)
         except Exception, err:
             print_info('unexpected error: {0}'.format(str(err)))
 
@@ -531,7 +766,8 @@ class TestcaseUtils(object):
 
     def add_defects_to_resultfile(self, resultfile, defect_id):
         """Adds defects if any to the testcase result file """
-        self.root = self.xml_utils().getRoot(resultfile)
+        self.write_result()
+        self.root = self.xml_utils().getRoot(resultfile, cache=False)
         defects = ET.SubElement(self.root, "Defect")
         defects.text = defect_id
         tree = ET.ElementTree(self.root)
@@ -646,3 +882,30 @@ class TestcaseUtils(object):
         else:
             step_list = steps.findall('step')
             return step_list
+
+
+class ThreadTestcaseUtils(object):
+    """Gives every registered keyword thread its own TestcaseUtils object,
+    threads that are not registered share the main TestcaseUtils object """
+
+    def __init__(self):
+        """Constructor """
+        self.main_tcobj = TestcaseUtils()
+        self.thread_data = threading.local()
+
+    def register_thread(self):
+        """Creates the TestcaseUtils object of the current thread """
+        self.thread_data.tcobj = TestcaseUtils()
+
+    def unregister_thread(self):
+        """Writes the result of the current thread and
+        removes the TestcaseUtils object of the thread """
+        tcobj = getattr(self.thread_data, 'tcobj', None)
+        if tcobj is not None:
+            tcobj.write_result()
+        self.thread_data.tcobj = None
+
+    def __getattr__(self, name):
+        """Delegate to the TestcaseUtils object of the current thread """
+        tcobj = getattr(self.thread_data, 'tcobj', None) or self.main_tcobj
+        return getattr(tcobj, name)
@@ -281,6 +281,30 @@ class WarriorCliClass(object):
                             help=" :run until fail:  set testcase exec_type to run until fails,"\
                             "Enter value for number of attempts after tag")
 
+        parser.add_argument('-maxworkers', type=int, default=0,
+                            help=" :max workers: maximum number of processes executing "\
+                            "testcases/keywords at a time in parallel execution, "\
+                            "overrides the max_workers value in the testsuite file")
+
+        parser.add_argument('-warmworkers', action='store_true', default=False,
+                            help=" :warm workers: execute parallel testcases/keywords "\
+                            "in long lived worker processes which are started once "\
+                            "after the drivers and testcases are loaded and are kept "\
+                            "for the whole run")
+
+        parser.add_argument('-sessionpool', action='store_true', default=False,
+                            help=" :session pool: return ssh/telnet sessions to a pool "\
+                            "on disconnect and reuse them in the next connect to the same "\
+                            "system with the same credentials, within a testsuite")
+
+        parser.add_argument('-poolsize', type=int, default=0,
+                            help=" :pool size: maximum number of idle sessions in the "\
+                            "session pool, default 32")
+
+        parser.add_argument('-poolidle', type=int, default=0,
+                            help=" :pool idle: seconds after which an idle session of the "\
+                            "session pool is closed, default 600")
+
         # defects parsing
         parser.add_argument('-ad', action='store_true', default=False,
                             help=":autodefects:  "\
@@ -23,6 +23,7 @@ as it will lead to cyclic imports.
 """
 import sys
 import re
+import threading
 
 
 def print_main(message, print_type, color_message=None, *kwargs):
@@ -47,6 +48,7 @@ class RedirectPrint(object):
     from stdout to correct console log files """
     def __init__(self, console_logfile):
         """Constructor"""
+        self.thread_data = threading.local()
         self.get_file(console_logfile)
 #         self.write_to_stdout = write_to_stdout
         self.stdout = sys.stdout
@@ -59,16 +61,27 @@ class RedirectPrint(object):
         if self.file is not None:
             sys.stdout = self
 
+    def get_thread_file(self, console_logfile):
+        """Redirect the prints of the current thread to its own
+        console logfile, None stops the redirection of the thread
+        """
+        self.thread_data.file = console_logfile
+        if console_logfile is not None:
+            sys.stdout = self
+
     def write(self, data):
         """
         - Writes data to the sys.stdout
         - Removes the ansii escape chars before writing to file
         """
         self.stdout.write(data)
+        logfile = getattr(self.thread_data, 'file', None) or self.file
+        if logfile is None:
+            return
         ansi_escape = re.compile(r'\x1b[^m]*m')
         data = ansi_escape.sub('', data)
-        self.file.write(data)
-        self.file.flush()
+        logfile.write(data)
+        logfile.flush()
 
     def isatty(self):
         """Check if sys.stdout is a tty """
@@ -0,0 +1,219 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+#!/usr/bin/python
+
+"""This is custom dag keyword driver which is used to execute the keywords
+of a testcase where data_type = custom, runtype = parallel_keywords and
+the steps declare the steps they depend on using the depends_on attribute
+e.g. <step Driver="cli_driver" Keyword="connect" depends_on="1, 2">
+
+A step is started as soon as all the steps it depends on are completed,
+at most max_workers (-maxworkers) steps are executed at a time. As in
+custom_threaded_kw_driver every step is executed in a thread of the
+testcase process on its own view of the data_repository, the values added
+to the view by a completed step (including the sessions) are merged back
+into the data_repository of the testcase, hence a step sees the results
+and the sessions of the steps it depends on."""
+
+import Queue
+import threading
+import traceback
+from collections import OrderedDict
+
+
+import WarriorCore.testcase_steps_execution as testcase_steps_execution
+import WarriorCore.step_driver as step_driver
+import Framework.Utils as Utils
+from Framework.Utils.print_Utils import print_debug, print_error, print_info
+from WarriorCore.multiprocessing_utils import get_max_workers
+from WarriorCore.custom_threaded_kw_driver import get_step_view, get_view_updates, \
+execute_in_kw_thread
+from Framework.Utils import testcase_Utils
+
+def has_step_dependencies(step_list):
+    """Returns True if any step of the testcase has the depends_on attribute """
+    return any([record.depends_on for record in step_list.records])
+
+def get_step_dependencies(step_list):
+    """Returns a dict of step number (position of the step in the testcase)
+    and the set of step numbers it depends on.
+    Raises ValueError for invalid step numbers or cyclic dependencies """
+    records = step_list.records
+    dependencies = OrderedDict()
+    for record_num, record in enumerate(records, start=1):
+        depends_on = set()
+        for value in record.depends_on:
+            try:
+                dependency = int(value)
+            except ValueError:
+                raise ValueError("invalid depends_on value '{0}' in step {1}, "
+                                 "expected step numbers".format(value, record_num))
+            if dependency < 1 or dependency > len(records) or dependency == record_num:
+                raise ValueError("depends_on of step {0} refers to an invalid step "
+                                 "'{1}'".format(record_num, value))
+            depends_on.add(dependency)
+        dependencies[record_num] = depends_on
+
+    completed = set()
+    remaining = dict(dependencies)
+    while remaining:
+        ready = [num for num, depends_on in remaining.items() if depends_on <= completed]
+        if not ready:
+            raise ValueError("cyclic depends_on found between the steps "
+                             "{0}".format(sorted(remaining)))
+        for num in ready:
+            completed.add(num)
+            del remaining[num]
+    return dependencies
+
+def execute_step_node(step_list, record_num, step_repository, system_name, output_q):
+    """Executes all the attempts (runmode/retry) of a step in the current
+    thread and puts (step number, step status list, keyword resultfile list,
+    step impact list, keyword record, data_repository updates) in the queue """
+    record = step_list.records[record_num-1]
+    initial_repository = step_repository.copy()
+    try:
+        step_status_list, kw_resultfile_list, step_impact_list = execute_in_kw_thread(
+            'step-{0}_{1}_consoleLogs'.format(record_num, record.keyword), step_repository,
+            testcase_steps_execution.main, step_list, step_repository, system_name,
+            step_range=step_list.record_ranges[record_num-1])
+    except Exception:
+        print_error('unexpected error {0}'.format(traceback.format_exc()))
+        step_status_list, kw_resultfile_list, step_impact_list = ["ERROR"], [], [record.impact]
+    output_q.put((record_num, step_status_list, kw_resultfile_list, step_impact_list,
+                  step_repository['wt_junit_object'].get_keyword_record(
+                      step_repository['wt_tc_timestamp']),
+                  get_view_updates(initial_repository, step_repository)))
+
+def is_abort_required(record, step_status_list, default_error_action):
+    """Returns True if the last attempt of the step failed and
+    the onError action of the step is abort/abort_as_error """
+    if not step_status_list:
+        return False
+    step_status = step_status_list[-1]
+    if step_status is False or str(step_status).upper() in ["ERROR", "EXCEPTION"]:
+        onerror_action = record.onerror_action or default_error_action
+        return str(onerror_action).upper() in ['ABORT', 'ABORT_AS_ERROR']
+    return False
+
+def execute_custom_dag(step_list, data_repository, tc_status, system_name):
+    """Takes a compiled testcase plan as input and executes its steps in
+    parallel respecting the depends_on of the steps """
+
+    dependencies = get_step_dependencies(step_list)
+    default_error_action = data_repository['wt_def_on_error_action']
+    max_workers = get_max_workers(data_repository) or len(dependencies)
+    output_q = Queue.Queue()
+    lock = threading.Lock()
+    pending = dependencies
+    completed = set()
+    running = {}
+    results = {}
+    abort = False
+
+    def merge_result(result):
+        """Merges the result of a step thread into the testcase """
+        record_num, step_status_list, kw_resultfile_list, step_impact_list, \
+            kw_record, updates = result
+        with lock:
+            data_repository.update(updates)
+            if kw_record is not None:
+                data_repository['wt_junit_object'].add_keyword_record(kw_record)
+        if kw_record is not None:
+            step_driver.flush_junit(data_repository['wt_junit_object'], data_repository)
+        results[record_num] = (step_status_list, kw_resultfile_list, step_impact_list)
+        completed.add(record_num)
+        return is_abort_required(step_list.records[record_num-1], step_status_list,
+                                 default_error_action)
+
+    while (pending and not abort) or running:
+        if not abort:
+            for record_num in [num for num, depends_on in pending.items()
+                               if depends_on <= completed]:
+                if len(running) >= max_workers:
+                    break
+                del pending[record_num]
+                start, stop = step_list.record_ranges[record_num-1]
+                if start == stop:
+                    # step without any attempt (retry count 0)
+                    results[record_num] = ([], [], [])
+                    completed.add(record_num)
+                    continue
+                print_debug("starting step {0}".format(record_num))
+                thread = threading.Thread(target=execute_step_node,
+                                          args=(step_list, record_num,
+                                                get_step_view(data_repository, lock),
+                                                system_name, output_q))
+                thread.daemon = True
+                thread.start()
+                running[thread] = record_num
+        if not running:
+            continue
+
+        try:
+            abort = merge_result(output_q.get(timeout=0.1)) or abort
+        except Queue.Empty:
+            pass
+        for thread, record_num in running.items():
+            if thread.is_alive():
+                continue
+            thread.join()
+            del running[thread]
+            # the result may still be in the queue when the thread exits
+            while record_num not in results:
+                try:
+                    abort = merge_result(output_q.get(timeout=0.5)) or abort
+                except Queue.Empty:
+                    print_error("step {0} did not return any result".format(record_num))
+                    results[record_num] = (["ERROR"], [], [step_list.records[record_num-1].impact])
+                    completed.add(record_num)
+
+    if pending:
+        print_info("onError action is abort, the steps {0} will not be "
+                   "executed".format(pending.keys()))
+        for record_num in pending:
+            start, stop = step_list.record_ranges[record_num-1]
+            kw_resultfile_list = [testcase_steps_execution.report_skipped_step(
+                step_list[index], index+1, data_repository, system_name)
+                                  for index in range(start, stop)]
+            results[record_num] = ([], kw_resultfile_list, [])
+
+    step_status_list = []
+    kw_resultfile_list = []
+    step_impact_list = []
+    for record_num in sorted(results):
+        step_status_list.extend(results[record_num][0])
+        kw_resultfile_list.extend(results[record_num][1])
+        step_impact_list.extend(results[record_num][2])
+
+    tc_status = testcase_Utils.compute_status_using_impact(step_status_list, step_impact_list)
+
+    print_debug("Updating Testcase result file...")
+    Utils.testcase_Utils.append_result_files(data_repository['wt_resultfile'], kw_resultfile_list)
+
+    return tc_status
+
+def main(step_list, data_repository, tc_status, system_name=None):
+    """Executes the steps as per their depends_on
+    Computes and returns the testcase status"""
+    try:
+        testcase_status = execute_custom_dag(step_list, data_repository,
+                                             tc_status, system_name)
+    except ValueError as err:
+        testcase_status = "ERROR"
+        print_error(str(err))
+    except Exception:
+        testcase_status = False
+        print_error('unexpected error {0}'.format(traceback.format_exc()))
+    return testcase_status
@@ -23,21 +23,20 @@ from collections import OrderedDict
 
 import Framework.Utils as Utils
 from Framework.Utils.print_Utils import print_debug, print_error
-from WarriorCore.multiprocessing_utils import create_and_start_process_with_queue, \
-get_results_from_queue, update_tc_junit_resultfile
+from WarriorCore.multiprocessing_utils import execute_tasks
 from Framework.Utils import testcase_Utils
 
 def execute_custom_parallel(step_list, data_repository, tc_status, system_name):
     """Takes a list of steps as input and executes them in parallel by
     creating separate process of step_driver for each of these steps """
 
-    jobs_list = []
+    args_list = []
     step_num = 0
     output_q = None
+    target_module = step_driver.main
 
     for step in step_list:
         step_num += 1
-        target_module = step_driver.main
         #args_list = [step, step_num, data_repository, system_name, True]
         args_dict = OrderedDict([("step", step),
                                   ("step_num", step_num),
@@ -48,30 +47,34 @@ def execute_custom_parallel(step_list, data_repository, tc_status, system_name):
                                   ])     
         
         
-        process, jobs_list, output_q = create_and_start_process_with_queue(target_module, args_dict,
-                                                                           jobs_list, output_q)
-    print_debug("process: {0}".format(process))
-    for job in jobs_list:
-        job.join()
+        args_list.append(args_dict)
 
-    result_list = get_results_from_queue(output_q)
+    def merge_result(result):
+        """Merges the keyword results of a step into the testcase junit
+        object as soon as the step completes """
+        if result[3] is not None:
+            data_repository['wt_junit_object'].add_keyword_record(result[3])
+            step_driver.flush_junit(data_repository['wt_junit_object'], data_repository)
+
+    def error_result(args_dict):
+        """Result of a step which could not report its own result """
+        return ('ERROR', None, args_dict["step"].impact.upper(), None)
+
+    result_list = execute_tasks(target_module, args_list, data_repository,
+                                warm_up=lambda: step_driver.preload_productdrivers(
+                                    [step.record for step in step_list]),
+                                on_result=merge_result, error_result=error_result)
 
     step_status_list = []
     kw_resultfile_list = []
     step_impact_list = []
-    tc_junit_list = []
     for result in result_list:
         step_status_list.append(result[0])
         kw_resultfile_list.append(result[1])
         step_impact_list.append(result[2])
-        tc_junit_list.append(result[3])
 
     tc_status = testcase_Utils.compute_status_using_impact(step_status_list, step_impact_list)
 
-    # parallel keywords generate multiple keyword junit result files
-    # each files log the result for one keyword and not intergrated
-    # update testcase junit result file with individual keyword result files
-    data_repository['wt_junit_object'] = update_tc_junit_resultfile(data_repository['wt_junit_object'], tc_junit_list, data_repository['wt_tc_timestamp'])
     print_debug("Updating Testcase result file...")
     Utils.testcase_Utils.append_result_files(data_repository['wt_resultfile'], kw_resultfile_list)
 
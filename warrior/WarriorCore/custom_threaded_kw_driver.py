@@ -0,0 +1,170 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+#!/usr/bin/python
+
+"""This is custom threaded keyword driver which is used to execute
+the keywords of a testcase in parallel threads where data_type = custom
+and runtype = parallel_threaded_keywords.
+
+Unlike custom_parallel_kw_driver the steps are executed in threads of the
+testcase process, hence the sessions (pexpect/paramiko) stored in the
+data_repository by earlier steps can be used by the keywords. Every step
+works on its own view (copy) of the data_repository taken when the step
+starts, the values added to the view by the step are merged back into the
+data_repository of the testcase when the step completes. Every step has its
+own keyword result file and console logfile."""
+
+import threading
+import traceback
+import Queue
+
+
+import WarriorCore.step_driver as step_driver
+import Framework.Utils as Utils
+from Framework.Utils.print_Utils import print_debug, print_error
+from WarriorCore.multiprocessing_utils import get_max_workers, get_keyword_junit_object
+from Framework.Utils import testcase_Utils
+
+# values set by step_driver for the step being executed, these
+# are not merged back into the data_repository of the testcase
+STEP_KEYS = ['step_num', 'wt_driver', 'wt_plugin', 'wt_keyword', 'wt_step_impact',
+             'wt_step_context', 'wt_step_description', 'wt_junit_object']
+
+def get_step_view(data_repository, lock):
+    """Returns the view of the data_repository for a step, the junit
+    object of the view collects only the keyword result of the step """
+    with lock:
+        step_repository = data_repository.copy()
+        step_repository['wt_junit_object'] = get_keyword_junit_object(
+            data_repository['wt_junit_object'], data_repository['wt_tc_timestamp'])
+    return step_repository
+
+def get_view_updates(initial_repository, step_repository):
+    """Returns the values added or replaced in the view by a step """
+    updates = {}
+    for key, value in step_repository.items():
+        if key in STEP_KEYS:
+            continue
+        if key in initial_repository and initial_repository[key] is value:
+            continue
+        updates[key] = value
+    return updates
+
+def execute_in_kw_thread(console_name, step_repository, target, *args, **kwargs):
+    """Calls target in the current thread with its own result file,
+    console logfile and testcase result object, returns its result """
+    Utils.config_Utils.register_kw_thread()
+    testcase_Utils.TCOBJ.register_thread()
+    try:
+        step_driver.get_step_console_log(step_repository['wt_filename'],
+                                         step_repository['wt_logsdir'],
+                                         console_name)
+        result = target(*args, **kwargs)
+    finally:
+        testcase_Utils.TCOBJ.unregister_thread()
+        Utils.config_Utils.unregister_kw_thread()
+    return result
+
+def execute_step_in_thread(step, step_num, step_repository, system_name):
+    """Executes a step in the current thread with its own result file,
+    console logfile and testcase result object """
+    return execute_in_kw_thread('step-{0}_{1}_consoleLogs'.format(step_num, step.keyword),
+                                step_repository, step_driver.main, step, step_num,
+                                step_repository, system_name)
+
+def keyword_thread(task_q, data_repository, system_name, lock, output_q):
+    """Executes the steps from the task queue till it is empty and puts
+    (step number, status, keyword resultfile, impact, keyword record,
+    data_repository updates) in the output queue for every step """
+    while True:
+        try:
+            step_num, step = task_q.get_nowait()
+        except Queue.Empty:
+            break
+        step_repository = get_step_view(data_repository, lock)
+        initial_repository = step_repository.copy()
+        try:
+            result = execute_step_in_thread(step, step_num, step_repository, system_name)
+        except Exception:
+            print_error('unexpected error {0}'.format(traceback.format_exc()))
+            result = False, None, step.impact, False
+        output_q.put((step_num, result[0], result[1], result[2],
+                      step_repository['wt_junit_object'].get_keyword_record(
+                          step_repository['wt_tc_timestamp']),
+                      get_view_updates(initial_repository, step_repository)))
+
+def execute_custom_threaded(step_list, data_repository, tc_status, system_name):
+    """Takes a list of steps as input and executes them in parallel
+    threads, at most max_workers (-maxworkers) steps at a time """
+
+    task_q = Queue.Queue()
+    output_q = Queue.Queue()
+    lock = threading.Lock()
+    step_num = 0
+    for step in step_list:
+        step_num += 1
+        task_q.put((step_num, step))
+    max_workers = get_max_workers(data_repository) or step_num
+    thread_list = []
+    for _ in range(min(max_workers, step_num)):
+        thread = threading.Thread(target=keyword_thread,
+                                  args=(task_q, data_repository, system_name, lock, output_q))
+        thread.daemon = True
+        thread.start()
+        thread_list.append(thread)
+
+    results = {}
+    while len(results) < step_num:
+        try:
+            result = output_q.get(timeout=0.1)
+        except Queue.Empty:
+            if not any([thread.is_alive() for thread in thread_list]) and output_q.empty():
+                break
+            continue
+        step_num_done, _, _, _, kw_record, updates = result
+        with lock:
+            data_repository.update(updates)
+            if kw_record is not None:
+                data_repository['wt_junit_object'].add_keyword_record(kw_record)
+        step_driver.flush_junit(data_repository['wt_junit_object'], data_repository)
+        results[step_num_done] = result[1:4]
+
+    step_status_list = []
+    kw_resultfile_list = []
+    step_impact_list = []
+    for step_num_done in sorted(results):
+        step_status, kw_resultfile, step_impact = results[step_num_done]
+        step_status_list.append(step_status)
+        kw_resultfile_list.append(kw_resultfile)
+        step_impact_list.append(step_impact.upper())
+
+    tc_status = testcase_Utils.compute_status_using_impact(step_status_list, step_impact_list)
+
+    print_debug("Updating Testcase result file...")
+    Utils.testcase_Utils.append_result_files(data_repository['wt_resultfile'],
+                                             [kw_resultfile for kw_resultfile in kw_resultfile_list
+                                              if kw_resultfile])
+
+    return tc_status
+
+def main(step_list, data_repository, tc_status, system_name=None):
+    """Executes the list of steps in parallel threads
+    Computes and returns the testcase status"""
+    try:
+        testcase_status = execute_custom_threaded(step_list, data_repository,
+                                                  tc_status, system_name)
+    except Exception:
+        testcase_status = False
+        print_error('unexpected error {0}'.format(traceback.format_exc()))
+    return testcase_status
@@ -43,7 +43,7 @@ class DefectsDriver(object):
         tc_name = result_filename.split("_results")[0]
         #tc_name = file_Utils.getNameOnly(os.path.basename(self.xmlfile))
         #tree = xml_Utils.get_tree_from_file(self.xmlfile)
-        tree = xml_Utils.getRoot(self.xmlfile)
+        tree = xml_Utils.getRoot(self.xmlfile, cache=False)
         data_filepath = tree.find("Datafile").text
         failed = 0
         #get_tc_details_frm_resultxml
@@ -21,20 +21,20 @@ from collections import OrderedDict
 
 
 import WarriorCore.testcase_steps_execution as testcase_steps_execution
+import WarriorCore.step_driver as step_driver
 import Framework.Utils as Utils
 from Framework.Utils.print_Utils import print_debug, print_error
-from WarriorCore.multiprocessing_utils import create_and_start_process_with_queue, \
-get_results_from_queue, update_tc_junit_resultfile
+from WarriorCore.multiprocessing_utils import execute_tasks
 from Framework.Utils import testcase_Utils
 
 def execute_iterative_parallel(step_list, data_repository, tc_status, system_list):
     """Takes a list of steps as input and executes them in parallel by
     creating separate process of step_driver for each of these steps """
 
-    jobs_list = []
+    args_list = []
     output_q = None
+    target_module = testcase_steps_execution.main
     for system_name in system_list:
-        target_module = testcase_steps_execution.main
         #args_list = [step_list, data_repository, system_name, True]
         args_dict = OrderedDict([("step_list", step_list),
                                   ("data_repository", data_repository),
@@ -44,26 +44,33 @@ def execute_iterative_parallel(step_list, data_repository, tc_status, system_lis
                                   ]) 
 
 
-        process, jobs_list, output_q = create_and_start_process_with_queue(target_module, args_dict,
-                                                                           jobs_list, output_q)
+        args_list.append(args_dict)
 
-    print_debug("process: {0}".format(process))
-    for job in jobs_list:
-        job.join()
+    def merge_result(result):
+        """Merges the keyword results of a system into the testcase junit
+        object as soon as the steps of the system complete """
+        if result[4] is not None:
+            data_repository['wt_junit_object'].add_keyword_record(result[4])
+            step_driver.flush_junit(data_repository['wt_junit_object'], data_repository)
 
-    result_list = get_results_from_queue(output_q)
+    def error_result(args_dict):
+        """Result of a system whose steps could not report their result """
+        return (['ERROR'], [], args_dict["system_name"], ['IMPACT'], None)
+
+    result_list = execute_tasks(target_module, args_list, data_repository,
+                                warm_up=lambda: step_driver.preload_productdrivers(
+                                    [step.record for step in step_list]),
+                                on_result=merge_result, error_result=error_result)
 
     system_status_list = []
     system_resultfile_list = []
     step_impact_list = []
-    tc_junit_list = []
 
     for result in result_list:
         step_status_list = result[0]
         kw_resultfile_list = result[1]
         system_name = result[2]
         step_impact_list = result[3]
-        tc_junit_list.append(result[4])
         system_status = testcase_Utils.compute_status_using_impact(step_status_list,
                                                                    step_impact_list)
         system_resultfile = testcase_Utils.compute_system_resultfile(kw_resultfile_list,
@@ -73,10 +80,6 @@ def execute_iterative_parallel(step_list, data_repository, tc_status, system_lis
         system_resultfile_list.append(system_resultfile)
 
     tc_status = Utils.testcase_Utils.compute_status_without_impact(system_status_list)
-    # parallel keywords generate multiple keyword junit result files
-    # each files log the result for one keyword and not intergrated
-    # update testcase junit result file with individual keyword result files
-    data_repository['wt_junit_object'] = update_tc_junit_resultfile(data_repository['wt_junit_object'], tc_junit_list, data_repository['wt_tc_timestamp'])
     print_debug("Updating Testcase result file...")
     Utils.testcase_Utils.append_result_files(data_repository['wt_resultfile'], system_resultfile_list)
 
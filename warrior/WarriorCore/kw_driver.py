@@ -15,9 +15,8 @@ limitations under the License.
 information about the keywords, executes the keywords and reports the
 keyword status back to the product driver """
 from Framework import Utils
-from WarriorCore.Classes.kw_driver_class import ModuleOperations, KeywordOperations,\
+from WarriorCore.Classes.kw_driver_class import KeywordRegistry, KeywordOperations,\
 skip_and_report_status
-from Framework.Utils.print_Utils import print_info
 
 def get_package_name_list(package_list):
     """Take a list of package loaders and returns
@@ -44,39 +43,39 @@ def execute_keyword(keyword, data_repository, args_repository, package_list):
     
     package_name_list = get_package_name_list(package_list)
 
-    drv_obj = ModuleOperations(package_list, keyword)
-    if len(drv_obj.matching_method_list) == 1:
-        method_call = drv_obj.matching_method_list[0]
-        wdesc = Utils.testcase_Utils.get_wdesc_string(method_call)
-        Utils.testcase_Utils.pStep(wdesc)
-        kw_obj = KeywordOperations(keyword, method_call, args_repository, data_repository)
+    matching_method_list, matching_function_list = KeywordRegistry.lookup(package_list,
+                                                                          keyword)
+    if len(matching_method_list) == 1:
+        kw_info = matching_method_list[0]
+        Utils.testcase_Utils.pStep(kw_info.wdesc)
+        kw_obj = KeywordOperations(keyword, kw_info.exec_obj, args_repository,
+                                   data_repository, kw_info)
         #print_info('found a class method(%s) corresponding to keyword(%s)'%(method_call, keyword))
         return kw_obj.execute_method_for_keyword()
 
     # if function not found in package skip current step and report status to Warrior
-    elif len(drv_obj.matching_method_list) == 0:
-        if len(drv_obj.matching_function_list) == 0:
+    elif len(matching_method_list) == 0:
+        if len(matching_function_list) == 0:
             msg = "could not find any function/class method corresponding to "\
             "keyword '{0}' in package(s) '{1}'".format(keyword, package_name_list)
             Utils.testcase_Utils.pStep()
             return skip_and_report_status(data_repository, msg)
 
-        elif len(drv_obj.matching_function_list) == 1:
-            function_call = drv_obj.matching_function_list[0]
-            wdesc = Utils.testcase_Utils.get_wdesc_string(function_call)
-            Utils.testcase_Utils.pStep(wdesc)
-            kw_obj = KeywordOperations(keyword, function_call, args_repository, data_repository)
+        elif len(matching_function_list) == 1:
+            kw_info = matching_function_list[0]
+            Utils.testcase_Utils.pStep(kw_info.wdesc)
+            kw_obj = KeywordOperations(keyword, kw_info.exec_obj, args_repository,
+                                       data_repository, kw_info)
             return kw_obj.execute_function_for_keyword()
 
-        elif len(drv_obj.matching_function_list) > 1:
-            print_info("more than one function with same name {0} "\
-                       "exists in the  packages '{1}' ".format(keyword, package_name_list))
+        elif len(matching_function_list) > 1:
+            msg = "more than one function with same name {0} "\
+            "exists in the  packages '{1}' ".format(keyword, package_name_list)
             Utils.testcase_Utils.pStep()
             return skip_and_report_status(data_repository, msg)
 
-    elif len(drv_obj.matching_method_list) > 1:
+    elif len(matching_method_list) > 1:
         msg = "More than one method with same name '{0}' "\
         "exists in the classes of package '{1}' ".format(keyword, package_name_list)
         Utils.testcase_Utils.pStep()
         return skip_and_report_status(data_repository, msg)
-
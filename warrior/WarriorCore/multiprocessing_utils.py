@@ -11,9 +11,16 @@ See the License for the specific language governing permissions and
 limitations under the License.
 '''
 
+import os
+import copy
+import atexit
+import cPickle as pickle
 import multiprocessing
 import time
-
+import traceback
+import Queue
+from collections import deque, OrderedDict
+from Framework.Utils.print_Utils import print_error, print_debug
 
 
 
@@ -50,6 +57,301 @@ def create_and_start_process_with_queue(target_module, args_dict, jobs_list, out
 
     return process, jobs_list, output_q
 
+def execute_in_worker_pool(target_module, args_dict_list, max_workers=None, p_name='',
+                           on_result=None):
+    """Executes the target module once for every args_dict in args_dict_list
+    with at most max_workers processes running at any time.
+
+    The args_dicts are fed from a work queue, a new process is started
+    as soon as a running one completes and the results put in the output
+    queue by the processes are collected as they arrive, so the number of
+    processes and the size of the queue stay bounded for any number of tasks.
+
+    Arguments:
+    1. target_module = module for which the processes have to be started
+    2. args_dict_list = list of OrderedDict of arguments, one per process
+    3. max_workers = maximum number of processes running at a time,
+                     when not provided one process is started per args_dict
+    4. p_name = name of the processes
+    5. on_result = function called with every result as soon as it is received
+
+    Returns:
+    1. result_list = list of results from the output queue in completion order
+    """
+    work_q = deque(args_dict_list)
+    if not max_workers or max_workers < 1:
+        max_workers = max(len(work_q), 1)
+    output_q = multiprocessing.Queue()
+    running = []
+    result_list = []
+
+    while work_q or running:
+        while work_q and len(running) < max_workers:
+            _, running, output_q = create_and_start_process_with_queue(target_module,
+                                                                       work_q.popleft(),
+                                                                       running, output_q,
+                                                                       p_name)
+        try:
+            add_result(result_list, output_q.get(timeout=0.1), on_result)
+        except Queue.Empty:
+            pass
+        for process in running[:]:
+            if not process.is_alive():
+                process.join()
+                running.remove(process)
+
+    # all processes are completed, collect the results still in the queue
+    while True:
+        try:
+            add_result(result_list, output_q.get(timeout=0.5), on_result)
+        except Queue.Empty:
+            break
+    return result_list
+
+def add_result(result_list, result, on_result=None):
+    """Adds a result received from a process to the result list and
+    passes it to on_result, errors of on_result must not stop the
+    collection of the results """
+    result_list.append(result)
+    if on_result is not None:
+        try:
+            on_result(result)
+        except Exception:
+            print_error('unexpected error {0}'.format(traceback.format_exc()))
+
+class TaskOutput(object):
+    """Output queue given to the target module of a warm worker task,
+    the results put by the target module are tagged with the task number """
+
+    def __init__(self, output_q, task):
+        """Constructor """
+        self.output_q = output_q
+        self.task = task
+
+    def put(self, result):
+        """Puts a result of the task in the output queue of the workers """
+        self.output_q.put((self.task, WarmWorkerPool.TASK_RESULT, result))
+
+
+class WarmWorkerPool(object):
+    """Long lived worker processes kept for the whole run, see
+    execute_in_warm_workers.
+
+    Every worker has its own task queue carrying (task number, target
+    module, pickled args_dict), a task is given only to an idle worker so
+    the task of a worker which dies is known. The workers put
+    (task number, message type, value) in the shared output queue, the
+    result of the task and then TASK_DONE when the target module returns,
+    a task which put no result is reported by the error_result function
+    of the caller """
+
+    TASK_RESULT = "result"
+    TASK_DONE = "done"
+
+    def __init__(self, p_name=''):
+        """Constructor, the workers are started by execute """
+        self.p_name = p_name
+        self.pid = os.getpid()
+        self.output_q = multiprocessing.Queue()
+        # worker process: task queue of the worker
+        self.task_queues = OrderedDict()
+        self.task_count = 0
+
+    def start_workers(self, size, warm_up=None):
+        """Starts workers till there are size workers, warm_up is called
+        before forking them when new workers are needed """
+        if len(self.task_queues) >= size:
+            return
+        if warm_up is not None:
+            warm_up()
+        print_debug("starting {0} warm workers".format(size - len(self.task_queues)))
+        while len(self.task_queues) < size:
+            task_q = multiprocessing.Queue()
+            worker = multiprocessing.Process(name=self.p_name, target=warm_worker,
+                                             args=(task_q, self.output_q))
+            worker.start()
+            self.task_queues[worker] = task_q
+
+    def remove_dead_workers(self):
+        """Removes the workers which died from the pool and returns them """
+        dead = [worker for worker in self.task_queues if not worker.is_alive()]
+        for worker in dead:
+            worker.join()
+            del self.task_queues[worker]
+            print_error("warm worker {0} exited with code {1}".format(
+                worker.pid, worker.exitcode))
+        return dead
+
+    def execute(self, target_module, payloads, max_workers, warm_up=None,
+                on_result=None, error_result=None):
+        """Executes the target module with the args_dict of every pickled
+        payload in at most max_workers workers at a time and returns the
+        results in completion order, error_result(position) returns the
+        result of the task at that position of payloads when the task did
+        not report its result """
+        self.start_workers(max_workers, warm_up)
+        waiting = deque(enumerate(payloads))
+        # worker process: task number, of the busy workers
+        busy = {}
+        # task number: (position in payloads, worker process, result received)
+        tasks = {}
+        result_list = []
+        while waiting or busy:
+            for worker, task_q in self.task_queues.items():
+                if not waiting or len(busy) >= max_workers:
+                    break
+                if worker not in busy:
+                    position, payload = waiting.popleft()
+                    self.task_count += 1
+                    busy[worker] = self.task_count
+                    tasks[self.task_count] = (position, worker, False)
+                    task_q.put((self.task_count, target_module, payload))
+            try:
+                task, message, value = self.output_q.get(timeout=0.1)
+            except Queue.Empty:
+                size = len(self.task_queues)
+                for worker in self.remove_dead_workers():
+                    if worker in busy:
+                        self.end_task(tasks.pop(busy.pop(worker)), result_list,
+                                      on_result, error_result)
+                self.start_workers(size)
+                continue
+            if task not in tasks:
+                continue
+            position, worker, _ = tasks[task]
+            if message == self.TASK_RESULT:
+                tasks[task] = (position, worker, True)
+                add_result(result_list, value, on_result)
+            elif message == self.TASK_DONE:
+                busy.pop(worker, None)
+                self.end_task(tasks.pop(task), result_list, on_result, error_result)
+        return result_list
+
+    @staticmethod
+    def end_task(task_state, result_list, on_result, error_result):
+        """Adds the result given by error_result for a task which ended
+        without reporting its result """
+        position, _, reported = task_state
+        if not reported and error_result is not None:
+            add_result(result_list, error_result(position), on_result)
+
+    def stop(self):
+        """Stops the workers after their current task """
+        for task_q in self.task_queues.values():
+            task_q.put(None)
+        for worker in self.task_queues:
+            worker.join()
+        self.task_queues = OrderedDict()
+
+
+# warm worker pool of this process, see get_warm_worker_pool
+WARM_WORKER_POOL = None
+
+
+def warm_worker(task_q, output_q):
+    """Long lived worker process of a WarmWorkerPool, executes the target
+    module of every task received from its task queue till it receives None.
+    A task whose target module raises an exception does not stop the
+    worker, the traceback is logged and the task ends without result """
+    while True:
+        message = task_q.get()
+        if message is None:
+            break
+        task, target_module, payload = message
+        try:
+            args_dict = pickle.loads(payload)
+            args_dict["output_q"] = TaskOutput(output_q, task)
+            target_module(*args_dict.values())
+        except Exception:
+            print_error('unexpected error {0}'.format(traceback.format_exc()))
+        output_q.put((task, WarmWorkerPool.TASK_DONE, None))
+    # the workers started by the tasks of this worker
+    stop_warm_workers()
+
+def get_warm_worker_pool():
+    """Returns the warm worker pool of this process, the pool inherited
+    from the parent process by a worker is not used by the worker """
+    global WARM_WORKER_POOL
+    if WARM_WORKER_POOL is None or WARM_WORKER_POOL.pid != os.getpid():
+        WARM_WORKER_POOL = WarmWorkerPool()
+    return WARM_WORKER_POOL
+
+@atexit.register
+def stop_warm_workers():
+    """Stops the warm workers started by this process, called at the end
+    of the run and at exit """
+    global WARM_WORKER_POOL
+    if WARM_WORKER_POOL is not None and WARM_WORKER_POOL.pid == os.getpid():
+        WARM_WORKER_POOL.stop()
+    WARM_WORKER_POOL = None
+
+def execute_in_warm_workers(target_module, args_dict_list, max_workers=None,
+                            warm_up=None, p_name='', on_result=None, error_result=None):
+    """Executes the target module once for every args_dict in args_dict_list
+    using the long lived worker processes of this process.
+
+    The workers are started by the first call and kept till the end of the
+    run (stop_warm_workers), hence the imports, keyword registry entries and
+    parsed files loaded by a worker are reused by all its tasks.
+    warm_up is called before the workers are forked, what it loads is
+    inherited by every worker.
+    Every task gets a fresh copy of its args_dict, which is pickled, the
+    args_dicts which cannot be pickled (e.g. sessions in the data_repository)
+    are executed in one process per args_dict as by execute_in_worker_pool.
+
+    Arguments:
+    1. target_module = module to be executed for every args_dict
+    2. args_dict_list = list of OrderedDict of arguments, one per task
+    3. max_workers = number of worker processes,
+                     when not provided one worker is started per args_dict
+    4. warm_up = function called before forking the workers
+    5. p_name = name of the worker processes
+    6. on_result = function called with every result as soon as it is received
+    7. error_result = function returning the result of a task (from its
+                      args_dict) which did not report its own result
+
+    Returns:
+    1. result_list = list of results from the output queue in completion order
+    """
+    try:
+        payloads = [pickle.dumps(args_dict, pickle.HIGHEST_PROTOCOL)
+                    for args_dict in args_dict_list]
+    except Exception as exception:
+        print_debug("warm workers not used, the arguments cannot be pickled: "
+                    "{0}".format(exception))
+        return execute_in_worker_pool(target_module, args_dict_list, max_workers,
+                                      p_name, on_result)
+    if not max_workers or max_workers < 1:
+        max_workers = len(args_dict_list)
+    max_workers = max(min(max_workers, len(args_dict_list)), 1)
+    pool = get_warm_worker_pool()
+    pool.p_name = p_name
+    return pool.execute(target_module, payloads, max_workers, warm_up, on_result,
+                        (lambda position: error_result(args_dict_list[position]))
+                        if error_result is not None else None)
+
+def execute_tasks(target_module, args_dict_list, data_repository, max_workers=None,
+                  warm_up=None, on_result=None, error_result=None):
+    """Executes the target module for every args_dict in args_dict_list in
+    parallel, using warm workers when requested in the command line
+    (-warmworkers) else one process per args_dict.
+    on_result is called with every result as soon as it is received,
+    error_result returns the result of a task which ended in a warm worker
+    without reporting its result """
+    max_workers = get_max_workers(data_repository, max_workers)
+    if data_repository.get('ow_warm_workers'):
+        return execute_in_warm_workers(target_module, args_dict_list, max_workers,
+                                       warm_up, on_result=on_result,
+                                       error_result=error_result)
+    return execute_in_worker_pool(target_module, args_dict_list, max_workers,
+                                  on_result=on_result)
+
+def get_max_workers(data_repository, max_workers=None):
+    """Returns the maximum number of worker processes for a parallel execution,
+    the value provided in the command line (-maxworkers) overrides the value
+    provided in the xml file """
+    return data_repository.get('ow_max_workers') or max_workers
+
 def get_results_from_queue(queue):
     """Get the result form the provided multiprocessing queue object """
     result_list = []
@@ -72,6 +374,24 @@ def update_ts_junit_resultfile(ts_junit_obj, tc_junit_list):
             ts_junit_obj.attrib = update_attribute(ts_junit_obj.root.find('testsuite').attrib, tc.attrib)
     return ts_junit_obj
 
+def update_pj_junit_resultfile(pj_junit_obj, ts_junit_list):
+    """loop through ts_junit object and attach testsuite result to project
+    Arguments:
+    1. pj_junit_obj = target project
+    2. ts_junit_list = list of testsuite junit objects
+    """
+    keys = ["tests", "suites", "errors", "failures", "skipped", "passes"]
+    for ts_junit_obj in ts_junit_list:
+        for ts in ts_junit_obj.root.findall('testsuite'):
+            # append testsuite result to project
+            pj_junit_obj.root.append(ts)
+        # update the count in project attribute
+        for key in keys:
+            if key in pj_junit_obj.root.attrib and key in ts_junit_obj.root.attrib:
+                pj_junit_obj.root.set(key, str(int(pj_junit_obj.root.get(key)) +
+                                               int(ts_junit_obj.root.get(key))))
+    return pj_junit_obj
+
 def update_attribute(dict1, dict2):
     """merge the count for 2 attribute dictionary
     Arguments:
@@ -84,6 +404,27 @@ def update_attribute(dict1, dict2):
             dict1[key] = str(int(dict1[key])+int(dict2[key]))
     return dict1
 
+def get_keyword_junit_object(tc_junit_obj, tc_timestamp):
+    """Returns a copy of the testcase junit object without keyword results
+    and counts, for a process whose keyword results are merged back into
+    the testcase junit object using update_tc_junit_resultfile
+    Arguments:
+    1. tc_junit_obj = testcase junit object
+    2. tc_timestamp = target testcase timestamp
+    """
+    kw_junit_obj = copy.deepcopy(tc_junit_obj)
+    keys = ["errors", "failures", "skipped", "passes", "exceptions", "keywords"]
+    for tc in kw_junit_obj.root.iter('testcase'):
+        if tc.get('timestamp') == tc_timestamp:
+            properties = tc.find('properties')
+            for result in properties.findall('property'):
+                if result.get('type') == "keyword":
+                    properties.remove(result)
+            for key in keys:
+                if key in tc.attrib:
+                    tc.set(key, "0")
+    return kw_junit_obj
+
 def update_tc_junit_resultfile(tc_junit_obj, kw_junit_list, tc_timestamp):
     """loop through kw_junit object and attach keyword result to testcase 
     Arguments:
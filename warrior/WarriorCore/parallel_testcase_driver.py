@@ -24,29 +24,70 @@ from collections import OrderedDict
 import testcase_driver
 import Framework.Utils as Utils
 from Framework.Utils.print_Utils import print_error, print_debug
-from WarriorCore.multiprocessing_utils import create_and_start_process_with_queue, \
-get_results_from_queue, update_ts_junit_resultfile
-from WarriorCore import testsuite_utils
-
-
+from WarriorCore.multiprocessing_utils import execute_tasks, get_max_workers
+from WarriorCore import testsuite_utils, step_driver
+
+
+
+
+def preload_testcases(tc_args_list):
+    """Compiles the testcases, preloads the product drivers of their steps
+    and parses their datafile, testdata and varconfig files in the xml
+    cache before the warm workers are started """
+    for tc_args_dict in tc_args_list:
+        tc_path = tc_args_dict["tc_path"]
+        try:
+            step_list = testcase_driver.get_steps_list(tc_path)
+            step_driver.preload_productdrivers(step_list.records)
+            preload_data_files(tc_path, tc_args_dict["data_repository"])
+        except Exception:
+            # the error is reported when the testcase is executed
+            print_debug("unable to preload testcase '{0}'".format(tc_path))
+
+
+def preload_data_files(tc_path, data_repository):
+    """Parses the datafile of the testcase and the testdata and varconfig
+    files of its systems in the xml cache, the datafile is taken from the
+    command line, the testsuite or the testcase as by the testcase driver """
+    datafile = data_repository.get('ow_datafile') or data_repository.get(tc_path) or \
+               data_repository.get('suite_data_file')
+    if not datafile:
+        datafile = Utils.xml_Utils.getChildTextbyParentTag(tc_path, 'Details',
+                                                           'InputDataFile')
+        if not datafile or str(datafile).strip().upper() in ["", "DEFAULT", "NO_DATA"]:
+            return
+        datafile = Utils.file_Utils.getAbsPath(str(datafile).strip(),
+                                               os.path.dirname(tc_path))
+    if not os.path.isfile(datafile):
+        return
+    root = Utils.xml_Utils.get_cached_root(datafile)
+    for system in root.iter('system'):
+        for tag in ['testdata', 'var_config_file', 'variable_config']:
+            filename = system.get(tag) or system.findtext(tag)
+            if filename and filename.strip().endswith(".xml"):
+                filename = Utils.file_Utils.getAbsPath(filename.strip(),
+                                                       os.path.dirname(datafile))
+                if os.path.isfile(filename):
+                    Utils.xml_Utils.get_cached_root(filename)
 
 
 def execute_parallel_testcases(testcase_list, suite_repository,
                                data_repository, from_project, tc_parallel=True,
                                auto_defects=False, iter_ts_sys=None):
     """Takes a list of testcase as input and executes them in parallel by
-    creating separate process of testcase_driver for each of these testcase """
+    creating separate process of testcase_driver for each of these testcase,
+    at most max_workers (suite <Details> or -maxworkers) processes run at a time """
 
-    jobs_list = []
+    tc_args_list = []
     output_q = None
     suite = suite_repository['suite_name']
     testsuite_filepath = suite_repository['testsuite_filepath']
     suite_error_action = suite_repository['def_on_error_action']
     jiraproj = data_repository["jiraproj"]
     testsuite_dir = os.path.dirname(testsuite_filepath)
+    target_module = testcase_driver.main
 
-    for testcase in testcase_list:
-        target_module = testcase_driver.main
+    for tc_cntr, testcase in enumerate(testcase_list, 1):
         tc_rel_path = testsuite_utils.get_path_from_xmlfile(testcase)
         if tc_rel_path is not None:
             tc_path = Utils.file_Utils.getAbsPath(tc_rel_path, testsuite_dir)
@@ -63,7 +104,11 @@ def execute_parallel_testcases(testcase_list, suite_repository,
             data_repository[tc_path] = data_file
 
         data_repository['wt_tc_impact'] = tc_impact
-        
+        # the testcases are started later by the worker pool, hence each
+        # testcase gets its own copy of the testcase specific values
+        tc_data_repository = data_repository.copy()
+        tc_data_repository['wt_tc_cntr'] = tc_cntr
+
         # instead of using args_list, we need to use an ordered dict
         # for tc args because intially q will be none and 
         # we need to cange it after creating a new q
@@ -71,7 +116,7 @@ def execute_parallel_testcases(testcase_list, suite_repository,
         # before calling the testcase driver main function.
         
         tc_args_dict = OrderedDict([("tc_path", tc_path),
-                                  ("data_repository", data_repository),
+                                  ("data_repository", tc_data_repository),
                                   ("tc_context", tc_context),
                                   ("tc_runtype", tc_runtype),
                                   ("tc_parallel", tc_parallel),
@@ -83,32 +128,47 @@ def execute_parallel_testcases(testcase_list, suite_repository,
                                   ("jiraproj", jiraproj)                                  
                                   ])
 
-        process, jobs_list, output_q = create_and_start_process_with_queue(target_module, tc_args_dict, jobs_list, output_q)
-
-    print_debug("process: {0}".format(process))
-    for job in jobs_list:
-        job.join()
-
-    result_list = get_results_from_queue(output_q)
+        tc_args_list.append(tc_args_dict)
+
+    max_workers = get_max_workers(data_repository, suite_repository.get('suite_max_workers'))
+    print_debug("max_workers: {0}".format(max_workers))
+    ts_junit_object = data_repository['wt_junit_object']
+    results_dir = data_repository['wp_results_execdir'] if from_project \
+                  else data_repository['wt_results_execdir']
+
+    def merge_result(result):
+        """Merges the result record of a testcase into the testsuite junit
+        object as soon as the testcase completes, the junit file is written
+        by flush_junit so the results of the completed testcases are visible
+        while the others are running, the html results are generated once
+        by the testsuite driver """
+        if result[4] is not None:
+            ts_junit_object.add_testcase_record(result[4])
+            ts_junit_object.flush_junit(results_dir)
+
+    def error_result(tc_args_dict):
+        """Result of a testcase which could not report its own result,
+        in the format of the results put by the testcase driver """
+        tc_data_repository = tc_args_dict["data_repository"]
+        return ('ERROR', str(tc_args_dict["tc_path"]), tc_data_repository['wt_tc_impact'], '0',
+                testcase_driver.get_error_testcase_record(tc_args_dict["tc_path"],
+                                                          tc_data_repository))
+
+    result_list = execute_tasks(target_module, tc_args_list, data_repository, max_workers,
+                                warm_up=lambda: preload_testcases(tc_args_list),
+                                on_result=merge_result, error_result=error_result)
 
     tc_status_list = []
     tc_name_list = []
     tc_impact_list = []
     tc_duration_list = []
-    # Get the junit object of each testcase, extract the information from it and combine with testsuite junit object
-    tc_junit_list = []
 
     for result in result_list:
         tc_status_list.append(result[0])
         tc_name_list.append(result[1])
         tc_impact_list.append(result[2])
         tc_duration_list.append(result[3])
-        tc_junit_list.append(result[4])
-    
-    # parallel testcases generate multiple testcase junit result files
-    # each files log the result for one testcase and not intergrated
-    # update testsuite junit result file with individual testcase result files
-    data_repository['wt_junit_object'] = update_ts_junit_resultfile(data_repository['wt_junit_object'], tc_junit_list)
+
     testsuite_status = Utils.testcase_Utils.compute_status_using_impact(tc_status_list,
                                                                         tc_impact_list)
     return testsuite_status
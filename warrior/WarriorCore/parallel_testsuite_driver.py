@@ -0,0 +1,245 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+#!/usr/bin/python
+
+"""This is parallel testsuite driver which is used to execute
+the testsuites of a project in parallel """
+
+import os
+import traceback
+from collections import OrderedDict
+
+import WarriorCore.testsuite_driver as testsuite_driver
+import WarriorCore.onerror_driver as onerror_driver
+import exec_type_driver
+import Framework.Utils as Utils
+from Framework.Utils.print_Utils import print_info, print_error, print_debug
+from WarriorCore.Classes import junit_class
+from WarriorCore.multiprocessing_utils import execute_in_worker_pool, get_max_workers, \
+update_pj_junit_resultfile
+from WarriorCore import testsuite_utils
+
+
+def execute_testsuite_with_queue(testsuite_path, suite_cntr, data_repository,
+                                 auto_defects, jiraproj, res_startdir,
+                                 logs_startdir, ts_onError_action, output_q):
+    """Executes a testsuite in a worker process and puts the result
+    (suite number, status, suite timestamp, junit object) in the output queue """
+    try:
+        testsuite_status = testsuite_driver.main(testsuite_path,
+                                                 data_repository=data_repository,
+                                                 from_project=True,
+                                                 auto_defects=auto_defects,
+                                                 jiraproj=jiraproj,
+                                                 res_startdir=res_startdir,
+                                                 logs_startdir=logs_startdir,
+                                                 ts_onError_action=ts_onError_action)[0]
+    except Exception:
+        print_error('unexpected error {0}'.format(traceback.format_exc()))
+        testsuite_status = "ERROR"
+    output_q.put((suite_cntr, testsuite_status, data_repository.get('wt_ts_timestamp'),
+                  data_repository['wt_junit_object']))
+
+
+def get_error_junit_object(project_name, suite_cntr, testsuite_path, msg):
+    """Returns a junit object reporting a testsuite without result (missing
+    testsuite file, worker which died before reporting) as an error """
+    testsuite_nameonly = Utils.file_Utils.getNameOnly(
+        Utils.file_Utils.getFileName(testsuite_path))
+    timestamp = str(Utils.datetime_utils.get_current_timestamp())
+    ts_junit_object = junit_class.Junit(
+        filename="{0}_{1}_{2}".format(project_name, suite_cntr, testsuite_nameonly),
+        timestamp=timestamp, name=project_name)
+    ts_junit_object.create_testsuite(location=os.path.dirname(testsuite_path),
+                                     name=testsuite_nameonly, timestamp=timestamp,
+                                     suite_location=testsuite_path, status="ERROR",
+                                     errors="1")
+    ts_junit_object.get_ts_with_timestamp(timestamp).append(
+        junit_class.Junit.create_element("error", message=msg))
+    ts_junit_object.root.set("suites", "1")
+    ts_junit_object.root.set("errors", "1")
+    return ts_junit_object
+
+
+def get_goto_results(testsuite_list, result_dict, project_error_action, project_error_value):
+    """Applies the onError action of the failed testsuites in the order of the project file.
+
+    All testsuites are executed concurrently, hence onError actions cannot skip
+    testsuites. Instead they decide which results count for the project status.
+    abort: the results of the testsuites after the failed one are ignored.
+    goto: the results of the testsuites up to the goto testsuite are ignored.
+    A goto to an earlier testsuite is treated as next.
+
+    Returns a dict of suite number and onError string of the testsuites whose
+    results are considered for the project status """
+    considered = OrderedDict()
+    goto_testsuite = False
+    for suite_cntr, testsuite in enumerate(testsuite_list, start=1):
+        if suite_cntr not in result_dict:
+            continue
+        if goto_testsuite and goto_testsuite != str(suite_cntr):
+            continue
+        goto_testsuite = False
+        goto_testsuite_num = onerror_driver.main(testsuite, project_error_action,
+                                                 project_error_value)
+        if goto_testsuite_num is False:
+            onerror = "Next"
+        elif goto_testsuite_num == "ABORT":
+            onerror = "Abort"
+        else:
+            onerror = "Goto:" + str(goto_testsuite_num)
+        considered[suite_cntr] = onerror
+
+        testsuite_status = result_dict[suite_cntr][0]
+        if testsuite_status is False or testsuite_status == "ERROR" \
+        or testsuite_status == "EXCEPTION":
+            if goto_testsuite_num in ['ABORT', 'ABORT_AS_ERROR']:
+                break
+            elif goto_testsuite_num and int(goto_testsuite_num) > suite_cntr:
+                goto_testsuite = goto_testsuite_num
+    return considered
+
+
+def execute_parallel_testsuites(testsuite_list, project_repository, data_repository,
+                                auto_defects=False, jiraproj=None):
+    """Takes a list of testsuites as input and executes them in parallel by
+    creating separate process of testsuite_driver for each of these testsuites,
+    at most max_workers (project <Details> or -maxworkers) processes run at a time.
+
+    Returns the project status and the list of testsuite status and impact """
+    import project_driver
+
+    project_name = project_repository['project_name']
+    project_filepath = project_repository['project_filepath']
+    project_dir = os.path.dirname(project_filepath)
+    project_start_time = project_repository['project_start_time']
+    wp_results_execdir = project_repository['wp_results_execdir']
+    wp_logs_execdir = project_repository['wp_logs_execdir']
+    project_error_action = project_repository['def_on_error_action']
+    project_error_value = project_repository['def_on_error_value']
+    pj_junit_object = data_repository['wt_junit_object']
+    impact_dict = {"IMPACT":"Impact", "NOIMPACT":"No Impact"}
+    string_status = {"TRUE":"PASS", "FALSE":"FAIL", "ERROR":"ERROR", "SKIP":"SKIP"}
+    target_module = execute_testsuite_with_queue
+    ts_args_list = []
+    impact_list = []
+    missing_dict = {}
+    launched = {}
+    output_q = None
+
+    for suite_cntr, testsuite in enumerate(testsuite_list, start=1):
+        testsuite_rel_path = testsuite_utils.get_path_from_xmlfile(testsuite)
+        if testsuite_rel_path is not None:
+            testsuite_path = Utils.file_Utils.getAbsPath(testsuite_rel_path, project_dir)
+        else:
+            testsuite_path = str(testsuite_rel_path)
+        action, _ = exec_type_driver.main(testsuite)
+        testsuite_impact = Utils.testcase_Utils.get_impact_from_xmlfile(testsuite)
+        impact_list.append(testsuite_impact)
+        testsuite_nameonly = Utils.file_Utils.getNameOnly(
+            Utils.file_Utils.getFileName(testsuite_path))
+        ts_onError_action = Utils.xml_Utils.get_attributevalue_from_directchildnode(
+            testsuite, 'onError', 'action')
+        ts_onError_action = ts_onError_action if ts_onError_action else project_error_action
+
+        if not Utils.file_Utils.fileExists(testsuite_path):
+            msg = print_error("Test suite does not exist in provided path: "
+                              "{0}".format(testsuite_path))
+            missing_dict[suite_cntr] = ("ERROR", None, get_error_junit_object(
+                project_name, suite_cntr, testsuite_path, msg))
+            continue
+        if action is not True:
+            print_info('skipped testsuite: {0} '.format(testsuite_path))
+            project_driver.report_skipped_testsuite(pj_junit_object, testsuite_path,
+                                                    testsuite_impact, wp_results_execdir)
+            data_repository['testsuite_%d_result'%suite_cntr] = "SKIP"
+            continue
+
+        # every testsuite reports to its own junit object, these are
+        # merged into the project junit object once the testsuites complete
+        ts_data_repository = data_repository.copy()
+        ts_data_repository['wt_junit_object'] = junit_class.Junit(
+            filename="{0}_{1}_{2}".format(project_name, suite_cntr, testsuite_nameonly),
+            timestamp=project_start_time, name=project_name)
+        print_debug("<<<< Starting execution of Test suite: {0}>>>>".format(testsuite_path))
+        launched[suite_cntr] = testsuite_path
+        ts_args_list.append(OrderedDict([("testsuite_path", testsuite_path),
+                                         ("suite_cntr", suite_cntr),
+                                         ("data_repository", ts_data_repository),
+                                         ("auto_defects", auto_defects),
+                                         ("jiraproj", jiraproj),
+                                         ("res_startdir", wp_results_execdir),
+                                         ("logs_startdir", wp_logs_execdir),
+                                         ("ts_onError_action", ts_onError_action),
+                                         ("output_q", output_q)]))
+
+    max_workers = get_max_workers(data_repository, project_repository.get('max_workers'))
+    print_debug("max_workers: {0}".format(max_workers))
+    result_list = execute_in_worker_pool(target_module, ts_args_list, max_workers)
+    result_dict = dict((result[0], result[1:]) for result in result_list)
+    for suite_cntr, testsuite_path in launched.items():
+        if suite_cntr not in result_dict:
+            msg = print_error("No result received for testsuite {0}, its worker "
+                              "ended before reporting".format(testsuite_path))
+            missing_dict[suite_cntr] = ("ERROR", None, get_error_junit_object(
+                project_name, suite_cntr, testsuite_path, msg))
+    result_dict.update(missing_dict)
+
+    considered = get_goto_results(testsuite_list, result_dict, project_error_action,
+                                  project_error_value)
+    project_status = True
+    ts_status_list = []
+    ts_impact_list = []
+    for suite_cntr in sorted(result_dict):
+        testsuite_status, _, ts_junit_object = result_dict[suite_cntr]
+        testsuite_impact = impact_list[suite_cntr-1]
+        onerror = considered.get(suite_cntr, "N/A")
+        if ts_junit_object is not None:
+            for testsuite in ts_junit_object.root.findall("testsuite"):
+                testsuite.set("impact", impact_dict.get(testsuite_impact.upper()))
+                testsuite.set("onerror", onerror)
+            update_pj_junit_resultfile(pj_junit_object, [ts_junit_object])
+
+        if str(testsuite_status).upper() in string_status.keys():
+            data_repository['testsuite_%d_result'%suite_cntr] = \
+                string_status[str(testsuite_status).upper()]
+        else:
+            print_error("unexpected testsuite status, default to exception")
+            data_repository['testsuite_%d_result'%suite_cntr] = "ERROR"
+
+        if suite_cntr in considered:
+            ts_status_list.append(testsuite_status)
+            ts_impact_list.append(testsuite_impact)
+            project_status = project_driver.compute_project_status(project_status,
+                                                                   testsuite_status,
+                                                                   testsuite_impact)
+        else:
+            print_info("onError action of an earlier testsuite excludes testsuite {0} "
+                       "from the project status".format(suite_cntr))
+
+    pj_junit_object.output_junit(wp_results_execdir, print_summary=False)
+    return project_status, ts_status_list, ts_impact_list
+
+
+def main(testsuite_list, project_repository, data_repository, auto_defects=False,
+         jiraproj=None):
+    """Executes the list of testsuites in parallel
+    Computes and returns the project status"""
+    try:
+        result = execute_parallel_testsuites(testsuite_list, project_repository,
+                                             data_repository, auto_defects, jiraproj)
+    except Exception:
+        result = False, [], []
+        print_error('unexpected error {0}'.format(traceback.format_exc()))
+    return result
@@ -27,7 +27,7 @@ import exec_type_driver
 import Framework.Utils as Utils
 from Framework.Utils.print_Utils import print_info, print_error, print_debug, print_warning
 from WarriorCore.Classes import execution_files_class, junit_class
-from WarriorCore import testsuite_utils
+from WarriorCore import testsuite_utils, parallel_testsuite_driver
 
 def get_project_details(project_filepath, res_startdir, logs_startdir, data_repository):
     """Gets all details of the Project from its xml file"""
@@ -35,6 +35,8 @@ def get_project_details(project_filepath, res_startdir, logs_startdir, data_repo
     project_repository = {}
     project_name = Utils.xml_Utils.getChildTextbyParentTag(project_filepath, 'Details', 'Name')
     project_title = Utils.xml_Utils.getChildTextbyParentTag(project_filepath, 'Details', 'Title')
+    project_exectype = get_project_exectype(project_filepath)
+    max_workers = testsuite_utils.get_max_workers_from_xmlfile(project_filepath)
     def_on_error_action = Utils.testcase_Utils.get_defonerror_fromxml_file(project_filepath)
     def_on_error_value = Utils.xml_Utils.getChildAttributebyParentTag(project_filepath,
                                                                       'Details',
@@ -80,6 +82,9 @@ def get_project_details(project_filepath, res_startdir, logs_startdir, data_repo
     project_repository['title'] = project_title
     project_repository['operating_system'] = operating_system
     project_repository['project_name'] = project_name
+    project_repository['project_filepath'] = project_filepath
+    project_repository['project_exectype'] = project_exectype
+    project_repository['max_workers'] = max_workers
     project_repository['def_on_error_action'] = def_on_error_action
     project_repository['def_on_error_value'] = def_on_error_value
     project_repository['project_execution_dir'] = project_execution_dir
@@ -93,6 +98,47 @@ def get_project_details(project_filepath, res_startdir, logs_startdir, data_repo
     return project_repository
 
 
+def get_project_exectype(project_filepath):
+    """Gets the exectype value for testsuites from the project.xml file """
+
+    exectype = Utils.xml_Utils.getChildAttributebyParentTag(project_filepath, 'Details',
+                                                            'type', 'exectype')
+    if exectype is None or exectype is False:
+        exectype = 'sequential_testsuites'
+    else:
+        exectype = exectype.strip()
+        supported_values = ['sequential_testsuites', 'parallel_testsuites']
+        if exectype.lower() not in supported_values:
+            print_warning("unsupported value '{0}' provided for exectype, supported values "
+                          "are '{1}', case-insensitive".format(exectype, supported_values))
+            print_info("Hence using default value for exectype which is 'sequential_testsuites'")
+            exectype = 'sequential_testsuites'
+    return exectype
+
+
+def report_skipped_testsuite(pj_junit_object, testsuite_path, testsuite_impact,
+                             wp_results_execdir):
+    """Reports a testsuite skipped by its execute condition to the project junit object """
+    impact_dict = {"IMPACT":"Impact", "NOIMPACT":"No Impact"}
+    testsuite_nameonly = Utils.file_Utils.getNameOnly(
+        Utils.file_Utils.getFileName(testsuite_path))
+    tmp_timestamp = str(Utils.datetime_utils.get_current_timestamp())
+    time.sleep(2)
+    pj_junit_object.create_testsuite(
+        location=os.path.dirname(testsuite_path),
+        name=testsuite_nameonly, timestamp=tmp_timestamp,
+        **pj_junit_object.init_arg())
+    pj_junit_object.update_attr("status", "SKIPPED", "ts", tmp_timestamp)
+    pj_junit_object.update_attr("skipped", "1", "pj", tmp_timestamp)
+    pj_junit_object.update_count("suites", "1", "pj", tmp_timestamp)
+    # pj_junit_object.add_testcase_message(tmp_timestamp, "skipped")
+    pj_junit_object.update_attr("impact", impact_dict.get(testsuite_impact.upper()),
+                                "ts", tmp_timestamp)
+    pj_junit_object.update_attr("onerror", "N/A", "ts", tmp_timestamp)
+    pj_junit_object.output_junit(wp_results_execdir,
+                                 print_summary=False)
+
+
 def get_testsuite_list(project_filepath):
     """Takes the location of any Project.xml file as input
     Returns a list of all the Testsuite elements present in the Project"""
@@ -157,6 +203,14 @@ def execute_project(project_filepath, auto_defects, jiraproj, res_startdir, logs
         pj_junit_object.add_jobid(data_repository["jobid"])
         del data_repository["jobid"]
     data_repository['wt_junit_object'] = pj_junit_object
+    project_repository['project_start_time'] = project_start_time
+
+    if project_repository['project_exectype'].upper() == 'PARALLEL_TESTSUITES':
+        print_info("Executing testsuites in parallel")
+        project_status, ts_status_list, ts_impact_list = parallel_testsuite_driver.main(
+            testsuite_list, project_repository, data_repository, auto_defects, jiraproj)
+        # all testsuites are already executed, skip the sequential execution
+        suite_cntr = len(testsuite_list)
 
     while suite_cntr < len(testsuite_list):
         testsuite = testsuite_list[suite_cntr]
@@ -211,22 +265,9 @@ def execute_project(project_filepath, auto_defects, jiraproj, res_startdir, logs
                 '<skipped message="{2}"/> </testsuite>'.format(testsuite_name,
                                                                project_start_time,
                                                                msg)
-                tmp_timestamp = str(Utils.datetime_utils.get_current_timestamp())
-                time.sleep(2)
-                pj_junit_object.create_testsuite(
-                    location=os.path.dirname(testsuite_path),
-                    name=testsuite_nameonly, timestamp=tmp_timestamp,
-                    **pj_junit_object.init_arg())
-                pj_junit_object.update_attr("status", "SKIPPED", "ts", tmp_timestamp)
-                pj_junit_object.update_attr("skipped", "1", "pj", tmp_timestamp)
-                pj_junit_object.update_count("suites", "1", "pj", tmp_timestamp)
+                report_skipped_testsuite(pj_junit_object, testsuite_path,
+                                         testsuite_impact, wp_results_execdir)
                 data_repository['testsuite_%d_result'%suite_cntr] = "SKIP"
-                # pj_junit_object.add_testcase_message(tmp_timestamp, "skipped")
-                pj_junit_object.update_attr("impact", impact_dict.get(testsuite_impact.upper()),
-                                            "ts", tmp_timestamp)
-                pj_junit_object.update_attr("onerror", "N/A", "ts", tmp_timestamp)
-                pj_junit_object.output_junit(wp_results_execdir,
-                                             print_summary=False)
                 continue
 
         else:
@@ -285,8 +326,9 @@ def execute_project(project_filepath, auto_defects, jiraproj, res_startdir, logs
                 suite_cntr = int(goto_testsuite)-1
                 goto_testsuite = False
 
-    project_status = Utils.testcase_Utils.compute_status_using_impact(ts_status_list,
-                                                                      ts_impact_list)
+    if project_repository['project_exectype'].upper() != 'PARALLEL_TESTSUITES':
+        project_status = Utils.testcase_Utils.compute_status_using_impact(ts_status_list,
+                                                                          ts_impact_list)
     print ("\n")
     project_end_time = Utils.datetime_utils.get_current_timestamp()
     print_info("[{0}] Project execution completed".format(project_end_time))
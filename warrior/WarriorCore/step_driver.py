@@ -14,39 +14,51 @@ limitations under the License.
 
 """step driver module"""
 import os
+import sys
 import time
 import traceback
 import exec_type_driver
-from WarriorCore.Classes.argument_datatype_class import ArgumentDatatype
+from WarriorCore.Classes.execution_plan_class import StepRecord, StepAttempt
+from WarriorCore.Classes.kw_driver_class import KeywordRegistry
 import Framework.Utils as Utils
 from Framework.Utils.print_Utils import print_info, print_debug, print_error, print_exception
 from WarriorCore import onerror_driver
 
 
-def get_arguments(step):
-    """ For a step in the testcase xml file gets the list of all
-    user supplied arguments and updates it to the args_repository
+def import_productdriver(driver_name, plugin_name):
+    """Imports and returns the product driver (or plugin driver) module """
+    if plugin_name is not None:
+        import_name = ".".join(["plugins", plugin_name, "bin",
+                                plugin_name[7:]+'_driver'])
+    else:
+        import_name = "ProductDrivers.{0}".format(driver_name)
+    return __import__(import_name, fromlist=[driver_name])
 
-    Arguments:
-    1. step = (xml element) an xml element with tag <step>
+
+def preload_productdrivers(step_records):
+    """Imports the product drivers of the steps and preloads their
+    keywords in the KeywordRegistry, worker processes forked after
+    this inherit the imported drivers, Actions packages and keywords
+
+    :Arguments:
+        1. step_records = list of StepRecord objects
     """
-    arg_datatype_object = ArgumentDatatype(None, None)
-    args_repository = {}
-    Arguments = step.find('Arguments')
-    if Arguments is not None and Arguments is not False:
-        for argument in Arguments.findall('argument'):
-            arg_name = argument.get('name')
-            if arg_name is not None:
-                arg_value = argument.get('value')
-                if arg_value is None or arg_value is False:
-                    arg_value = argument.text
-                if "${ENV." in arg_value:
-                    arg_value = Utils.data_Utils.sub_from_env_var(arg_value)
-                arg_datatype_object.arg_name = arg_name
-                arg_datatype_object.arg_value = arg_value
-                value = arg_datatype_object.convert_arg_to_datatype()
-                args_repository[arg_name] = value
-    return args_repository
+    keyword_list = []
+    driver_list = []
+    for record in step_records:
+        if record.keyword not in keyword_list:
+            keyword_list.append(record.keyword)
+        if (record.driver, record.plugin) in driver_list:
+            continue
+        driver_list.append((record.driver, record.plugin))
+        try:
+            import_productdriver(record.driver, record.plugin)
+        except Exception:
+            # the error is reported when the step is executed
+            print_debug("unable to preload driver '{0}'".format(record.driver))
+    for name, module in sys.modules.items():
+        if name.startswith("Actions.") and hasattr(module, "__path__"):
+            KeywordRegistry.preload(module, keyword_list)
 
 
 def send_keyword_to_productdriver(driver_name, plugin_name, keyword,
@@ -55,12 +67,7 @@ def send_keyword_to_productdriver(driver_name, plugin_name, keyword,
     step_num = data_repository["step_num"]
     # driver_call = 'ProductDrivers.{0}'.format(driver_name)
     try:
-        if plugin_name is not None:
-            import_name = ".".join(["plugins", plugin_name, "bin",
-                                    plugin_name[7:]+'_driver'])
-        else:
-            import_name = "ProductDrivers.{0}".format(driver_name)
-        driver_call = __import__(import_name, fromlist=[driver_name])
+        driver_call = import_productdriver(driver_name, plugin_name)
     except Exception:
         trcback = print_exception(Exception)
         data_repository['step-%s_status' % step_num] = 'ERROR'
@@ -107,22 +114,27 @@ def execute_step(step, step_num, data_repository, system_name, parallel, queue):
         - Reports the status of the keyword executed (obtained as return value from the respective Driver)
 
     Arguments:
-    1. step            = (xml element) xml element with tag <step> containing the details of the step to be executed like (Driver, Keyword, Arguments, Impact etc..)
+    1. step            = (StepAttempt) step of the compiled testcase plan containing the details of the step to be executed like (Driver, Keyword, Arguments, Impact etc..),
+                         an xml element with tag <step> is also accepted and compiled here
     2. step_num        = (int) step number being executed
     3. data_repository = (dict) data_repository of the testcase
     """
 
+    if not isinstance(step, StepAttempt):
+        step = StepAttempt(StepRecord(step))
     tc_junit_object = data_repository['wt_junit_object']
-    driver = step.get('Driver')
-    plugin = step.get('Plugin')
-    keyword = step.get('Keyword')
-    context = Utils.testcase_Utils.get_context_from_xmlfile(step)
-    step_impact = Utils.testcase_Utils.get_impact_from_xmlfile(step)
-    step_description = Utils.testcase_Utils.get_description_from_xmlfile(step)
+    driver = step.driver
+    plugin = step.plugin
+    keyword = step.keyword
+    context = step.context
+    step_impact = step.impact
+    step_description = step.description
 
     if parallel is True:
         step_console_log = get_step_console_log(data_repository['wt_filename'], data_repository['wt_logsdir'],
                                                 'step-{0}_{1}_consoleLogs'.format(step_num, keyword))
+        # only the keyword results added by this step are sent to the parent
+        kw_record_base = tc_junit_object.get_keyword_record(data_repository['wt_tc_timestamp'])
 
     data_repository['step_num'] = step_num
     data_repository['wt_driver'] = driver
@@ -140,23 +152,19 @@ def execute_step(step, step_num, data_repository, system_name, parallel, queue):
     print_info("step number: {0}".format(step_num))
     print_info("Teststep Description: {0}".format(step_description))
 
-    if step.find("runmode") is not None and step.find("runmode").get("attempt") is not None:
-        print_info("keyword attempt: {0}".format(
-            step.find("runmode").get("attempt")))
-    if step.find("retry") is not None and step.find("retry").get("attempt") is not None:
-        print_info("keyword attempt: {0}".format(
-            step.find("retry").get("attempt")))
+    if step.attempt is not None:
+        print_info("keyword attempt: {0}".format(step.attempt))
     kw_start_time = Utils.datetime_utils.get_current_timestamp()
     print_info("[{0}] Keyword execution starts".format(kw_start_time))
     # get argument list provided by user
-    args_repository = get_arguments(step)
+    args_repository = step.get_arguments()
     if system_name is not None:
         args_repository['system_name'] = system_name
     Utils.testcase_Utils.update_arguments(args_repository)
     Utils.testcase_Utils.update_kw_resultfile(kw_resultfile)
 
     exec_type_onerror = False
-    action, keyword_status = exec_type_driver.main(step)
+    action, keyword_status = exec_type_driver.main(step.element)
 
     if action is True:
         send_keyword_to_productdriver(driver, plugin, keyword,
@@ -177,12 +185,10 @@ def execute_step(step, step_num, data_repository, system_name, parallel, queue):
     print("\n")
     print_info("*** Keyword status ***")
     step_goto_value = False
-    step_onError_action = Utils.xml_Utils.get_attributevalue_from_directchildnode(
-        step, 'onError', 'action')
+    step_onError_action = step.onerror_action
     if step_onError_action is not False:
         if step_onError_action.upper() == 'GOTO':
-            step_goto_value = Utils.xml_Utils.get_attributevalue_from_directchildnode(
-                step, 'onError', 'value')
+            step_goto_value = step.onerror_value
     testcase_error_action = data_repository['wt_def_on_error_action']
     step_onError_action = step_onError_action if step_onError_action else testcase_error_action
     if step_onError_action.upper() == "GOTO" and step_goto_value == False:
@@ -235,43 +241,32 @@ def execute_step(step, step_num, data_repository, system_name, parallel, queue):
                        keyword_status, kw_start_time, kw_duration,
                        kw_resultfile, impact, onerror)
 
-    # Get the type of the file being executed by Warrior: Case/Suite/Project
-    war_file_type = data_repository.get('war_file_type')
-    if war_file_type == "Case":
-        # Create and replace existing Case junit file for each step
-        tc_junit_object.output_junit(data_repository['wt_resultsdir'],
-                                     print_summary=False)
-    elif war_file_type == "Suite":
-        # Create and replace existing Suite junit file for each step
-        tc_junit_object.output_junit(data_repository['wt_results_execdir'],
-                                     print_summary=False)
-    elif war_file_type == "Project":
-        # Create and replace existing Project junit file for each step
-        tc_junit_object.output_junit(data_repository['wp_results_execdir'],
-                                     print_summary=False)
+    Utils.testcase_Utils.write_result()
+    if parallel is True:
+        # put result into multiprocessing queue and later retrieve in
+        # corresponding driver, the parent merges the keyword record
+        # into its junit object and writes the junit file
+        queue.put((keyword_status, kw_resultfile, step_impact.upper(),
+                   tc_junit_object.get_keyword_record(tc_timestamp, since=kw_record_base)))
+    else:
+        if not Utils.config_Utils.is_kw_thread():
+            # keyword threads report to a copy of the junit object
+            # which is merged and written by the threaded driver
+            flush_junit(tc_junit_object, data_repository)
+        return keyword_status, kw_resultfile, step_impact, exec_type_onerror
 
-    # Get the type of the file being executed by Warrior: Case/Suite/Project
+
+def flush_junit(tc_junit_object, data_repository):
+    """Writes the junit file of the Case/Suite/Project being executed as
+    per the flush policy of the junit object, the html results are
+    generated at the end of the testcase """
     war_file_type = data_repository.get('war_file_type')
     if war_file_type == "Case":
-        # Create and replace existing Case junit file for each step
-        tc_junit_object.output_junit(data_repository['wt_resultsdir'],
-                                     print_summary=False)
+        tc_junit_object.flush_junit(data_repository['wt_resultsdir'])
     elif war_file_type == "Suite":
-        # Create and replace existing Suite junit file for each step
-        tc_junit_object.output_junit(data_repository['wt_results_execdir'],
-                                     print_summary=False)
+        tc_junit_object.flush_junit(data_repository['wt_results_execdir'])
     elif war_file_type == "Project":
-        # Create and replace existing Project junit file for each step
-        tc_junit_object.output_junit(data_repository['wp_results_execdir'],
-                                     print_summary=False)
-
-    if parallel is True:
-        # put result into multiprocessing queue and later retrieve in
-        # corresponding driver
-        queue.put((keyword_status, kw_resultfile,
-                   step_impact.upper(), tc_junit_object))
-    else:
-        return keyword_status, kw_resultfile, step_impact, exec_type_onerror
+        tc_junit_object.flush_junit(data_repository['wp_results_execdir'])
 
 
 def add_keyword_result(tc_junit_object, tc_timestamp, step_num, keyword,
@@ -20,16 +20,18 @@ import sys
 import os
 import time
 import shutil
-import copy
 from WarriorCore.defects_driver import DefectsDriver
-from WarriorCore import custom_sequential_kw_driver, custom_parallel_kw_driver
+from WarriorCore import custom_sequential_kw_driver, custom_parallel_kw_driver,\
+custom_dag_kw_driver, custom_threaded_kw_driver
 from WarriorCore import iterative_sequential_kw_driver, iterative_parallel_kw_driver,\
-common_execution_utils, framework_detail
-from WarriorCore.Classes import execution_files_class, junit_class, hybrid_driver_class
+framework_detail
+from WarriorCore.Classes import execution_files_class, junit_class, hybrid_driver_class,\
+execution_plan_class
 import Framework.Utils as Utils
 from Framework.Utils.testcase_Utils import convertLogic
 from Framework.Utils.print_Utils import print_notype, print_info,print_warning, print_error, print_debug, print_exception
 import Framework.Utils.email_utils as email
+from Framework.ClassUtils.WNetwork.loging import LogCollector
 
 def get_testcase_details(testcase_filepath, data_repository, jiraproj):
     """Gets all the details of the Testcase
@@ -202,44 +204,14 @@ def junit_requirements(testcase_filepath, tc_junit_object, timestamp):
     
 def get_steps_list(testcase_filepath):
     """Takes the location of any Testcase xml file as input
-    Returns a list of all the step elements present in the Testcase
+    Returns the compiled execution plan (TestcasePlan) of the Testcase,
+    the plan is a sequence of all the steps to be executed, steps with
+    runmode/retry are repeated as per their runmode/retry values
 
     :Arguments:
         1. testcase_filepath    = full path of the Testcase xml file
     """
-    step_list = []
-    root = Utils.xml_Utils.getRoot(testcase_filepath)   
-    Steps = root.find('Steps')
-    if Steps is None:
-        print_warning("Case: '{}' has no Steps/Keywords "
-                      "to be executed".format(testcase_filepath))
-    else:
-        step_list = []
-        new_step_list = Steps.findall('step')
-        #execute step multiple times
-        for index, step in enumerate(new_step_list):
-            runmode, value = common_execution_utils.get_runmode_from_xmlfile(step)
-            retry_type, _, _, retry_value, _ = common_execution_utils.get_retry_from_xmlfile(step)
-            if runmode is not None and value > 0:
-                go_next = len(step_list) + value + 1
-                for i in range(0, value):
-                    copy_step = copy.deepcopy(step)
-                    copy_step.find("runmode").set("value", go_next)
-                    copy_step.find("runmode").set("attempt", i+1)
-                    step_list.append(copy_step)
-            if retry_type is not None and retry_value > 0:
-                go_next = len(step_list) + retry_value + 1
-                if runmode is not None:
-                    get_runmode = step.find('runmode')
-                    step.remove(get_runmode)
-                for i in range(0, retry_value):
-                    copy_step = copy.deepcopy(step)
-                    copy_step.find("retry").set("count", go_next)
-                    copy_step.find("retry").set("attempt", i+1)
-                    step_list.append(copy_step)
-            if retry_type is None and runmode is None:
-                step_list.append(step)
-        return step_list
+    return execution_plan_class.TestcasePlan.from_testcase(testcase_filepath)
 
 def compute_testcase_status(step_status, tc_status):
     """Compute the status of the testcase based on the step_status and the impact value of the step
@@ -266,9 +238,10 @@ def report_testcase_result(tc_status, data_repository):
     print_info("TESTCASE:{0}  STATUS:{1}".format(data_repository['wt_name'], convertLogic(tc_status)))
     print("\n")
     Utils.testcase_Utils.pTestResult(tc_status, data_repository['wt_resultfile'])
-    root = Utils.xml_Utils.getRoot(data_repository['wt_resultfile'])
+    # the result file of a long testcase can be large, it is streamed
     fail_count = 0
-    for value in root.findall('Keyword'):
+    for value in Utils.xml_Utils.iterparse_elements(data_repository['wt_resultfile'],
+                                                    'Keyword', depth=1):
         kw_status = value.find('KeywordStatus').text
         if kw_status != "PASS":
             fail_count += 1
@@ -407,6 +380,10 @@ def execute_testcase(testcase_filepath, data_repository, tc_context,
     tc_status = True
     tc_start_time = Utils.datetime_utils.get_current_timestamp()
     tc_timestamp = str(tc_start_time)
+    if 'wt_tc_cntr' in data_repository:
+        # parallel testcases can start in the same second, the counter keeps
+        # the timestamp of the testcase in the junit object unique
+        tc_timestamp = "{0}.{1}".format(tc_timestamp, data_repository['wt_tc_cntr'])
     print_info("[{0}] Testcase execution starts".format(tc_start_time))
 
     get_testcase_details(testcase_filepath, data_repository, jiraproj)
@@ -447,6 +424,7 @@ def execute_testcase(testcase_filepath, data_repository, tc_context,
     data_repository['wt_junit_object'] = tc_junit_object
     print_testcase_details_to_console(testcase_filepath, data_repository)
     step_list = get_steps_list(testcase_filepath)
+    runtype = get_runtype_from_testcase(testcase_filepath, runtype)
 
     tc_state = Utils.xml_Utils.getChildTextbyParentTag(testcase_filepath,
                                                        'Details', 'State')
@@ -467,6 +445,17 @@ def execute_testcase(testcase_filepath, data_repository, tc_context,
             tc_status = execute_custom(data_type, runtype,
                                        custom_sequential_kw_driver,
                                        data_repository, step_list)
+        elif data_type.upper() == 'CUSTOM' and \
+                runtype.upper() == 'PARALLEL_THREADED_KEYWORDS':
+            tc_status = execute_custom(data_type, runtype,
+                                       custom_threaded_kw_driver,
+                                       data_repository, step_list)
+        elif data_type.upper() == 'CUSTOM' and \
+                runtype.upper() == 'PARALLEL_KEYWORDS' and \
+                custom_dag_kw_driver.has_step_dependencies(step_list):
+            tc_status = execute_custom(data_type, runtype,
+                                       custom_dag_kw_driver,
+                                       data_repository, step_list)
         elif data_type.upper() == 'CUSTOM' and \
                 runtype.upper() == 'PARALLEL_KEYWORDS':
             tc_status = execute_custom(data_type, runtype,
@@ -587,7 +576,11 @@ def execute_testcase(testcase_filepath, data_repository, tc_context,
                  'wt_testcase_filepath'], data_repository['wt_logsdir'],
                  data_repository['wt_resultsdir'], tc_status, email_setting)
 
-        if 'wp_results_execdir' in data_repository:
+        if tc_parallel:
+            # the parallel testcase driver merges the result record of the
+            # case into its junit object and writes the junit file
+            pass
+        elif 'wp_results_execdir' in data_repository:
             # Create and replace existing Project junit file for each case
             tc_junit_object.output_junit(data_repository['wp_results_execdir'],
                                          print_summary=False)
@@ -605,7 +598,8 @@ def execute_testcase(testcase_filepath, data_repository, tc_context,
         print_debug(msg)
         tc_name = Utils.file_Utils.getFileName(testcase_filepath)
         # put result into multiprocessing queue and later retrieve in corresponding driver
-        queue.put((tc_status, tc_name, tc_impact, tc_duration, tc_junit_object))
+        queue.put((tc_status, tc_name, tc_impact, tc_duration,
+                   tc_junit_object.get_testcase_record(data_repository['wt_tc_timestamp'])))
 
     # Save XML results of the Case in MongoDB server
     if data_repository.get("db_obj") is not False:
@@ -615,6 +609,33 @@ def execute_testcase(testcase_filepath, data_repository, tc_context,
     return tc_status, data_repository
 
 
+def get_error_testcase_record(testcase_filepath, data_repository):
+    """Returns the junit result record of a parallel testcase which could
+    not be executed, the testcase is reported as an error """
+    tc_timestamp = "{0}.{1}".format(Utils.datetime_utils.get_current_timestamp(),
+                                    data_repository.get('wt_tc_cntr', 0))
+    return data_repository['wt_junit_object'].get_error_testcase_record(
+        tc_timestamp, Utils.file_Utils.getNameOnly(os.path.basename(testcase_filepath)),
+        data_repository.get('wt_suite_name'))
+
+
+def get_runtype_from_testcase(testcase_filepath, runtype):
+    """Returns the runtype provided in the <Details> of the testcase,
+    the runtype from the testsuite/command line when not provided """
+    tc_runtype = Utils.xml_Utils.getChildTextbyParentTag(testcase_filepath,
+                                                         'Details', 'Runtype')
+    if tc_runtype is None or tc_runtype is False or not tc_runtype.strip():
+        return runtype
+    tc_runtype = tc_runtype.strip()
+    supported_values = ['sequential_keywords', 'parallel_keywords',
+                        'parallel_threaded_keywords']
+    if tc_runtype.lower() not in supported_values:
+        print_warning("unsupported value '{0}' provided for Runtype in testcase, supported "
+                      "values are '{1}', case-insensitive".format(tc_runtype, supported_values))
+        return runtype
+    return tc_runtype
+
+
 def execute_custom(datatype, runtype, driver, data_repository, step_list):
     """
     Execute a custom testcase
@@ -625,7 +646,8 @@ def execute_custom(datatype, runtype, driver, data_repository, step_list):
         print_info("Testsuite execute type=iterative but the testcase datatype=custom. "\
                    "All testcases in a iterative testsuite should have datatype=iterative, "\
                    "Hence this testcase will be marked as failure.")
-    elif runtype.upper() == 'SEQUENTIAL_KEYWORDS' or runtype.upper() == 'PARALLEL_KEYWORDS':
+    elif runtype.upper() in ['SEQUENTIAL_KEYWORDS', 'PARALLEL_KEYWORDS',
+                             'PARALLEL_THREADED_KEYWORDS']:
         tc_status = driver.main(step_list, data_repository, tc_status, system_name=None)
     else:
         print_error("Unsuppored runtype found, please check testcase file")
@@ -670,8 +692,11 @@ def main(testcase_filepath, data_repository = {}, tc_context='POSITIVE',
         print_error("Testcase xml file does not exist in provided path: {0}".format(testcase_filepath))
         tc_status = False
         if tc_parallel:
-            queue.put(('ERROR', str(testcase_filepath), 'IMPACT', '0'))
-            
+            queue.put(('ERROR', str(testcase_filepath), 'IMPACT', '0',
+                       get_error_testcase_record(testcase_filepath, data_repository)))
+    # the responses of the monitored sessions are collected per testcase
+    LogCollector.stop_collector()
+
     tc_duration = Utils.datetime_utils.get_time_delta(tc_start_time)
 
     return tc_status, tc_duration, data_repository
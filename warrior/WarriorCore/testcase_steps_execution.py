@@ -21,7 +21,6 @@ import time
 import traceback
 import WarriorCore.step_driver as step_driver
 import WarriorCore.onerror_driver as onerror_driver
-from WarriorCore import common_execution_utils
 import Framework
 import Framework.Utils as Utils
 from Framework.Utils.testcase_Utils import pNote
@@ -36,7 +35,31 @@ def get_system_console_log(filename, logsdir, console_name):
 
         return console_logfile
 
-def execute_steps(step_list, data_repository, system_name, parallel, queue):
+def report_skipped_step(step, step_num, data_repository, system_name):
+    """Reports a step that is not executed as skipped in the keyword
+    result file and the junit object, returns the keyword result file """
+    keyword = step.keyword
+    kw_resultfile= step_driver.get_keyword_resultfile(data_repository, system_name, step_num, keyword)
+    Utils.config_Utils.set_resultfile(kw_resultfile)
+    Utils.testcase_Utils.pKeyword(keyword, step.driver)
+    Utils.testcase_Utils.reportStatus('Skip' )
+    data_repository['wt_junit_object'].update_count("skipped", "1", "tc", data_repository['wt_tc_timestamp'])
+    data_repository['wt_junit_object'].update_count("keywords", "1", "tc", data_repository['wt_tc_timestamp'])
+    kw_start_time = Utils.datetime_utils.get_current_timestamp()
+    step_impact = step.impact
+    impact_dict = {"IMPACT":"Impact", "NOIMPACT":"No Impact"}
+    data_repository['wt_junit_object'].add_keyword_result(data_repository['wt_tc_timestamp'], step_num, keyword,
+                                                          "SKIPPED", kw_start_time, "0", "skipped",
+                                                          impact_dict.get(step_impact.upper()), "N/A")
+    Utils.testcase_Utils.write_result()
+    return kw_resultfile
+
+def execute_steps(step_list, data_repository, system_name, parallel, queue, step_range=None):
+    """Executes the steps of a compiled testcase plan sequentially,
+    step_list is a TestcasePlan (sequence of StepAttempt objects)
+
+    step_range = (start index, stop index) executes only the steps in the
+    range, onError goto to a step before the range is treated as next """
     default_error_action = data_repository['wt_def_on_error_action']
     default_error_value = data_repository['wt_def_on_error_value']
 
@@ -45,12 +68,18 @@ def execute_steps(step_list, data_repository, system_name, parallel, queue):
     step_status_list    = []
     step_impact_list    = []
     step_num            = 0
+    step_stop           = len(step_list)
+    if step_range is not None:
+        step_num, step_stop = step_range
 
     if parallel is True:
         system_console_log = get_system_console_log(data_repository['wt_filename'],
                                                     data_repository['wt_logsdir'],
                                                     '{0}_consoleLogs'.format(system_name))
-    while step_num < len(step_list):
+        # only the keyword results added by these steps are sent to the parent
+        kw_record_base = data_repository['wt_junit_object'].get_keyword_record(
+            data_repository['wt_tc_timestamp'])
+    while step_num < step_stop:
         step = step_list[step_num]
         # execute steps
         step_num += 1
@@ -68,7 +97,7 @@ def execute_steps(step_list, data_repository, system_name, parallel, queue):
                 print_error ('unexpected error %s' % str(e))
                 step_status     = False
                 kw_resultfile   = None
-                step_impact     = Utils.testcase_Utils.get_impact_from_xmlfile(step)
+                step_impact     = step.impact
                 print_error('unexpected error {0}'.format(traceback.format_exc()))
 
         elif (goto_stepnum and goto_stepnum == str(step_num)):
@@ -84,32 +113,20 @@ def execute_steps(step_list, data_repository, system_name, parallel, queue):
                     print_error ('unexpected error %s' % str(e))
                     step_status     = False
                     kw_resultfile   = None
-                    step_impact     = Utils.testcase_Utils.get_impact_from_xmlfile(step)
+                    step_impact     = step.impact
                     print_error('unexpected error {0}'.format(traceback.format_exc()))
                 goto_stepnum = False
 
         else:
-            keyword = step.get('Keyword')
-            kw_resultfile= step_driver.get_keyword_resultfile(data_repository, system_name, step_num, keyword)
-            Utils.config_Utils.set_resultfile(kw_resultfile)
-            Utils.testcase_Utils.pKeyword(keyword, step.get('Driver'))
-            Utils.testcase_Utils.reportStatus('Skip' )
+            kw_resultfile = report_skipped_step(step, step_num, data_repository, system_name)
             kw_resultfile_list.append(kw_resultfile)
-            data_repository['wt_junit_object'].update_count("skipped", "1", "tc", data_repository['wt_tc_timestamp'])
-            data_repository['wt_junit_object'].update_count("keywords", "1", "tc", data_repository['wt_tc_timestamp'])
-            kw_start_time = Utils.datetime_utils.get_current_timestamp()
-            step_impact = Utils.testcase_Utils.get_impact_from_xmlfile(step)
-            impact_dict = {"IMPACT":"Impact", "NOIMPACT":"No Impact"}
-            data_repository['wt_junit_object'].add_keyword_result(data_repository['wt_tc_timestamp'], step_num, keyword,
-                                                                  "SKIPPED", kw_start_time, "0", "skipped",
-                                                                  impact_dict.get(step_impact.upper()), "N/A")
             continue
 
         step_status_list.append(step_status)
         kw_resultfile_list.append(kw_resultfile)
         step_impact_list.append(step_impact)
-        runmode, value = common_execution_utils.get_runmode_from_xmlfile(step)
-        retry_type, retry_cond, retry_cond_value, retry_value, retry_interval = common_execution_utils.get_retry_from_xmlfile(step)
+        runmode, value = step.get_runmode()
+        retry_type, retry_cond, retry_cond_value, retry_value, retry_interval = step.get_retry()
         if runmode is not None:
             # if runmode is 'ruf' & step_status is False, skip the repeated
             # execution of same TC step and move to next actual step
@@ -122,7 +139,7 @@ def execute_steps(step_list, data_repository, system_name, parallel, queue):
             else:
                 if step_status is False or str(step_status).upper() == "ERROR" \
                 or str(step_status).upper() == "EXCEPTION" or exec_type_onerror is True:
-                    goto_stepnum = onerror_driver.main(step, default_error_action, default_error_value, exec_type_onerror)
+                    goto_stepnum = onerror_driver.main(step.element, default_error_action, default_error_value, exec_type_onerror)
                     if goto_stepnum in ['ABORT', 'ABORT_AS_ERROR']: break
         elif retry_type is not None:
             if retry_type.upper() == 'IF':
@@ -159,10 +176,15 @@ def execute_steps(step_list, data_repository, system_name, parallel, queue):
         else:
             if step_status is False or str(step_status).upper() == "ERROR" \
             or str(step_status).upper() == "EXCEPTION" or exec_type_onerror is True:
-                goto_stepnum = onerror_driver.main(step, default_error_action, default_error_value, exec_type_onerror)
+                goto_stepnum = onerror_driver.main(step.element, default_error_action, default_error_value, exec_type_onerror)
                 if goto_stepnum in ['ABORT', 'ABORT_AS_ERROR']: break
                 # when 'onError:goto' value is less than the current step num,
                 # change the next iteration point to goto value
+                elif goto_stepnum and step_range is not None and \
+                int(goto_stepnum) <= step_range[0]:
+                    print_warning("onError goto step {0} is outside the steps being "
+                                  "executed, moving to next step".format(goto_stepnum))
+                    goto_stepnum = False
                 elif goto_stepnum and int(goto_stepnum) < step_num:
                     step_num = int(goto_stepnum)-1
                     goto_stepnum = False
@@ -171,14 +193,19 @@ def execute_steps(step_list, data_repository, system_name, parallel, queue):
         try:
             # put result into multiprocessing queue and later retrieve in corresponding driver
             # parallel testcase sequenial keywords
-            queue.put((step_status_list, kw_resultfile_list, system_name, step_impact_list, data_repository['wt_junit_object']))
+            kw_record = data_repository['wt_junit_object'].get_keyword_record(
+                data_repository['wt_tc_timestamp'], since=kw_record_base)
+            queue.put((step_status_list, kw_resultfile_list, system_name, step_impact_list,
+                       kw_record))
         except Exception,e:
             print traceback.format_exc()
 
     else:
         return  step_status_list, kw_resultfile_list, step_impact_list
 
-def main(step_list, data_repository, system_name=None, parallel=False, queue=False):
+def main(step_list, data_repository, system_name=None, parallel=False, queue=False,
+         step_range=None):
     """ Executes a testcase """
-    steps_execution_status     = execute_steps(step_list, data_repository, system_name, parallel, queue)
+    steps_execution_status     = execute_steps(step_list, data_repository, system_name, parallel, queue,
+                                               step_range)
     return steps_execution_status
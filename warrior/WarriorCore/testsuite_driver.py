@@ -27,6 +27,7 @@ import parallel_testcase_driver
 from WarriorCore.Classes import execution_files_class, junit_class
 from WarriorCore.Classes.iterative_testsuite_class import IterativeTestsuite
 from WarriorCore import testsuite_utils, common_execution_utils
+from Framework.ClassUtils.session_pool_class import CliSessionPool
 
 #===============================================================================
 # Import all the necessary packages, libraries
@@ -53,6 +54,7 @@ def get_suite_details(testsuite_filepath, data_repository, from_project, res_sta
     suite_name = Utils.xml_Utils.getChildTextbyParentTag(testsuite_filepath, 'Details', 'Name')
     suite_title = Utils.xml_Utils.getChildTextbyParentTag(testsuite_filepath, 'Details', 'Title')
     suite_exectype = testsuite_utils.get_exectype_from_xmlfile(testsuite_filepath)
+    suite_max_workers = testsuite_utils.get_max_workers_from_xmlfile(testsuite_filepath)
     def_on_error_action = Utils.testcase_Utils.get_defonerror_fromxml_file(testsuite_filepath)
     def_on_error_value = Utils.xml_Utils.getChildAttributebyParentTag(testsuite_filepath, 'Details', 'default_onError', 'value')
     filename = os.path.basename(testsuite_filepath)
@@ -99,6 +101,7 @@ def get_suite_details(testsuite_filepath, data_repository, from_project, res_sta
     suite_repository['operating_system'] = operating_system
     suite_repository['suite_title'] = suite_title
     suite_repository['suite_exectype'] = suite_exectype
+    suite_repository['suite_max_workers'] = suite_max_workers
     suite_repository['def_on_error_action'] = def_on_error_action
     suite_repository['def_on_error_value'] = def_on_error_value
     suite_repository['suite_execution_dir'] = suite_execution_dir
@@ -419,4 +422,6 @@ def main(testsuite_filepath, data_repository={},
     except Exception:
         print_error('unexpected error {0}'.format(traceback.format_exc()))
         test_suite_status, suite_repository = False, None
+    # the pooled cli sessions are shared by the testcases of the suite only
+    CliSessionPool.close_pool()
     return test_suite_status, suite_repository
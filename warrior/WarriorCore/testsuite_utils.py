@@ -288,7 +288,8 @@ def get_runtype_from_xmlfile(element):
         runtype='sequential_keywords'
     elif runtype is not None and runtype is not False:
         runtype = runtype.strip()
-        supported_values = ['sequential_keywords', 'parallel_keywords']
+        supported_values = ['sequential_keywords', 'parallel_keywords',
+                            'parallel_threaded_keywords']
         if runtype.lower() not in supported_values:
             print_warning("unsupported value '{0}' provided for runtype, supported values are '{1}', case-insensitive".format(runtype, supported_values))
             print_info("Hence using default value for runtype which is 'sequential_keywords'")
@@ -312,3 +313,23 @@ def get_exectype_from_xmlfile(filepath):
     return exectype
 
 
+
+def get_max_workers_from_xmlfile(filepath):
+    """Gets the max_workers value (maximum number of testcases/testsuites
+    executed at a time in parallel) from the testsuite.xml/project.xml file,
+    returns None when max_workers is not provided """
+
+    max_workers = xml_Utils.getChildAttributebyParentTag(filepath, 'Details', 'type', 'max_workers')
+    if max_workers is None or max_workers is False or str(max_workers).strip() == "":
+        max_workers = None
+    else:
+        try:
+            max_workers = int(max_workers)
+            if max_workers < 1:
+                raise ValueError
+        except ValueError:
+            print_warning("unsupported value '{0}' provided for max_workers, please provide "
+                          "a positive integer".format(max_workers))
+            print_info("Hence executing all of them at the same time")
+            max_workers = None
+    return max_workers
@@ -109,6 +109,25 @@ def decide_overwrite_var(namespace):
     if all([namespace.outputdir, any([namespace.resultdir, namespace.logdir])]):
         print_error("outputdir shouldn't be used with resultdir or logdir")
         exit(1)
+    if namespace.maxworkers:
+        if namespace.maxworkers < 1:
+            print_error("maxworkers should be a positive integer")
+            exit(1)
+        overwrite['ow_max_workers'] = namespace.maxworkers
+    if namespace.warmworkers:
+        overwrite['ow_warm_workers'] = True
+    if namespace.sessionpool:
+        overwrite['ow_session_pool'] = True
+    if any([namespace.poolsize, namespace.poolidle]) and not namespace.sessionpool:
+        print_error("poolsize and poolidle should be used with sessionpool")
+        exit(1)
+    if namespace.poolsize < 0 or namespace.poolidle < 0:
+        print_error("poolsize and poolidle should be positive integers")
+        exit(1)
+    if namespace.poolsize:
+        overwrite['ow_session_pool_size'] = namespace.poolsize
+    if namespace.poolidle:
+        overwrite['ow_session_pool_idle'] = namespace.poolidle
     if namespace.jobid:
         overwrite['jobid'] = "http://pharlap.tx.fnc.fujitsu.com/share/logs/"+str(namespace.jobid)
     return overwrite
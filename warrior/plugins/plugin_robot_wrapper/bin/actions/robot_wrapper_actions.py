@@ -30,7 +30,7 @@ class RobotWrapperActions(object):
     """ RobotWrapperActions class which has methods(keywords) related to Robot Framework """
 
     def __init__(self):
-        self.resultfile = config_Utils.resultfile
+        self.resultfile = config_Utils.get_resultfile()
         self.datafile = config_Utils.datafile
         self.logsdir = config_Utils.logsdir
         self.filename = config_Utils.filename
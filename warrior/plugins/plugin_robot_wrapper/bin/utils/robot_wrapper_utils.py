@@ -67,7 +67,7 @@ def create_case_junit(robot_tests):
         1. robot_tests(list) - Robot test xml elements
     """
 
-    data_repository = config_Utils.data_repository
+    data_repository = config_Utils.get_datarepository()
     tc_junit_object = data_repository['wt_junit_object']
     for test_elem in robot_tests:
         test_name = test_elem.get('name')
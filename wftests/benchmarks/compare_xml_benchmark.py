@@ -0,0 +1,124 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""
+Compares xml_Utils.compare_xml with the earlier implementation (xmltodict,
+sorted json dumps and difflib.ndiff) on large configuration files, for
+equal documents and for documents with a few differences.
+
+Usage: python compare_xml_benchmark.py [size of the configs in MB]
+"""
+import os
+import sys
+import json
+import time
+import random
+import difflib
+import shutil
+import tempfile
+
+
+def write_config(path, size, shuffle=False, changes=0):
+    """Writes a configuration of about size bytes, the attributes and the
+    sections of the interfaces are shuffled when shuffle is True, changes
+    interfaces get a different mtu """
+    rand = random.Random(size)
+    changed = set(rand.sample(range(size // 250), changes))
+    with open(path, "w") as config:
+        config.write('<config xmlns="urn:example:config"><interfaces>\n')
+        index = 0
+        written = 0
+        while written < size:
+            mtu = 9000 if index in changed else 1500
+            sections = ['<name>eth{0}</name>'.format(index),
+                        '<mtu>{0}</mtu>'.format(mtu),
+                        '<description>uplink {0} to the core</description>'.format(index),
+                        '<ipv4 address="10.{0}.{1}.1" prefix="24"/>'.format(
+                            index // 256 % 256, index % 256)]
+            attributes = ['type="ethernet"', 'enabled="true"']
+            if shuffle:
+                rand.shuffle(sections)
+                rand.shuffle(attributes)
+            line = '  <interface {0}>{1}</interface>\n'.format(
+                " ".join(attributes), "".join(sections))
+            config.write(line)
+            written += len(line)
+            index += 1
+        config.write('</interfaces></config>\n')
+
+
+def legacy_compare_xml(xml1, xml2):
+    """compare_xml before the canonical form, without the sorted json
+    files (sorted_json=False) """
+    from Framework.Utils import xml_Utils
+    from Framework.OSS import xmltodict
+    from Framework.ClassUtils.json_utils_class import JsonUtils
+
+    xml1 = xml_Utils.del_tags_from_xml(xml1, [])
+    xml2 = xml_Utils.del_tags_from_xml(xml2, [])
+    xml1 = xml_Utils.del_attributes_from_xml(xml1, [])
+    xml2 = xml_Utils.del_attributes_from_xml(xml2, [])
+    output1 = json.loads(json.dumps(xmltodict.parse(xml1, xml_attribs=True)))
+    output2 = json.loads(json.dumps(xmltodict.parse(xml2, xml_attribs=True)))
+    json_obj1 = json.dumps(JsonUtils().sort_json_object(output1), indent=4,
+                           separators=(',', ':'), encoding="utf-8")
+    json_obj2 = json.dumps(JsonUtils().sort_json_object(output2), indent=4,
+                           separators=(',', ':'), encoding="utf-8")
+    if output1 == output2:
+        return True, None
+    diff = "\n".join(difflib.ndiff(json_obj1.splitlines(), json_obj2.splitlines()))
+    return False, diff
+
+
+def timed(function):
+    """Returns the result of function and its time """
+    start = time.time()
+    result = function()
+    return result, time.time() - start
+
+
+def main(size_mb):
+    """Runs the benchmark on configs of size_mb megabytes """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    os.pardir, os.pardir, "warrior"))
+    import Framework.Utils
+    from Framework.Utils import xml_Utils
+    from Framework.Utils.print_Utils import print_info
+
+    directory = tempfile.mkdtemp()
+    try:
+        base = os.path.join(directory, "base.xml")
+        shuffled = os.path.join(directory, "shuffled.xml")
+        changed = os.path.join(directory, "changed.xml")
+        size = int(size_mb * 1024 * 1024)
+        write_config(base, size)
+        write_config(shuffled, size, shuffle=True)
+        write_config(changed, size, changes=5)
+
+        for name, other in (("equal documents", shuffled),
+                            ("5 differences", changed)):
+            (legacy_status, _), legacy_time = timed(
+                lambda: legacy_compare_xml(base, other))
+            result, current_time = timed(
+                lambda: xml_Utils.compare_xml(base, other, sorted_json=False))
+            assert legacy_status == result[0], "{0}: status differs".format(name)
+            print_info("{0}: {1:.2f}s -> {2:.2f}s ({3:.1f}x)".format(
+                name, legacy_time, current_time, legacy_time / max(current_time, 1e-9)))
+            if result[3]:
+                print_info(result[3])
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main(float(sys.argv[1]) if len(sys.argv) > 1 else 10)
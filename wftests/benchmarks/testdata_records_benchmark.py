@@ -0,0 +1,181 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""
+Compares the per command values read by the cli send loop from the parallel
+lists of a testdata details dict (normalized for every command) with the
+values of the CommandRecord objects built by the testdata layer, checks that
+both give the same values and compares their memory.
+
+Usage: python testdata_records_benchmark.py [number of commands]
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+
+# values of the optional command attributes, cycled over the commands to
+# check the normalization of the values which are missing, empty or given
+OPTIONAL_VALUES = (("start", (None, "", ".*#")),
+                   ("sleep", (None, "0", "none", "false", "1")),
+                   ("resp_req", (None, "", "no", "N", "yes")),
+                   ("resp_ref", (None, "", "r1")),
+                   ("inorder", (None, "no", "Yes")),
+                   ("retry", (None, "none", "y")),
+                   ("retry_timer", (None, "none", "2")),
+                   ("retry_count", (None, "", "3")),
+                   ("retry_onmatch", (None, "up")))
+
+
+def write_testdata(directory, count):
+    """Writes a testdata file with a block of count commands """
+    commands = []
+    for index in range(count):
+        attributes = 'send="show interface eth{0}" end="prompt"'.format(index)
+        if index % 2:
+            attributes += ' verify="v1"'
+        for position, (name, values) in enumerate(OPTIONAL_VALUES):
+            value = values[(index + position) % len(values)]
+            if value is not None:
+                attributes += ' {0}="{1}"'.format(name, value)
+        commands.append("    <command {0}/>".format(attributes))
+    testdata = os.path.join(directory, "testdata.xml")
+    with open(testdata, "w") as xml_file:
+        xml_file.write('<data>\n  <global>\n'
+                       '    <command_params end="prompt" timeout="30"/>\n'
+                       '    <verifications><v1 search="up" found="yes"/></verifications>\n'
+                       '  </global>\n  <testdata title="bench" execute="yes">\n'
+                       '{0}\n  </testdata>\n</data>\n'.format("\n".join(commands)))
+    return testdata
+
+
+def legacy_command_values(details_dict, index):
+    """Reads and normalizes the values of a command the way the send loop
+    did before the command records """
+    command = details_dict["command_list"][index]
+    startprompt = details_dict["startprompt_list"][index]
+    endprompt = details_dict["endprompt_list"][index]
+    verify_list = details_dict["verify_list"][index]
+    cmd_timeout = details_dict["timeout_list"][index]
+    verify_text_list = details_dict["verify_text_list"][index]
+    sleeptime = details_dict["sleeptime_list"][index]
+    resp_ref = details_dict["resp_ref_list"][index]
+    resp_req = details_dict["resp_req_list"][index]
+    resp_pat_req = details_dict["resp_pat_req_list"][index]
+    inorder_search = details_dict["inorder_search_list"][index]
+    retry = details_dict["retry_list"][index]
+    retry_timer = details_dict["retry_timer_list"][index]
+    retry_count = details_dict["retry_count_list"][index]
+    retry_onmatch = details_dict["retry_onmatch_list"][index]
+    startprompt = {None: ".*", "": ".*"}.get(startprompt, str(startprompt))
+    resp_req = {None: 'y', '': 'y',
+                'no': 'n', 'n': 'n'}.get(str(resp_req).lower(), 'y')
+    resp_ref = {None: index+1, '': index+1}.get(resp_ref, str(resp_ref))
+    resp_pat_req = {None: ""}.get(resp_pat_req, str(resp_pat_req))
+    sleeptime = int({None: 0, "": 0, "none": 0, False: 0, "false": 0}.get(
+        str(sleeptime).lower(), str(sleeptime)))
+    inorder_search = inorder_search is not None and \
+        inorder_search.lower().startswith("y")
+    retry = {None: 'n', '': 'n', 'none': 'n'}.get(str(retry).lower(), retry)
+    retry_timer = {None: 60, "": 60, "none": 60}.get(str(retry_timer).lower(), retry_timer)
+    retry_count = {None: 5, "": 5, "none": 5}.get(str(retry_count).lower(), retry_count)
+    retry_timer, retry_count = int(retry_timer), int(retry_count)
+    retry_onmatch = {None: False, "": False}.get(retry_onmatch, str(retry_onmatch))
+    return (command, startprompt, endprompt, verify_list, cmd_timeout,
+            verify_text_list, sleeptime, resp_ref, resp_req, resp_pat_req,
+            inorder_search, retry, retry_timer, retry_count, retry_onmatch)
+
+
+def record_command_values(record):
+    """Reads the values of a command from its CommandRecord """
+    resp_pat_req = record.resp_pat_req if record.resp_pat_req is not None else ""
+    return (record.command, record.startprompt, record.endprompt, record.verify,
+            record.timeout, record.verify_text, record.sleeptime, record.resp_ref,
+            record.resp_req, resp_pat_req, record.inorder_search, record.retry,
+            record.retry_timer, record.retry_count, record.retry_onmatch)
+
+
+def best_of(function, repeat=5):
+    """Returns the result of function and its best time out of repeat runs """
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        result = function()
+        times.append(time.time() - start)
+    return result, min(times)
+
+
+def deep_size(value, seen=None):
+    """Approximate size in bytes of the containers and strings of a value,
+    the objects referenced several times are counted once """
+    seen = set() if seen is None else seen
+    if id(value) in seen:
+        return 0
+    seen.add(id(value))
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_size(item, seen) for item in value.values())
+    elif isinstance(value, (list, tuple)):
+        size += sum(deep_size(item, seen) for item in value)
+    elif hasattr(value, "__slots__"):
+        size += sum(deep_size(getattr(value, name), seen)
+                    for name in value.__slots__)
+    return size
+
+
+def check_records(details_dict, records):
+    """Checks that the value of every command read from its CommandRecord
+    is the value the send loop read from the details dict """
+    for index, record in enumerate(records):
+        legacy = legacy_command_values(details_dict, index)
+        compact = record_command_values(record)
+        assert legacy == compact, \
+            "command {0}: {1} != {2}".format(index + 1, legacy, compact)
+
+
+def main(count):
+    """Runs the benchmark for a testdata block of count commands """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    os.pardir, os.pardir, "warrior"))
+    import Framework.Utils
+    from Framework.Utils import data_Utils
+    from Framework.Utils.print_Utils import print_info
+
+    directory = tempfile.mkdtemp()
+    try:
+        testdata = write_testdata(directory, count)
+        details_dict = data_Utils.get_command_details_from_testdata(
+            testdata, title="bench").values()[0]
+        records = list(data_Utils.get_command_records_from_testdata(
+            testdata, title="bench").values()[0])
+    finally:
+        shutil.rmtree(directory)
+    check_records(details_dict, records)
+
+    _, legacy_time = best_of(
+        lambda: [legacy_command_values(details_dict, index) for index in range(count)])
+    _, record_time = best_of(
+        lambda: [record_command_values(record) for record in records])
+
+    print_info("commands: {0}".format(count))
+    print_info("send loop values, parallel lists: {0:.4f}s".format(legacy_time))
+    print_info("send loop values, command records: {0:.4f}s".format(record_time))
+    print_info("memory, details dict of parallel lists: {0} bytes".format(
+        deep_size(details_dict)))
+    print_info("memory, CommandRecord per command: {0} bytes".format(
+        deep_size(records)))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,146 @@
+'''
+Copyright 2017, Fujitsu Network Communications, Inc.
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+http://www.apache.org/licenses/LICENSE-2.0
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+'''
+
+"""
+Compares the xpath and tag lookups of xml_Utils on large NETCONF and REST
+xml payloads with the earlier implementation which parsed the response (or
+the file) and the xpath expression for every lookup.
+
+Usage: python xpath_benchmark.py [number of interfaces in the payloads]
+"""
+import os
+import sys
+import tempfile
+import time
+from xml.dom import minidom
+
+from lxml import etree
+
+NAMESPACES = {"nc": "urn:ietf:params:xml:ns:netconf:base:1.0",
+              "if": "urn:ietf:params:xml:ns:yang:ietf-interfaces"}
+
+
+def netconf_reply(count):
+    """Returns a NETCONF rpc-reply with count interfaces """
+    interfaces = "".join(
+        '<interface><name>eth{0}</name><type>ethernetCsmacd</type>'
+        '<enabled>{1}</enabled><mtu>{2}</mtu></interface>'.format(
+            index, "true" if index % 2 else "false", 1500 + index % 7)
+        for index in range(count))
+    return ('<rpc-reply xmlns="{0}" message-id="101"><data>'
+            '<interfaces xmlns="{1}">{2}</interfaces></data></rpc-reply>'.format(
+                NAMESPACES["nc"], NAMESPACES["if"], interfaces))
+
+
+def rest_response(count):
+    """Returns a REST xml response with count interfaces """
+    items = "".join('<item id="{0}"><name>eth{0}</name><status>up</status>'
+                    '<counters rx="{1}" tx="{2}"/></item>'.format(index, index*3, index*5)
+                    for index in range(count))
+    return '<response><code>200</code><items>{0}</items></response>'.format(items)
+
+
+def legacy_value(response, xpath, namespaces):
+    """First xpath result, the way getValuebyTagFromStringWithXpath
+    computed it before the compiled xpath cache """
+    item = etree.fromstring(response).xpath(xpath, namespaces=namespaces)
+    return item[0] if len(item) != 0 else ""
+
+
+def legacy_value_by_tag(filename, tag):
+    """getValuebyTag before the lxml document cache, the file is parsed
+    with minidom for every lookup """
+    doc = minidom.parse(filename)
+    itemlist = doc.getElementsByTagName(tag)[0].toxml()
+    return itemlist.replace('<' + tag + '>', '').replace('</' + tag + '>', '')
+
+
+def best_of(function, repeat=3):
+    """Returns the result of function and its best time out of repeat runs """
+    times = []
+    for _ in range(repeat):
+        start = time.time()
+        result = function()
+        times.append(time.time() - start)
+    return result, min(times)
+
+
+def report(name, legacy, current):
+    """Returns the times of a benchmark, results must be identical """
+    (legacy_result, legacy_time), (result, current_time) = legacy, current
+    assert legacy_result == result, "{0}: results differ".format(name)
+    return "{0}: {1:.4f}s -> {2:.4f}s ({3:.1f}x)".format(
+        name, legacy_time, current_time, legacy_time / max(current_time, 1e-9))
+
+
+def main(count):
+    """Runs the benchmarks on payloads with count interfaces """
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    os.pardir, os.pardir, "warrior"))
+    import Framework.Utils
+    from Framework.Utils import xml_Utils
+    from Framework.Utils.print_Utils import print_info
+
+    rest = rest_response(count)
+    paths = ["xpath=//item[@id='{0}']/status/text()".format(index)
+             for index in range(0, count, max(1, count // 50))]
+    expected = ["up"] * len(paths)
+    print_info(report("compare_xml_using_xpath, REST response",
+                      best_of(lambda: all(legacy_value(rest, path.strip("xpath="), None) == value
+                                          for path, value in zip(paths, expected))),
+                      best_of(lambda: xml_Utils.compare_xml_using_xpath(rest, paths, expected))))
+
+    reply = netconf_reply(count)
+    root = etree.fromstring(reply)
+    nc_paths = ["//if:interface[if:name='eth{0}']/if:mtu/text()".format(index)
+                for index in range(0, count, max(1, count // 50))]
+    print_info(report("xpath with namespaces, NETCONF reply",
+                      best_of(lambda: [root.xpath(path, namespaces=NAMESPACES)
+                                       for path in nc_paths]),
+                      best_of(lambda: [xml_Utils.evaluate_xpath(root, path, NAMESPACES)
+                                       for path in nc_paths])))
+
+    notifications = [etree.fromstring(
+        '<notification xmlns="urn:ietf:params:xml:ns:netconf:notification:1.0">'
+        '<eventTime>2017-01-01T00:00:{0:02d}Z</eventTime><event>'
+        '<name>eth{1}</name></event></notification>'.format(index % 60, index))
+                     for index in range(count)]
+    wait_xpath = "//*[local-name()='name' and text()='eth{0}']".format(count - 1)
+    print_info(report("notification matching",
+                      best_of(lambda: [bool(xml.xpath(wait_xpath, namespaces=None))
+                                       for xml in notifications]),
+                      best_of(lambda: [bool(xml_Utils.evaluate_xpath(xml, wait_xpath, None))
+                                       for xml in notifications])))
+
+    handle, filename = tempfile.mkstemp(suffix=".xml")
+    try:
+        with os.fdopen(handle, "w") as xml_file:
+            xml_file.write(rest)
+        tags = ["code", "status", "name"] * 5
+        print_info(report("getValuebyTag, REST response file",
+                          best_of(lambda: [legacy_value_by_tag(filename, tag)
+                                           for tag in tags]),
+                          best_of(lambda: [xml_Utils.getValuebyTag(filename, tag)
+                                           for tag in tags])))
+        file_paths = [path.strip("xpath=") for path in paths[:10]]
+        print_info(report("get_elements_with_xpath, REST response file",
+                          best_of(lambda: [etree.parse(filename).xpath(path)
+                                           for path in file_paths]),
+                          best_of(lambda: [xml_Utils.get_elements_with_xpath(filename, path)
+                                           for path in file_paths])))
+    finally:
+        os.remove(filename)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)